@@ -6,11 +6,24 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
-from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
 
 from ticca.tools.agent_tools import (
     _load_session_history,
     _save_session_history,
+    _SubagentStreamForwarder,
     _validate_session_id,
     register_invoke_agent,
     register_list_agents,
@@ -68,6 +81,82 @@ class TestAgentTools:
             assert "How User Approval Works" in file_permission_text
 
 
+class TestSubagentStreamForwarder:
+    """Test suite for streaming sub-agent output into the invoke group."""
+
+    async def test_text_deltas_flush_as_complete_lines(self):
+        """Test that buffered text is emitted line by line and flushed at the end."""
+        forwarder = _SubagentStreamForwarder("group-1", flush_interval=0)
+        events = [
+            PartStartEvent(index=0, part=TextPart(content="Hello ")),
+            PartDeltaEvent(index=0, delta=TextPartDelta(content_delta="world\npart")),
+            PartDeltaEvent(index=0, delta=TextPartDelta(content_delta="ial")),
+        ]
+
+        async def stream():
+            for event in events:
+                yield event
+
+        with patch("ticca.tools.agent_tools.emit_system_message") as mock_emit:
+            await forwarder(MagicMock(), stream())
+
+        emitted = [call.args[0] for call in mock_emit.call_args_list]
+        assert emitted == ["Hello world", "partial"]
+        assert forwarder.streamed_text is True
+        for call in mock_emit.call_args_list:
+            assert call.kwargs["message_group"] == "group-1"
+
+    def test_throttles_updates_within_flush_interval(self):
+        """Test that lines arriving within the flush interval are batched."""
+        forwarder = _SubagentStreamForwarder("group-1", flush_interval=60)
+
+        with patch("ticca.tools.agent_tools.emit_system_message") as mock_emit:
+            forwarder.handle_event(
+                PartStartEvent(index=0, part=TextPart(content="one\n"))
+            )
+            forwarder.handle_event(
+                PartDeltaEvent(index=0, delta=TextPartDelta(content_delta="two\n"))
+            )
+            forwarder.handle_event(
+                PartDeltaEvent(index=0, delta=TextPartDelta(content_delta="three\n"))
+            )
+            assert mock_emit.call_count == 1
+            forwarder.flush(force=True)
+
+        emitted = [call.args[0] for call in mock_emit.call_args_list]
+        assert emitted == ["one", "two\nthree"]
+
+    def test_tool_calls_are_announced_immediately(self):
+        """Test that tool calls flush pending text and are shown as they start."""
+        forwarder = _SubagentStreamForwarder("group-1", flush_interval=60)
+
+        with patch("ticca.tools.agent_tools.emit_system_message") as mock_emit:
+            forwarder.handle_event(
+                PartStartEvent(index=0, part=TextPart(content="Let me look"))
+            )
+            forwarder.handle_event(
+                FunctionToolCallEvent(
+                    part=ToolCallPart(tool_name="list_files", args={"directory": "."})
+                )
+            )
+
+        emitted = [call.args[0] for call in mock_emit.call_args_list]
+        assert emitted[0] == "Let me look"
+        assert "list_files" in emitted[1]
+
+    def test_markup_in_streamed_text_is_escaped(self):
+        """Test that model output can't inject Rich markup into the UI."""
+        forwarder = _SubagentStreamForwarder("group-1", flush_interval=0)
+
+        with patch("ticca.tools.agent_tools.emit_system_message") as mock_emit:
+            forwarder.handle_event(
+                PartStartEvent(index=0, part=TextPart(content="[bold]x[/bold]"))
+            )
+            forwarder.flush(force=True)
+
+        assert mock_emit.call_args.args[0] == "\\[bold]x\\[/bold]"
+
+
 class TestSessionIdValidation:
     """Test suite for session ID validation."""
 
@@ -186,9 +275,9 @@ class TestSessionSaveLoad:
     def mock_messages(self):
         """Create mock ModelMessage objects for testing."""
         return [
-            ModelRequest(parts=[TextPart(content="Hello, can you help?")]),
+            ModelRequest(parts=[UserPromptPart(content="Hello, can you help?")]),
             ModelResponse(parts=[TextPart(content="Sure, I can help!")]),
-            ModelRequest(parts=[TextPart(content="What is 2+2?")]),
+            ModelRequest(parts=[UserPromptPart(content="What is 2+2?")]),
             ModelResponse(parts=[TextPart(content="2+2 equals 4.")]),
         ]
 
@@ -252,8 +341,8 @@ class TestSessionSaveLoad:
             with pytest.raises(ValueError, match="must be kebab-case"):
                 _load_session_history("Invalid_Session")
 
-    def test_save_creates_pkl_and_txt_files(self, temp_session_dir, mock_messages):
-        """Test that save creates both .pkl and .txt files."""
+    def test_save_creates_jsonl_and_txt_files(self, temp_session_dir, mock_messages):
+        """Test that save creates both .jsonl and .txt files."""
         session_id = "test-session"
         agent_name = "test-agent"
         initial_prompt = "Test prompt"
@@ -270,9 +359,9 @@ class TestSessionSaveLoad:
             )
 
             # Check that both files exist
-            pkl_file = temp_session_dir / f"{session_id}.pkl"
+            jsonl_file = temp_session_dir / f"{session_id}.jsonl"
             txt_file = temp_session_dir / f"{session_id}.txt"
-            assert pkl_file.exists()
+            assert jsonl_file.exists()
             assert txt_file.exists()
 
     def test_txt_file_contains_readable_metadata(self, temp_session_dir, mock_messages):
@@ -343,23 +432,253 @@ class TestSessionSaveLoad:
             # last_updated should exist
             assert "last_updated" in metadata
 
-    def test_load_handles_corrupted_pickle(self, temp_session_dir):
-        """Test that loading a corrupted pickle file returns empty list."""
+    def test_load_handles_corrupted_log(self, temp_session_dir):
+        """Test that loading a corrupted session log returns empty list."""
         session_id = "corrupted-session"
 
         with patch(
             "ticca.tools.agent_tools._get_subagent_sessions_dir",
             return_value=temp_session_dir,
         ):
-            # Create a corrupted pickle file
-            pkl_file = temp_session_dir / f"{session_id}.pkl"
-            with open(pkl_file, "wb") as f:
-                f.write(b"This is not a valid pickle file!")
+            # Create a corrupted log file
+            jsonl_file = temp_session_dir / f"{session_id}.jsonl"
+            with open(jsonl_file, "w") as f:
+                f.write("This is not a valid session log!\n")
 
             # Should return empty list instead of crashing
             loaded_messages = _load_session_history(session_id)
             assert loaded_messages == []
 
+    def test_load_keeps_segments_before_torn_write(
+        self, temp_session_dir, mock_messages
+    ):
+        """Test that a truncated trailing segment doesn't lose earlier messages."""
+        session_id = "torn-session"
+
+        with patch(
+            "ticca.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=temp_session_dir,
+        ):
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages[:2],
+                agent_name="test-agent",
+            )
+            with open(temp_session_dir / f"{session_id}.jsonl", "a") as f:
+                f.write('[{"parts": [{"content": "half')
+
+            loaded_messages = _load_session_history(session_id)
+            assert len(loaded_messages) == 2
+
+    def test_save_after_torn_write_keeps_later_segments(
+        self, temp_session_dir, mock_messages
+    ):
+        """Test that a torn segment is cut off before the next one is appended."""
+        session_id = "torn-session"
+
+        with patch(
+            "ticca.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=temp_session_dir,
+        ):
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages[:2],
+                agent_name="test-agent",
+            )
+            with open(temp_session_dir / f"{session_id}.jsonl", "a") as f:
+                f.write('[{"parts": [{"content": "half')
+
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages,
+                agent_name="test-agent",
+            )
+
+            assert _load_session_history(session_id) == mock_messages
+
+    def test_crash_before_metadata_update_does_not_duplicate_messages(
+        self, temp_session_dir, mock_messages
+    ):
+        """Test that the message count comes from the log if metadata lags."""
+        session_id = "crashed-session"
+
+        with patch(
+            "ticca.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=temp_session_dir,
+        ):
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages[:2],
+                agent_name="test-agent",
+            )
+            with patch(
+                "ticca.tools.agent_tools.atomic_write_text",
+                side_effect=OSError("crash"),
+            ):
+                with pytest.raises(OSError):
+                    _save_session_history(
+                        session_id=session_id,
+                        message_history=mock_messages[:3],
+                        agent_name="test-agent",
+                    )
+
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages,
+                agent_name="test-agent",
+            )
+
+            assert _load_session_history(session_id) == mock_messages
+
+    def test_save_appends_only_new_messages(self, temp_session_dir, mock_messages):
+        """Test that each save appends only new messages, one per line."""
+        session_id = "append-session"
+
+        with patch(
+            "ticca.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=temp_session_dir,
+        ):
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages[:2],
+                agent_name="test-agent",
+            )
+            with patch("ticca.tools.agent_tools.atomic_write_bytes") as mock_rewrite:
+                _save_session_history(
+                    session_id=session_id,
+                    message_history=mock_messages,
+                    agent_name="test-agent",
+                )
+            mock_rewrite.assert_not_called()
+
+            jsonl_file = temp_session_dir / f"{session_id}.jsonl"
+            lines = jsonl_file.read_text().splitlines()
+            assert [len(json.loads(line)) for line in lines] == [1, 1, 1, 1]
+
+            loaded_messages = _load_session_history(session_id)
+            assert len(loaded_messages) == len(mock_messages)
+
+    def test_save_rewrites_log_when_history_shrinks(
+        self, temp_session_dir, mock_messages
+    ):
+        """Test that a compacted (shorter) history replaces the log."""
+        session_id = "compacted-session"
+
+        with patch(
+            "ticca.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=temp_session_dir,
+        ):
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages,
+                agent_name="test-agent",
+            )
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages[2:],
+                agent_name="test-agent",
+            )
+
+            loaded_messages = _load_session_history(session_id)
+            assert loaded_messages == mock_messages[2:]
+
+    def test_save_rewrites_log_when_history_was_compacted(
+        self, temp_session_dir, mock_messages
+    ):
+        """Test that a compacted history no longer a prefix of the log replaces it."""
+        session_id = "summarized-session"
+        compacted = [
+            ModelRequest(parts=[UserPromptPart(content="Summary of the session")]),
+            *mock_messages[2:],
+            ModelRequest(parts=[UserPromptPart(content="And 3+3?")]),
+            ModelResponse(parts=[TextPart(content="3+3 equals 6.")]),
+        ]
+
+        with patch(
+            "ticca.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=temp_session_dir,
+        ):
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages,
+                agent_name="test-agent",
+            )
+            # Not shorter than what was saved, but no longer extending it
+            assert len(compacted) >= len(mock_messages)
+            _save_session_history(
+                session_id=session_id,
+                message_history=compacted,
+                agent_name="test-agent",
+            )
+
+            assert _load_session_history(session_id) == compacted
+
+    def test_load_with_token_budget_decodes_only_the_tail(
+        self, temp_session_dir, mock_messages
+    ):
+        """Test that a token budget loads the first message plus the newest ones."""
+        session_id = "budget-session"
+
+        with patch(
+            "ticca.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=temp_session_dir,
+        ):
+            _save_session_history(
+                session_id=session_id,
+                message_history=mock_messages,
+                agent_name="test-agent",
+            )
+            with patch(
+                "ticca.tools.agent_tools.ModelMessagesTypeAdapter",
+                wraps=ModelMessagesTypeAdapter,
+            ) as adapter:
+                loaded = _load_session_history(session_id, max_tokens=1)
+
+            assert loaded == [mock_messages[0], mock_messages[-1]]
+            # The first line and the last one; the middle is never decoded
+            assert adapter.validate_json.call_count == 2
+            assert _load_session_history(session_id, max_tokens=10**6) == (
+                mock_messages
+            )
+
+    def test_tool_calls_and_returns_roundtrip(self, temp_session_dir):
+        """Test that tool calls and tool returns are preserved exactly."""
+        session_id = "tool-session"
+        messages = [
+            ModelRequest(parts=[UserPromptPart(content="List the files")]),
+            ModelResponse(
+                parts=[
+                    ToolCallPart(
+                        tool_name="list_files",
+                        args={"directory": "."},
+                        tool_call_id="call-1",
+                    )
+                ]
+            ),
+            ModelRequest(
+                parts=[
+                    ToolReturnPart(
+                        tool_name="list_files",
+                        content={"files": ["a.py", "b.py"]},
+                        tool_call_id="call-1",
+                    )
+                ]
+            ),
+            ModelResponse(parts=[TextPart(content="Found a.py and b.py")]),
+        ]
+
+        with patch(
+            "ticca.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=temp_session_dir,
+        ):
+            _save_session_history(
+                session_id=session_id,
+                message_history=messages,
+                agent_name="test-agent",
+            )
+
+            assert _load_session_history(session_id) == messages
+
     def test_save_without_initial_prompt(self, temp_session_dir, mock_messages):
         """Test that save works without initial_prompt (subsequent saves)."""
         session_id = "test-session"
@@ -473,7 +792,7 @@ class TestSessionIntegration:
     def mock_messages(self):
         """Create mock ModelMessage objects for testing."""
         return [
-            ModelRequest(parts=[TextPart(content="Hello")]),
+            ModelRequest(parts=[UserPromptPart(content="Hello")]),
             ModelResponse(parts=[TextPart(content="Hi there!")]),
         ]
 
@@ -205,6 +205,46 @@ class TestAutoSaveSessionFunctionality:
         mock_console_instance.print.assert_called_once()
 
 
+class TestBackgroundAutoSave:
+    @patch("ticca.config.save_session")
+    @patch("ticca.config.get_auto_save_session", return_value=True)
+    @patch("ticca.agents.agent_manager.get_current_agent")
+    def test_autosave_is_queued_on_the_writer(
+        self, mock_get_agent, mock_get_auto_save, mock_save_session, mock_config_paths
+    ):
+        history = ["hey", "listen"]
+        mock_agent = MagicMock()
+        mock_agent.get_message_history.return_value = history
+        mock_agent.display_name = "Code Agent"
+        mock_get_agent.return_value = mock_agent
+        mock_writer = MagicMock()
+
+        with patch("ticca.config.get_autosave_writer", return_value=mock_writer):
+            assert cp_config.auto_save_session_if_enabled() is True
+
+        mock_save_session.assert_not_called()
+        key, write = mock_writer.submit.call_args.args
+        assert key == cp_config.get_current_autosave_session_name()
+
+        history.append("later")
+        write()
+        kwargs = mock_save_session.call_args.kwargs
+        assert kwargs["history"] == ["hey", "listen"]
+        assert kwargs["auto_saved"] is True
+        assert kwargs["agent_name"] == "Code Agent"
+
+    @patch("ticca.config.rotate_autosave_id", return_value="fresh_id")
+    @patch("ticca.config.auto_save_session_if_enabled", return_value=True)
+    def test_finalize_flushes_before_rotating(self, mock_auto_save, mock_rotate):
+        mock_writer = MagicMock()
+        mock_writer.flush.side_effect = lambda: mock_rotate.assert_not_called()
+
+        with patch("ticca.config.get_autosave_writer", return_value=mock_writer):
+            assert cp_config.finalize_autosave_session() == "fresh_id"
+
+        mock_writer.flush.assert_called_once_with()
+
+
 class TestFinalizeAutoSaveSession:
     @patch("ticca.config.rotate_autosave_id", return_value="fresh_id")
     @patch("ticca.config.auto_save_session_if_enabled", return_value=True)
@@ -0,0 +1,384 @@
+"""Tests for background (non-blocking) summarization compaction."""
+
+import threading
+from concurrent.futures import Future
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from ticca.agents.agent_code_agent import CodeAgent
+from ticca.agents.base_agent import (
+    SUMMARIZATION_INSTRUCTIONS,
+    SUMMARY_MERGE_INSTRUCTIONS,
+)
+
+
+def _history(turns: int):
+    messages = [ModelRequest(parts=[SystemPromptPart(content="system prompt")])]
+    for i in range(turns):
+        messages.append(ModelRequest(parts=[UserPromptPart(content=f"question {i}")]))
+        messages.append(ModelResponse(parts=[TextPart(content=f"answer {i}")]))
+    return messages
+
+
+@pytest.fixture
+def agent():
+    with (
+        patch("ticca.agents.base_agent.get_protected_token_count", return_value=10),
+        patch("ticca.agents.base_agent.emit_info"),
+    ):
+        yield CodeAgent()
+
+
+@pytest.fixture
+def pending_future():
+    future = Future()
+
+    def submit(coro):
+        coro.close()
+        return future
+
+    with patch(
+        "ticca.agents.base_agent.run_in_summarizer_loop", side_effect=submit
+    ) as mock_submit:
+        yield future, mock_submit
+
+
+class TestBackgroundCompaction:
+    def test_start_snapshots_messages_outside_protected_tail(
+        self, agent, pending_future
+    ):
+        messages = _history(4)
+
+        assert agent.start_background_compaction(messages) is True
+
+        summarized = agent._background_compaction_source
+        assert summarized[0] == agent.hash_message(messages[1])
+        assert agent.hash_message(messages[-1]) not in summarized
+
+    def test_only_one_background_summarization_in_flight(self, agent, pending_future):
+        _, mock_submit = pending_future
+        messages = _history(4)
+
+        agent.start_background_compaction(messages)
+        agent.start_background_compaction(messages)
+
+        assert mock_submit.call_count == 1
+
+    def test_apply_is_noop_until_summary_is_ready(self, agent, pending_future):
+        messages = _history(4)
+        agent.start_background_compaction(messages)
+
+        assert agent.apply_background_compaction(messages) is None
+
+    def test_apply_swaps_summary_into_history(self, agent, pending_future):
+        future, _ = pending_future
+        messages = _history(4)
+        agent.start_background_compaction(messages)
+        summarized = list(agent._background_compaction_source)
+
+        summary = [ModelResponse(parts=[TextPart(content="summary")])]
+        future.set_result(summary)
+        # New messages arrived while the summary was being produced
+        messages = messages + [
+            ModelRequest(parts=[UserPromptPart(content="follow up")])
+        ]
+
+        compacted = agent.apply_background_compaction(messages)
+
+        assert compacted[0] is messages[0]
+        assert compacted[1] is summary[0]
+        assert compacted[2:] == messages[1 + len(summarized) :]
+        assert summarized[0] in agent.get_compacted_message_hashes()
+
+    def test_apply_with_filtered_messages_in_history(self, agent, pending_future):
+        future, _ = pending_future
+        history = _history(4)
+        huge = ModelResponse(parts=[TextPart(content="x" * 200_000)])
+        interrupted = ModelResponse(
+            parts=[ToolCallPart(tool_name="grep", args={}, tool_call_id="lost")]
+        )
+        messages = history[:2] + [huge, interrupted] + history[2:]
+        agent.start_background_compaction(messages)
+
+        summary = [ModelResponse(parts=[TextPart(content="summary")])]
+        future.set_result(summary)
+        compacted = agent.apply_background_compaction(messages)
+
+        assert compacted is not None
+        assert compacted[1] is summary[0]
+        assert huge not in compacted
+        assert interrupted not in compacted
+        assert compacted[-1] is messages[-1]
+
+    def test_apply_waits_for_pending_tool_calls(self, agent, pending_future):
+        future, _ = pending_future
+        messages = _history(4)
+        agent.start_background_compaction(messages)
+        future.set_result([ModelResponse(parts=[TextPart(content="summary")])])
+
+        messages = messages + [
+            ModelResponse(
+                parts=[ToolCallPart(tool_name="grep", args={}, tool_call_id="c1")]
+            )
+        ]
+
+        assert agent.apply_background_compaction(messages) is None
+        # Still available once the tool call has completed
+        assert agent.apply_background_compaction(messages[:-1]) is not None
+
+    def test_apply_discards_summary_when_history_changed(self, agent, pending_future):
+        future, _ = pending_future
+        agent.start_background_compaction(_history(4))
+        future.set_result([ModelResponse(parts=[TextPart(content="summary")])])
+
+        assert agent.apply_background_compaction(_history(1)) is None
+        assert agent._background_compaction is None
+
+    def test_clear_history_cancels_background_summarization(
+        self, agent, pending_future
+    ):
+        future, _ = pending_future
+        agent.start_background_compaction(_history(4))
+
+        agent.clear_message_history()
+
+        assert future.cancelled()
+        assert agent._background_compaction is None
+
+    def test_processor_does_not_block_on_summarization(self, agent, pending_future):
+        messages = _history(4)
+        agent.set_message_history(messages)
+
+        with (
+            patch(
+                "ticca.agents.base_agent.get_compaction_strategy",
+                return_value="summarization",
+            ),
+            patch("ticca.agents.base_agent.get_compaction_threshold", return_value=0.5),
+            patch(
+                "ticca.agents.base_agent.get_compaction_soft_threshold",
+                return_value=0.4,
+            ),
+            patch.object(agent, "get_model_context_length", return_value=40),
+            patch.object(agent, "summarize_messages") as mock_summarize,
+            patch("ticca.tui_state.is_tui_mode", return_value=False),
+        ):
+            result = agent.message_history_processor(MagicMock(), messages)
+
+        mock_summarize.assert_not_called()
+        assert result is messages
+        assert agent._background_compaction is not None
+
+    def test_full_context_waits_for_the_background_summary(self, agent, pending_future):
+        future, _ = pending_future
+        messages = _history(4)
+        agent.set_message_history(messages)
+        agent.start_background_compaction(messages)
+        summary = [ModelResponse(parts=[TextPart(content="summary")])]
+        threading.Timer(0.05, future.set_result, [summary]).start()
+
+        with (
+            patch(
+                "ticca.agents.base_agent.get_compaction_strategy",
+                return_value="summarization",
+            ),
+            patch("ticca.agents.base_agent.get_compaction_threshold", return_value=0.6),
+            patch(
+                "ticca.agents.base_agent.get_compaction_soft_threshold",
+                return_value=0.4,
+            ),
+            patch.object(agent, "get_model_context_length", return_value=20),
+            patch.object(agent, "summarize_messages") as mock_summarize,
+            patch("ticca.tui_state.is_tui_mode", return_value=False),
+        ):
+            result = agent.message_history_processor(MagicMock(), messages)
+
+        mock_summarize.assert_not_called()
+        assert not future.cancelled()
+        assert result[1] is summary[0]
+        assert agent.get_message_history() == result
+
+    def test_crossing_the_threshold_without_a_background_job_starts_one(
+        self, agent, pending_future
+    ):
+        messages = _history(4)
+        agent.set_message_history(messages)
+
+        with (
+            patch(
+                "ticca.agents.base_agent.get_compaction_strategy",
+                return_value="summarization",
+            ),
+            patch("ticca.agents.base_agent.get_compaction_threshold", return_value=0.5),
+            patch(
+                "ticca.agents.base_agent.get_compaction_soft_threshold",
+                return_value=1.0,
+            ),
+            patch.object(agent, "get_model_context_length", return_value=40),
+            patch.object(agent, "summarize_messages") as mock_summarize,
+            patch("ticca.tui_state.is_tui_mode", return_value=False),
+        ):
+            result = agent.message_history_processor(MagicMock(), messages)
+
+        mock_summarize.assert_not_called()
+        assert result is messages
+        assert agent._background_compaction is not None
+
+    def test_full_context_truncates_when_the_summary_is_late(
+        self, agent, pending_future
+    ):
+        future, _ = pending_future
+        messages = _history(4)
+        agent.set_message_history(messages)
+
+        with (
+            patch(
+                "ticca.agents.base_agent.get_compaction_strategy",
+                return_value="summarization",
+            ),
+            patch("ticca.agents.base_agent.get_compaction_threshold", return_value=0.6),
+            patch(
+                "ticca.agents.base_agent.get_compaction_soft_threshold",
+                return_value=1.0,
+            ),
+            patch(
+                "ticca.agents.base_agent.get_summarization_wait_timeout",
+                return_value=0.05,
+            ),
+            patch.object(agent, "get_model_context_length", return_value=20),
+            patch.object(agent, "summarize_messages") as mock_summarize,
+            patch("ticca.tui_state.is_tui_mode", return_value=False),
+            patch("ticca.agents.base_agent.emit_warning"),
+        ):
+            result = agent.message_history_processor(MagicMock(), messages)
+
+        mock_summarize.assert_not_called()
+        assert future.cancelled()
+        assert result[0] is messages[0]
+        assert len(result) < len(messages)
+        assert agent.get_message_history() == result
+
+
+@pytest.fixture
+def fake_summarizer():
+    calls = []
+
+    async def summarize(instructions, message_history):
+        calls.append((instructions, list(message_history)))
+        text = f"summary {len(calls)} " + "." * 110
+        return [ModelResponse(parts=[TextPart(content=text)])]
+
+    with patch(
+        "ticca.agents.base_agent.run_summarization",
+        new=AsyncMock(side_effect=summarize),
+    ):
+        yield calls
+
+
+def _chunk_budget(tokens: int):
+    return patch(
+        "ticca.agents.base_agent.get_summarization_chunk_tokens", return_value=tokens
+    )
+
+
+class TestChunkedSummarization:
+    def test_chunks_keep_tool_calls_with_their_returns(self, agent):
+        call = ModelResponse(
+            parts=[ToolCallPart(tool_name="grep", args={}, tool_call_id="c1")]
+        )
+        result = ModelRequest(
+            parts=[ToolReturnPart(tool_name="grep", content="hit", tool_call_id="c1")]
+        )
+        messages = _history(1)[1:] + [call, result] + _history(1)[1:]
+
+        with _chunk_budget(1):
+            chunks = agent.chunk_messages_for_summarization(messages)
+
+        assert [len(c) for c in chunks] == [1, 1, 2, 1, 1]
+        assert chunks[2] == [call, result]
+
+    async def test_chunk_summaries_are_cached(self, agent, fake_summarizer):
+        messages = _history(6)[1:]
+
+        with _chunk_budget(10_000):
+            first = await agent.summarize_incrementally(messages)
+            second = await agent.summarize_incrementally(messages)
+
+        assert len(fake_summarizer) == 1
+        assert second == first
+
+    async def test_cache_misses_when_a_middle_message_changes(
+        self, agent, fake_summarizer
+    ):
+        messages = _history(6)[1:]
+        edited = list(messages)
+        edited[5] = ModelResponse(parts=[TextPart(content="a different answer")])
+
+        with _chunk_budget(10_000):
+            await agent.summarize_incrementally(messages)
+            await agent.summarize_incrementally(edited)
+
+        assert len(fake_summarizer) == 2
+
+    async def test_previous_summaries_are_not_summarized_again(
+        self, agent, fake_summarizer
+    ):
+        older = _history(3)[1:]
+        newer = [ModelRequest(parts=[UserPromptPart(content="later question")])]
+
+        with _chunk_budget(10_000):
+            summary = await agent.summarize_incrementally(older)
+            result = await agent.summarize_incrementally(summary + newer)
+
+        assert len(fake_summarizer) == 2
+        assert fake_summarizer[1][1] == newer
+        assert result[: len(summary)] == summary
+
+    async def test_summaries_are_merged_hierarchically(self, agent, fake_summarizer):
+        messages = [
+            ModelRequest(parts=[UserPromptPart(content=f"question {i} " + "x" * 50)])
+            for i in range(12)
+        ]
+
+        with _chunk_budget(50):
+            result = await agent.summarize_incrementally(messages)
+
+        chunk_calls = [c for c in fake_summarizer if c[0] == SUMMARIZATION_INSTRUCTIONS]
+        merge_calls = [c for c in fake_summarizer if c[0] == SUMMARY_MERGE_INSTRUCTIONS]
+        assert len(chunk_calls) == 4
+        assert len(merge_calls) == 1
+        assert len(result) == 1
+
+
+class TestSummarizationAgentCache:
+    def test_agent_is_reused_until_model_changes(self):
+        from ticca import summarization_agent
+
+        with (
+            patch.object(
+                summarization_agent,
+                "reload_summarization_agent",
+                side_effect=lambda: object(),
+            ) as mock_reload,
+            patch.object(
+                summarization_agent, "get_global_model_name", return_value="model-a"
+            ) as mock_model_name,
+            patch.object(summarization_agent, "_summarization_agent", None),
+        ):
+            first = summarization_agent.get_summarization_agent()
+            assert summarization_agent.get_summarization_agent() is first
+            assert mock_reload.call_count == 1
+
+            mock_model_name.return_value = "model-b"
+            assert summarization_agent.get_summarization_agent() is not first
+            assert mock_reload.call_count == 2
@@ -0,0 +1,129 @@
+"""Tests for the content-addressed blob store."""
+
+import os
+from pathlib import Path
+
+import pytest
+from pydantic_ai.messages import (
+    BinaryContent,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    SystemPromptPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from ticca.blob_store import BLOB_REF_KEY, BlobStore
+from ticca.hybrid_storage import HybridStorage
+from ticca.tools.file_operations import ReadFileOutput
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    return BlobStore(tmp_path / "blobs")
+
+
+def _blob_files(store: BlobStore):
+    return list(store.root.glob("*/*.z"))
+
+
+class TestBlobStore:
+    def test_put_deduplicates_identical_payloads(self, store):
+        first = store.put(b"same payload")
+        second = store.put(b"same payload")
+
+        assert first == second
+        assert store.get(first) == b"same payload"
+        assert len(_blob_files(store)) == 1
+
+    def test_sweep_keeps_old_blob_stored_again(self, store):
+        digest = store.put(b"same payload")
+        path = store._path(digest)
+        os.utime(path, (0, 0))
+
+        # A save re-references the blob just before a retention sweep runs
+        store.put(b"same payload")
+        assert store.remove_unreferenced(set()) == (0, 0)
+        assert store.get(digest) == b"same payload"
+
+        os.utime(path, (0, 0))
+        assert store.remove_unreferenced(set())[0] == 1
+        assert not store.exists(digest)
+
+    def test_stream_yields_whole_payload(self, store):
+        payload = bytes(range(256)) * 2000
+        digest = store.put(payload)
+
+        assert b"".join(store.stream(digest, chunk_size=1024)) == payload
+
+    def test_missing_blob_raises(self, store):
+        with pytest.raises(FileNotFoundError):
+            store.get("0" * 64)
+
+    def test_externalize_roundtrips_tool_output_and_binaries(self, store):
+        image = BinaryContent(data=b"\x89PNG" + b"\x00" * 5000, media_type="image/png")
+        message = ModelRequest(
+            parts=[
+                UserPromptPart(content=["look", image]),
+                ToolReturnPart(
+                    tool_name="read_file", content="x" * 5000, tool_call_id="c1"
+                ),
+                ToolReturnPart(tool_name="grep", content="short", tool_call_id="c2"),
+            ]
+        )
+        data = ModelMessagesTypeAdapter.dump_python([message], mode="json")[0]
+
+        store.externalize(data, min_size=100)
+
+        assert BLOB_REF_KEY in data["parts"][0]["content"][1]["data"]
+        assert BLOB_REF_KEY in data["parts"][1]["content"]
+        assert data["parts"][2]["content"] == "short"
+        restored = ModelMessagesTypeAdapter.validate_python([store.internalize(data)])
+        assert ModelMessagesTypeAdapter.dump_json(restored) == (
+            ModelMessagesTypeAdapter.dump_json([message])
+        )
+
+
+def test_structured_tool_outputs_are_deduplicated(tmp_path: Path, store):
+    storage = HybridStorage(tmp_path / "sessions", blob_store=store)
+    output = ReadFileOutput(content="line of code\n" * 1000, num_tokens=3000)
+    history = [ModelRequest(parts=[SystemPromptPart(content="system")])]
+    for i in range(3):
+        history.append(
+            ModelRequest(
+                parts=[
+                    ToolReturnPart(
+                        tool_name="read_file", content=output, tool_call_id=f"c{i}"
+                    )
+                ]
+            )
+        )
+
+    storage.save_session("s1", history)
+
+    assert len(_blob_files(store)) == 1
+    assert storage._messages_path("s1").stat().st_size < len(output.content)
+    restored = storage.load_messages("s1")
+    assert restored[1].parts[0].content == output.model_dump(mode="json")
+
+
+def test_sessions_store_repeated_outputs_once(tmp_path: Path, store):
+    storage = HybridStorage(tmp_path / "sessions", blob_store=store)
+    output = "file contents\n" * 1000
+    history = [ModelRequest(parts=[SystemPromptPart(content="system")])]
+    for i in range(5):
+        history.append(
+            ModelRequest(
+                parts=[
+                    ToolReturnPart(
+                        tool_name="read_file", content=output, tool_call_id=f"c{i}"
+                    )
+                ]
+            )
+        )
+
+    storage.save_session("s1", history)
+
+    assert len(_blob_files(store)) == 1
+    assert storage._messages_path("s1").stat().st_size < len(output)
+    assert storage.load_messages("s1") == history
@@ -309,6 +309,26 @@ def test_non_command_returns_false():
     assert result is False
 
 
+def test_load_context_restores_what_fits_the_context_window():
+    agent = MagicMock()
+    agent.get_history_token_budget.return_value = 1234
+    agent.estimate_tokens_for_message.return_value = 1
+    with (
+        patch("ticca.messaging.emit_success"),
+        patch("ticca.agents.agent_manager.get_current_agent", return_value=agent),
+        patch("ticca.config.rotate_autosave_id", return_value="id"),
+        patch(
+            "ticca.command_line.session_commands.load_session",
+            return_value=["m1", "m2"],
+        ) as mock_load,
+    ):
+        result = handle_command("/load_context saved")
+
+    assert result is True
+    assert mock_load.call_args.kwargs["max_tokens"] == 1234
+    agent.set_message_history.assert_called_once_with(["m1", "m2"])
+
+
 def test_bare_slash_with_spaces():
     mocks = setup_messaging_mocks()
     mock_emit_info = mocks["emit_info"].start()
@@ -110,3 +110,28 @@ def test_set_compaction_strategy_invalid():
         # Reset the config directory
         ticca.config.CONFIG_DIR = original_config_dir
         ticca.config.CONFIG_FILE = original_config_file
+
+
+def test_set_compaction_strategy_tool_pruning():
+    """Test that we can set the compaction strategy to tool_pruning"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_config_dir = CONFIG_DIR
+        original_config_file = CONFIG_FILE
+
+        import ticca.config
+
+        ticca.config.CONFIG_DIR = temp_dir
+        ticca.config.CONFIG_FILE = os.path.join(temp_dir, "puppy.cfg")
+
+        config = configparser.ConfigParser()
+        config[DEFAULT_SECTION] = {}
+        config[DEFAULT_SECTION]["compaction_strategy"] = "tool_pruning"
+
+        with open(ticca.config.CONFIG_FILE, "w") as f:
+            config.write(f)
+
+        strategy = get_compaction_strategy()
+        assert strategy == "tool_pruning"
+
+        ticca.config.CONFIG_DIR = original_config_dir
+        ticca.config.CONFIG_FILE = original_config_file
@@ -0,0 +1,123 @@
+"""Tests for the shared directory listing cache."""
+
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ticca import directory_cache
+from ticca.directory_cache import DirectoryCache
+
+
+def _age(path, seconds=60):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("print()")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "README.md").write_text("# readme")
+    (tmp_path / "b_dir").mkdir()
+    _age(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def cache():
+    cache = DirectoryCache()
+    yield cache
+    cache.stop_watching()
+
+
+def _names(entries):
+    return [entry.name for entry in entries]
+
+
+def _count_scans():
+    return patch.object(directory_cache.os, "scandir", wraps=os.scandir)
+
+
+def test_lists_directories_first_without_ignored_ones(cache, tree):
+    entries = cache.list_dir(str(tree))
+
+    assert _names(entries) == ["b_dir", "src", "README.md"]
+    assert cache.is_dir(str(tree / "src")) is True
+    assert cache.is_dir(str(tree / "README.md")) is False
+    assert cache.is_dir(str(tree / "unknown")) is None
+
+
+def test_unchanged_directory_is_not_read_again(cache, tree):
+    with _count_scans() as scandir:
+        cache.list_dir(str(tree))
+        cache.list_dir(str(tree))
+
+    assert scandir.call_count == 1
+
+
+def test_directory_is_read_again_when_its_mtime_changes(cache, tree):
+    cache.list_dir(str(tree))
+    (tree / "new.txt").write_text("new")
+    _age(tree, seconds=30)
+
+    assert "new.txt" in _names(cache.list_dir(str(tree)))
+
+
+def test_recently_modified_directory_is_not_trusted(cache, tree):
+    os.utime(tree)
+    with _count_scans() as scandir:
+        cache.list_dir(str(tree))
+        cache.list_dir(str(tree))
+
+    assert scandir.call_count == 2
+
+
+def test_least_recently_used_listings_are_dropped(tree):
+    cache = DirectoryCache(max_listings=1)
+    cache.list_dir(str(tree))
+    cache.list_dir(str(tree / "src"))
+
+    assert cache.is_dir(str(tree / "src")) is None
+    assert cache.is_dir(str(tree / "src" / "main.py")) is False
+
+
+def test_invalidate_notifies_listeners(cache, tree):
+    changed = []
+    cache.add_listener(changed.append)
+    cache.list_dir(str(tree))
+
+    cache.invalidate(str(tree))
+    cache.invalidate(str(tree))
+
+    assert changed == [str(tree)]
+
+
+def test_watched_directories_are_invalidated_by_filesystem_events(cache, tree):
+    pytest.importorskip("watchdog")
+    assert cache.enable_watching()
+    changed = threading.Event()
+    cache.add_listener(lambda path: changed.set())
+    cache.list_dir(str(tree))
+
+    with patch.object(directory_cache.os, "stat", side_effect=AssertionError):
+        cache.list_dir(str(tree))
+    (tree / "created.txt").write_text("created")
+
+    assert changed.wait(timeout=5)
+    assert "created.txt" in _names(cache.list_dir(str(tree)))
+
+
+def test_list_files_non_recursive_uses_the_cache(tree):
+    from ticca.tools.file_operations import _list_files
+
+    with patch.object(directory_cache, "_directory_cache", DirectoryCache()):
+        result = _list_files(None, str(tree), recursive=False)
+        cached = directory_cache.get_directory_cache().is_dir(str(tree / "src"))
+
+    assert cached is True
+    assert "README.md" in result.content
+    assert "node_modules" not in result.content
@@ -0,0 +1,493 @@
+"""Tests for the append-only session log in hybrid storage."""
+
+import os
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from ticca.hybrid_storage import HybridStorage, create_storage
+from ticca.session_storage import load_session, save_session
+
+
+def _history(turns: int):
+    messages = [ModelRequest(parts=[SystemPromptPart(content="system prompt")])]
+    for i in range(turns):
+        messages.append(ModelRequest(parts=[UserPromptPart(content=f"question {i}")]))
+        messages.append(ModelResponse(parts=[TextPart(content=f"answer {i}")]))
+    return messages
+
+
+@pytest.fixture
+def storage(tmp_path: Path):
+    return create_storage(tmp_path)
+
+
+def _log_lines(storage, session_id: str):
+    return storage._log_path(session_id).read_text(encoding="utf-8").splitlines()
+
+
+class TestAppendOnlySessionLog:
+    def test_second_save_appends_only_new_messages(self, storage):
+        history = _history(2)
+        storage.save_session("s1", history)
+        first_lines = _log_lines(storage, "s1")
+
+        history = history + _history(3)[5:]
+        estimator = MagicMock(return_value=1)
+        metadata = storage.save_session("s1", history, token_estimator=estimator)
+
+        lines = _log_lines(storage, "s1")
+        assert lines[: len(first_lines)] == first_lines
+        assert len(lines) == len(history)
+        assert estimator.call_count == 2  # only the two new messages
+        assert metadata.message_count == len(history)
+        assert [m.content for m in storage.load_session("s1")][-1] == "answer 2"
+
+    def test_token_total_accumulates_across_saves(self, storage):
+        history = _history(1)
+        storage.save_session("s1", history, token_estimator=lambda m: 10)
+        metadata = storage.save_session(
+            "s1", history + _history(2)[3:], token_estimator=lambda m: 10
+        )
+
+        assert metadata.total_tokens == 50
+        assert storage.get_session_metadata("s1").total_tokens == 50
+
+    def test_rewrites_log_when_history_was_compacted(self, storage):
+        history = _history(3)
+        storage.save_session("s1", history)
+
+        compacted = [history[0], ModelResponse(parts=[TextPart(content="summary")])]
+        compacted += history[-2:]
+        storage.save_session("s1", compacted)
+
+        contents = [m.content for m in storage.load_session("s1")]
+        assert contents == ["system prompt", "summary", "question 2", "answer 2"]
+
+    def test_rewrites_log_after_torn_write(self, storage):
+        history = _history(1)
+        storage.save_session("s1", history)
+        with storage._log_path("s1").open("a", encoding="utf-8") as f:
+            f.write('{"role": "user", "cont')
+
+        assert len(storage.load_session("s1")) == len(history)
+
+        history = history + _history(2)[3:]
+        storage.save_session("s1", history)
+
+        assert len(storage.load_session("s1")) == len(history)
+
+    def test_loads_legacy_json_sessions(self, storage):
+        legacy = storage.json_dir / "old.json"
+        legacy.write_text(
+            '[{"role": "user", "content": "hi", "timestamp": "t"}]', encoding="utf-8"
+        )
+
+        assert [m.content for m in storage.load_session("old")] == ["hi"]
+
+
+class TestStorageConnection:
+    def test_storage_is_cached_per_base_dir(self, tmp_path: Path):
+        storage = create_storage(tmp_path)
+
+        assert create_storage(tmp_path / ".") is storage
+        assert create_storage(tmp_path / "other") is not storage
+
+    def test_uses_wal_journal_mode(self, storage):
+        with storage._transaction() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == "wal"
+
+    def test_connection_is_usable_from_other_threads(self, storage):
+        errors = []
+
+        def save():
+            try:
+                storage.save_session("threaded", _history(1))
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        thread = threading.Thread(target=save)
+        thread.start()
+        thread.join()
+
+        assert errors == []
+        assert storage.get_session_metadata("threaded").message_count == 3
+
+    def test_cleanup_deletes_oldest_sessions_and_logs(self, storage):
+        for name in ("a", "b", "c", "d"):
+            storage.save_session(name, _history(1))
+
+        removed = storage.cleanup_old_sessions(2)
+
+        assert sorted(removed) == ["a", "b"]
+        assert sorted(m.session_id for m in storage.list_sessions()) == ["c", "d"]
+        assert not storage._log_path("a").exists()
+
+
+def test_autosave_skips_legacy_metadata_file(tmp_path: Path):
+    metadata = save_session(
+        history=_history(1),
+        session_name="auto",
+        base_dir=tmp_path,
+        timestamp="2024-01-01T00:00:00",
+        token_estimator=lambda m: 1,
+        auto_saved=True,
+    )
+
+    assert metadata.total_tokens == 3
+    assert not metadata.metadata_path.exists()
+
+
+class TestFullFidelityMessages:
+    def _tool_history(self):
+        history = _history(1)
+        history.append(
+            ModelResponse(
+                parts=[
+                    ToolCallPart(
+                        tool_name="read_file",
+                        args={"file_path": "a.py"},
+                        tool_call_id="c1",
+                    )
+                ]
+            )
+        )
+        history.append(
+            ModelRequest(
+                parts=[
+                    ToolReturnPart(
+                        tool_name="read_file", content="print(1)", tool_call_id="c1"
+                    )
+                ]
+            )
+        )
+        history.append(ModelResponse(parts=[TextPart(content="done")]))
+        return history
+
+    def test_roundtrips_tool_calls_and_returns(self, storage):
+        history = self._tool_history()
+        storage.save_session("s1", history)
+
+        assert storage.load_messages("s1") == history
+
+    def test_appends_frames_across_saves(self, storage):
+        history = self._tool_history()
+        storage.save_session("s1", history[:3])
+        size_before = storage._messages_path("s1").stat().st_size
+
+        storage.save_session("s1", history)
+
+        assert storage._messages_path("s1").stat().st_size > size_before
+        assert storage.load_messages("s1") == history
+
+    def test_rewrites_frames_when_history_was_compacted(self, storage):
+        history = self._tool_history()
+        storage.save_session("s1", history)
+
+        compacted = [history[0]] + history[-1:]
+        storage.save_session("s1", compacted)
+
+        assert storage.load_messages("s1") == compacted
+
+    def test_loads_tail_with_first_message(self, storage):
+        history = self._tool_history()
+        storage.save_session("s1", history)
+
+        assert storage.load_messages("s1", tail=1) == [history[0]] + history[-1:]
+        assert storage.load_messages("s1", tail=len(history)) == history
+
+    def test_tail_never_starts_with_an_orphan_tool_return(self, storage):
+        history = self._tool_history()
+        storage.save_session("s1", history)
+
+        # The last two messages are a tool return and the reply after it
+        assert storage.load_messages("s1", tail=2) == [history[0]] + history[-3:]
+
+    def test_token_budget_leaves_older_frames_undecoded(self, storage):
+        history = _history(20)
+        storage.save_session("s1", history)
+
+        with patch.object(
+            storage, "_read_frame", wraps=storage._read_frame
+        ) as read_frame:
+            loaded = storage.load_messages("s1", max_tokens=1)
+
+        assert loaded == [history[0], history[-1]]
+        assert read_frame.call_count == 2
+        assert storage.load_messages("s1", max_tokens=10**6) == history
+
+    def test_token_budget_still_reaches_back_to_tool_calls(self, storage):
+        history = self._tool_history()[:-1]
+        storage.save_session("s1", history)
+
+        # The budget runs out on the tool return, which needs its call
+        assert storage.load_messages("s1", max_tokens=1) == (
+            [history[0]] + history[-2:]
+        )
+
+    def test_session_storage_restores_exact_history(self, tmp_path: Path):
+        history = self._tool_history()
+        save_session(
+            history=history,
+            session_name="exact",
+            base_dir=tmp_path,
+            timestamp="2024-01-01T00:00:00",
+            token_estimator=lambda m: 1,
+        )
+
+        assert load_session("exact", tmp_path) == history
+
+    def test_falls_back_to_readable_log_without_frames(self, storage):
+        storage.save_session("s1", _history(1))
+        storage._messages_path("s1").unlink()
+        with storage._transaction() as conn:
+            conn.execute("DELETE FROM session_messages")
+
+        with pytest.raises(FileNotFoundError):
+            storage.load_messages("s1")
+        assert len(storage.load_session("s1")) == 3
+
+
+class TestIncrementalSemanticIndex:
+    @pytest.fixture
+    def semantic_storage(self, storage):
+        storage.enable_semantic_search = True
+        storage.chroma_collection = MagicMock()
+        return storage
+
+    def _upserted_ids(self, collection):
+        return [
+            id_
+            for call in collection.upsert.call_args_list
+            for id_ in call.kwargs["ids"]
+        ]
+
+    def test_only_new_messages_are_embedded(self, semantic_storage):
+        collection = semantic_storage.chroma_collection
+
+        semantic_storage.save_session("s1", _history(2))
+        semantic_storage.flush_index()
+        first = self._upserted_ids(collection)
+        semantic_storage.save_session("s1", _history(3))
+        semantic_storage.flush_index()
+
+        assert len(first) == 4
+        assert len(self._upserted_ids(collection)) == 6
+
+    def test_rewrite_does_not_reembed_unchanged_messages(self, semantic_storage):
+        collection = semantic_storage.chroma_collection
+        semantic_storage.save_session("s1", _history(3))
+        semantic_storage.flush_index()
+        collection.upsert.reset_mock()
+
+        # Dropping a turn forces a full log rewrite
+        compacted = _history(3)[:1] + _history(3)[3:]
+        semantic_storage.save_session("s1", compacted)
+        semantic_storage.flush_index()
+
+        collection.upsert.assert_not_called()
+
+    def test_embedding_runs_off_the_saving_thread(self, semantic_storage):
+        threads = []
+        semantic_storage.chroma_collection.upsert.side_effect = lambda **kwargs: (
+            threads.append(threading.current_thread())
+        )
+
+        semantic_storage.save_session("s1", _history(2))
+        semantic_storage.flush_index()
+
+        assert threads and threading.current_thread() not in threads
+
+    def test_cleanup_forgets_indexed_hashes(self, semantic_storage):
+        semantic_storage.save_session("s1", _history(1))
+        semantic_storage.flush_index()
+
+        semantic_storage.cleanup_old_sessions(max_sessions=0)
+
+        with semantic_storage._transaction() as conn:
+            assert (
+                conn.execute("SELECT COUNT(*) FROM indexed_messages").fetchone()[0] == 0
+            )
+
+
+class TestFullTextSearch:
+    def _conversation(self, *texts):
+        messages = [ModelRequest(parts=[SystemPromptPart(content="system prompt")])]
+        for text in texts:
+            messages.append(ModelRequest(parts=[UserPromptPart(content=text)]))
+            messages.append(ModelResponse(parts=[TextPart(content=f"done: {text}")]))
+        return messages
+
+    def test_finds_matching_messages_across_sessions(self, storage):
+        storage.save_session("auth", self._conversation("fix the OAuth token refresh"))
+        storage.save_session("ui", self._conversation("restyle the sidebar"))
+
+        results = storage.search_messages("oauth refreshing")
+
+        assert {r["session_id"] for r in results} == {"auth"}
+        assert "**OAuth**" in results[0]["snippet"]
+
+    def test_appended_messages_become_searchable(self, storage):
+        history = self._conversation("first question")
+        storage.save_session("s1", history)
+        storage.save_session(
+            "s1", history + self._conversation("kubernetes rollout")[1:]
+        )
+
+        assert sorted(
+            r["message_index"] for r in storage.search_messages("kubernetes")
+        ) == [3, 4]
+        assert len(storage.search_messages("first")) == 2
+
+    def test_rewrite_replaces_indexed_messages(self, storage):
+        storage.save_session("s1", self._conversation("alpha", "beta"))
+        storage.save_session("s1", self._conversation("gamma"))
+
+        assert storage.search_messages("alpha") == []
+        assert len(storage.search_messages("gamma")) == 2
+
+    def test_query_syntax_is_taken_literally(self, storage):
+        storage.save_session("s1", self._conversation('what does "NOT" AND (x) mean'))
+
+        assert storage.search_messages('"NOT" AND (x)')
+        assert storage.search_messages("   ") == []
+
+    def test_cleanup_removes_search_rows(self, storage):
+        storage.save_session("s1", self._conversation("alpha"))
+
+        storage.cleanup_old_sessions(max_sessions=0)
+
+        assert storage.search_messages("alpha") == []
+
+    def test_existing_sessions_are_backfilled(self, tmp_path: Path):
+        storage = HybridStorage(tmp_path)
+        storage.save_session("s1", self._conversation("legacy session"))
+        with storage._transaction() as conn:
+            conn.execute("DROP TABLE messages_fts")
+            conn.execute("DELETE FROM search_documents")
+        storage.close()
+
+        reopened = HybridStorage(tmp_path)
+        for thread in threading.enumerate():
+            if thread.name == "fts-backfill":
+                thread.join()
+
+        assert len(reopened.search_messages("legacy")) == 2
+
+
+class TestSessionListing:
+    def test_pages_most_recently_updated_first(self, storage):
+        for name in ("a", "b", "c"):
+            storage.save_session(name, _history(1))
+        storage.save_session("a", _history(2))
+
+        first = storage.list_recent_sessions(offset=0, limit=2)
+        second = storage.list_recent_sessions(offset=2, limit=2)
+
+        assert [m.session_id for m in first + second] == ["a", "c", "b"]
+        assert storage.count_sessions() == 3
+
+    def test_preview_tracks_last_user_message(self, storage):
+        history = _history(1)
+        storage.save_session("s1", history)
+        # Appending only assistant text keeps the previous preview
+        storage.save_session(
+            "s1", history + [ModelResponse(parts=[TextPart(content="more")])]
+        )
+
+        [metadata] = storage.list_recent_sessions()
+        assert metadata.preview == "question 0"
+
+    def test_missing_preview_is_loaded_and_remembered(self, storage):
+        storage.save_session("s1", _history(2))
+        with storage._transaction() as conn:
+            conn.execute("UPDATE sessions SET preview = NULL")
+
+        assert storage.list_recent_sessions()[0].preview is None
+        assert storage.load_preview("s1") == "question 1"
+        assert storage.list_recent_sessions()[0].preview == "question 1"
+
+
+def _backdate(*paths: Path):
+    old = time.time() - 3600
+    for path in paths:
+        os.utime(path, (old, old))
+
+
+class TestCrashRecovery:
+    def test_failed_rewrite_leaves_committed_session_intact(self, storage):
+        history = _history(2)
+        storage.save_session("s1", history)
+
+        with patch.object(
+            storage, "_write_message_frames", side_effect=OSError("disk full")
+        ):
+            with pytest.raises(OSError):
+                storage.save_session("s1", _history(1))
+
+        assert storage.load_messages("s1") == history
+        assert len(storage.load_session("s1")) == 5
+
+    def test_committed_rewrite_is_installed_on_startup(self, tmp_path: Path):
+        storage = HybridStorage(tmp_path)
+        storage.save_session("s1", _history(3))
+        compacted = _history(1)
+        # Crash between committing the row and installing the staged files
+        with patch.object(storage, "_finish_rewrite"):
+            storage.save_session("s1", compacted)
+        storage.close()
+
+        reopened = HybridStorage(tmp_path)
+
+        assert reopened.load_messages("s1") == compacted
+        assert len(reopened.load_session("s1")) == 3
+        assert list(reopened.json_dir.glob("*.tmp")) == []
+
+    def test_uncommitted_appends_are_truncated_on_startup(self, tmp_path: Path):
+        storage = HybridStorage(tmp_path)
+        history = _history(1)
+        storage.save_session("s1", history)
+        log_path = storage._log_path("s1")
+        messages_path = storage._messages_path("s1")
+        with log_path.open("ab") as f:
+            f.write(b'{"role": "user", "content": "half wri')
+        with messages_path.open("ab") as f:
+            f.write(b"garbage")
+        stray = storage.json_dir / "s2.jsonl.tmp"
+        stray.write_text("uncommitted rewrite")
+        _backdate(log_path, messages_path, stray)
+        storage.close()
+
+        reopened = HybridStorage(tmp_path)
+
+        assert reopened.recover_sessions() == []
+        assert len(reopened.load_session("s1")) == 3
+        assert not stray.exists()
+        # The log is intact again, so the next save appends
+        reopened.save_session("s1", history + _history(2)[3:])
+        assert len(_log_lines(reopened, "s1")) == 5
+
+    def test_recent_files_are_left_for_their_writer(self, tmp_path: Path):
+        storage = HybridStorage(tmp_path)
+        storage.save_session("s1", _history(1))
+        with storage._log_path("s1").open("ab") as f:
+            f.write(b"in flight")
+
+        assert storage.recover_sessions() == []
+        assert storage._log_path("s1").read_bytes().endswith(b"in flight")
+        # Readers only see the committed part
+        assert len(storage.load_session("s1")) == 3
@@ -0,0 +1,247 @@
+"""Tests for the UI message queue's delivery and overflow handling."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from rich.text import Text
+
+from ticca.messaging.coalescer import merge_messages
+from ticca.messaging.message_queue import MessageQueue, MessageType, UIMessage
+
+
+def _queue(**kwargs):
+    queue = MessageQueue(**kwargs)
+    queue.start()
+    queue.mark_renderer_active()
+    return queue
+
+
+def _drain_sync(queue):
+    messages = []
+    while (message := queue.get_nowait()) is not None:
+        messages.append(message)
+    return messages
+
+
+async def _get_after(queue, emit):
+    emit()
+    return await asyncio.wait_for(queue.get_async(), timeout=1)
+
+
+async def test_async_consumer_gets_messages_from_other_threads_in_order():
+    queue = _queue()
+    first = await _get_after(queue, lambda: queue.emit_simple(MessageType.INFO, "0"))
+    assert first.content == "0"
+
+    def produce():
+        for i in range(1, 50):
+            queue.emit_simple(MessageType.INFO, str(i))
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    received = [
+        (await asyncio.wait_for(queue.get_async(), timeout=1)).content
+        for _ in range(49)
+    ]
+    thread.join()
+
+    assert received == [str(i) for i in range(1, 50)]
+    assert queue.stats.delivered == 50
+
+
+async def test_one_drain_is_scheduled_per_batch():
+    queue = _queue()
+    await _get_after(queue, lambda: queue.emit_simple(MessageType.INFO, "warmup"))
+
+    loop = asyncio.get_running_loop()
+    calls = []
+    original = loop.call_soon_threadsafe
+
+    def counting(callback, *args):
+        calls.append(callback)
+        return original(callback, *args)
+
+    loop.call_soon_threadsafe = counting
+    try:
+        for i in range(20):
+            queue.emit_simple(MessageType.INFO, str(i))
+        messages = [await queue.get_async() for _ in range(20)]
+    finally:
+        del loop.call_soon_threadsafe
+
+    assert len(calls) == 1
+    assert [m.content for m in messages] == [str(i) for i in range(20)]
+
+
+async def test_drain_respects_consumer_capacity():
+    queue = _queue(maxsize=3)
+    await _get_after(queue, lambda: queue.emit_simple(MessageType.INFO, "warmup"))
+
+    for i in range(5):
+        queue.emit_simple(MessageType.INFO, str(i))
+    await asyncio.sleep(0)
+
+    assert queue._async_queue.qsize() == 3
+    assert [(await queue.get_async()).content for _ in range(5)] == [
+        str(i) for i in range(5)
+    ]
+
+
+def test_coalesce_policy_merges_same_group_messages():
+    queue = _queue(maxsize=2, overflow_policy="coalesce", coalesce_window=0)
+    queue.emit_simple(MessageType.INFO, "other")
+    queue.emit_simple(MessageType.TOOL_OUTPUT, "line 1", message_group="grep_1")
+    queue.emit_simple(MessageType.TOOL_OUTPUT, "line 2", message_group="grep_1")
+    queue.emit_simple(MessageType.TOOL_OUTPUT, "line 3", message_group="grep_1")
+
+    messages = _drain_sync(queue)
+
+    assert [m.content for m in messages] == ["other", "line 1\nline 2\nline 3"]
+    assert queue.stats.coalesced == 2
+    assert queue.stats.spilled == 0
+
+
+def test_coalesce_policy_spills_what_it_cannot_merge():
+    queue = _queue(maxsize=1, overflow_policy="coalesce")
+    queue.emit_simple(MessageType.INFO, "first")
+    queue.emit_simple(MessageType.ERROR, "error")
+
+    assert [m.content for m in _drain_sync(queue)] == ["first", "error"]
+    assert queue.stats.spilled == 1
+
+
+def test_spill_policy_never_drops():
+    queue = _queue(maxsize=2, overflow_policy="spill")
+    for i in range(10):
+        queue.emit_simple(MessageType.INFO, str(i))
+
+    assert [m.content for m in _drain_sync(queue)] == [str(i) for i in range(10)]
+    assert queue.stats.spilled == 8
+
+
+def test_block_policy_waits_for_the_consumer():
+    queue = _queue(maxsize=1, overflow_policy="block")
+    queue.emit_simple(MessageType.INFO, "first")
+
+    producer = threading.Thread(
+        target=lambda: queue.emit_simple(MessageType.INFO, "second")
+    )
+    producer.start()
+    time.sleep(0.05)
+    assert producer.is_alive()
+
+    assert queue.get_nowait().content == "first"
+    producer.join(timeout=1)
+
+    assert not producer.is_alive()
+    assert queue.get_nowait().content == "second"
+    assert queue.stats.blocked == 1
+    assert queue.stats.spilled == 0
+
+
+def test_get_wakes_up_when_a_message_arrives():
+    queue = _queue()
+    threading.Timer(0.05, lambda: queue.emit_simple(MessageType.INFO, "hello")).start()
+
+    started = time.monotonic()
+    message = queue.get(timeout=5)
+
+    assert message.content == "hello"
+    assert time.monotonic() - started < 1
+
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        MessageQueue(overflow_policy="drop")
+
+
+def test_merge_messages_handles_text_content():
+    target = UIMessage(MessageType.TOOL_OUTPUT, "a", metadata={"message_group": "g"})
+    message = UIMessage(
+        MessageType.TOOL_OUTPUT,
+        Text("b", style="bold"),
+        metadata={"message_group": "g"},
+    )
+
+    assert merge_messages(target, message)
+    assert isinstance(target.content, Text)
+    assert target.content.plain == "a\nb"
+
+
+def test_merge_messages_requires_a_shared_group():
+    target = UIMessage(MessageType.TOOL_OUTPUT, "a")
+    message = UIMessage(MessageType.TOOL_OUTPUT, "b")
+
+    assert not merge_messages(target, message)
+
+
+def test_burst_of_group_lines_is_coalesced():
+    queue = _queue()
+    for i in range(5):
+        queue.emit_simple(MessageType.TOOL_OUTPUT, f"line {i}", message_group="grep_1")
+    queue.emit_simple(MessageType.INFO, "done", message_group="grep_1")
+    queue.emit_simple(MessageType.INFO, "unrelated")
+
+    messages = _drain_sync(queue)
+
+    assert [m.content for m in messages] == [
+        "line 0\nline 1\nline 2\nline 3\nline 4",
+        "done",
+        "unrelated",
+    ]
+    assert queue.stats.coalesced == 4
+
+
+def test_messages_outside_the_window_are_not_coalesced():
+    queue = _queue(coalesce_window=0.01)
+    queue.emit_simple(MessageType.TOOL_OUTPUT, "first", message_group="grep_1")
+    time.sleep(0.03)
+    queue.emit_simple(MessageType.TOOL_OUTPUT, "second", message_group="grep_1")
+
+    assert [m.content for m in _drain_sync(queue)] == ["first", "second"]
+
+
+def test_coalescing_can_be_disabled():
+    queue = _queue(coalesce_window=0)
+    for i in range(3):
+        queue.emit_simple(MessageType.TOOL_OUTPUT, str(i), message_group="grep_1")
+
+    assert len(_drain_sync(queue)) == 3
+
+
+async def test_async_consumer_gets_one_message_per_burst():
+    queue = _queue()
+    await _get_after(queue, lambda: queue.emit_simple(MessageType.INFO, "warmup"))
+
+    def produce():
+        for i in range(100):
+            queue.emit_simple(
+                MessageType.COMMAND_OUTPUT, f"{i}", message_group="shell_1"
+            )
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    lines = []
+    messages = 0
+    while len(lines) < 100:
+        message = await asyncio.wait_for(queue.get_async(), timeout=1)
+        lines.extend(message.content.splitlines())
+        messages += 1
+    thread.join()
+
+    assert lines == [str(i) for i in range(100)]
+    assert messages < 10
+
+
+async def test_ungrouped_message_flushes_held_lines():
+    queue = _queue(coalesce_window=10)
+    await _get_after(queue, lambda: queue.emit_simple(MessageType.INFO, "warmup"))
+
+    queue.emit_simple(MessageType.TOOL_OUTPUT, "held", message_group="grep_1")
+    queue.emit_simple(MessageType.ERROR, "error")
+
+    first = await asyncio.wait_for(queue.get_async(), timeout=1)
+    second = await asyncio.wait_for(queue.get_async(), timeout=1)
+    assert [first.content, second.content] == ["held", "error"]
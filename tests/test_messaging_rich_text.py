@@ -0,0 +1,116 @@
+"""Tests for cached plain-text rendering of Rich objects."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rich.console import Console
+from rich.markdown import Markdown
+from rich.table import Table
+from rich.text import Text
+
+from ticca.messaging import rich_text
+from ticca.messaging.rich_text import clear_render_cache, render_to_text
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_render_cache()
+    yield
+    clear_render_cache()
+
+
+def _table():
+    table = Table(title="Files")
+    table.add_column("Name")
+    table.add_row("main.py")
+    return table
+
+
+def test_renders_plain_text():
+    text = render_to_text(_table())
+
+    assert "Files" in text
+    assert "main.py" in text
+    assert "\x1b[" not in text
+    assert not text.endswith("\n")
+
+
+def test_same_object_is_rendered_once_per_width():
+    table = _table()
+    with patch.object(
+        Console, "print", autospec=True, side_effect=Console.print
+    ) as mock_print:
+        first = render_to_text(table)
+        assert render_to_text(table) == first
+        render_to_text(table, width=40)
+
+    assert mock_print.call_count == 2
+
+
+def test_equal_content_shares_a_cache_entry():
+    with patch.object(
+        Console, "print", autospec=True, side_effect=Console.print
+    ) as mock_print:
+        render_to_text(Markdown("# Title"))
+        render_to_text(Markdown("# Title"))
+        render_to_text(Text("hello", style="bold"))
+        render_to_text(Text("hello", style="bold"))
+
+    assert mock_print.call_count == 2
+
+
+def test_width_is_applied():
+    text = render_to_text(Text("word " * 30), width=20)
+
+    assert max(len(line) for line in text.splitlines()) <= 20
+
+
+def test_cache_is_bounded():
+    with patch.object(rich_text, "RENDER_CACHE_SIZE", 3):
+        for i in range(10):
+            render_to_text(Text(f"line {i}"))
+
+        assert len(rich_text._cache) == 3
+
+
+def test_each_thread_gets_its_own_console():
+    consoles = []
+
+    def capture():
+        consoles.append(rich_text._capture_console())
+        consoles.append(rich_text._capture_console())
+
+    thread = threading.Thread(target=capture)
+    thread.start()
+    thread.join()
+    capture()
+
+    assert consoles[0] is consoles[1]
+    assert consoles[2] is consoles[3]
+    assert consoles[0] is not consoles[2]
+
+
+def test_markup_in_strings_is_only_parsed_when_asked_for():
+    table = Table()
+    table.add_column("Name")
+    table.add_row("[bold]main.py[/bold]")
+
+    assert "[bold]main.py[/bold]" in render_to_text(table)
+    assert "[bold]" not in render_to_text(table, markup=True)
+    assert "main.py" in render_to_text(table, markup=True)
+
+
+def test_queue_console_keeps_parsing_markup_in_rich_objects():
+    from ticca.messaging.queue_console import QueueConsole
+
+    queue = MagicMock()
+    table = Table()
+    table.add_column("Name")
+    table.add_row("[bold]main.py[/bold]")
+
+    QueueConsole(queue=queue).print("Files:", table)
+
+    content = queue.emit_simple.call_args[0][1]
+    assert "main.py" in content
+    assert "[bold]" not in content
@@ -0,0 +1,129 @@
+"""Tests for streaming the agent's response while it is generated."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ToolCallPart,
+)
+
+from ticca.agents.response_stream import ResponseStream, complete_markdown_blocks
+
+
+def _text(content):
+    return PartStartEvent(index=0, part=TextPart(content=content))
+
+
+def _delta(content):
+    return PartDeltaEvent(index=0, delta=TextPartDelta(content_delta=content))
+
+
+def _tool_call(name):
+    return FunctionToolCallEvent(part=ToolCallPart(tool_name=name, args={}))
+
+
+class TestResponseStream:
+    """Test suite for ResponseStream."""
+
+    async def test_text_is_passed_on_as_it_arrives(self):
+        """Test that deltas reach on_text and the response is recognised."""
+        received = []
+        stream = ResponseStream(lambda text, new: received.append((text, new)), frame=0)
+
+        async def events():
+            for event in [_text("Hello"), _delta(" wor"), _delta("ld")]:
+                yield event
+
+        await stream(MagicMock(), events())
+
+        assert received == [("Hello", True), (" wor", False), ("ld", False)]
+        assert stream.shows("Hello world")
+        assert not stream.shows("Something else")
+
+    def test_updates_are_throttled_to_the_frame(self):
+        """Test that deltas within a frame are batched into one update."""
+        received = []
+        stream = ResponseStream(lambda text, new: received.append(text), frame=60)
+
+        stream.handle_event(_text("one "))
+        stream.handle_event(_delta("two "))
+        stream.handle_event(_delta("three"))
+        assert received == ["one "]
+
+        stream.flush(force=True)
+        assert received == ["one ", "two three"]
+
+    async def test_held_back_text_is_shown_when_the_model_pauses(self):
+        """Test that buffered text is flushed without waiting for more events."""
+        received = []
+        stream = ResponseStream(lambda text, new: received.append(text), frame=0.02)
+
+        stream.handle_event(_text("one "))
+        stream.handle_event(_delta("two"))
+        assert received == ["one "]
+
+        await asyncio.sleep(0.1)
+        assert received == ["one ", "two"]
+
+    def test_tool_calls_start_a_new_block(self):
+        """Test that tool calls are announced and end the current block."""
+        received = []
+        tools = []
+        stream = ResponseStream(
+            lambda text, new: received.append((text, new)), tools.append, frame=60
+        )
+
+        stream.handle_event(_text("Let me look"))
+        stream.handle_event(_delta(" around"))
+        stream.handle_event(_tool_call("list_files"))
+        stream.handle_event(_text("Found it"))
+        stream.flush(force=True)
+
+        assert tools == ["list_files"]
+        assert received == [
+            ("Let me look", True),
+            (" around", False),
+            ("Found it", True),
+        ]
+        assert stream.shows("Found it")
+        assert not stream.shows("Let me look around")
+
+    def test_markdown_blocks_are_passed_on_whole(self):
+        """Test that only complete markdown blocks are shown until the end."""
+        received = []
+        stream = ResponseStream(
+            lambda text, new: received.append(text), frame=0, markdown_blocks=True
+        )
+
+        stream.handle_event(_text("# Title\n\nSome "))
+        stream.handle_event(_delta("text\n\n```\ncode\n\n"))
+        stream.handle_event(_delta("more\n```\n\nend"))
+        stream.flush(force=True)
+
+        assert received == [
+            "# Title\n\n",
+            "Some text\n\n",
+            "```\ncode\n\nmore\n```\n\n",
+            "end",
+        ]
+
+    def test_whitespace_does_not_open_a_block(self):
+        """Test that whitespace-only text doesn't create an empty block."""
+        received = []
+        stream = ResponseStream(lambda text, new: received.append(text), frame=0)
+
+        stream.handle_event(_text("\n"))
+        stream.handle_event(_tool_call("read_file"))
+
+        assert received == []
+
+
+def test_complete_markdown_blocks_ignores_blank_lines_in_code():
+    assert complete_markdown_blocks("a\n\nb") == 3
+    assert complete_markdown_blocks("```\nx\n\ny") == 0
+    assert complete_markdown_blocks("no blocks yet") == 0
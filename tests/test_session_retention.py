@@ -0,0 +1,178 @@
+"""Tests for session retention budgets."""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from pydantic_ai.messages import ModelRequest, ToolReturnPart, UserPromptPart
+
+from ticca.blob_store import get_blob_store
+from ticca.hybrid_storage import create_storage
+from ticca.session_retention import (
+    HybridSessionStore,
+    RetentionPolicy,
+    SessionUsage,
+    SubagentSessionStore,
+    default_retention_setup,
+    enforce_retention,
+    select_evictions,
+)
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def _usage(store, name, days_ago, size=100):
+    return SessionUsage(store, name, NOW - timedelta(days=days_ago), size)
+
+
+def _ids(entries):
+    return [entry.session_id for entry in entries]
+
+
+class TestSelectEvictions:
+    def test_count_budget_is_per_store(self):
+        usage = [
+            _usage("autosave", "a1", 1),
+            _usage("autosave", "a2", 2),
+            _usage("autosave", "a3", 3),
+            _usage("context", "c1", 4),
+        ]
+        policy = RetentionPolicy(max_sessions={"autosave": 2})
+
+        assert _ids(select_evictions(usage, policy, NOW)) == ["a3"]
+
+    def test_age_budget(self):
+        usage = [_usage("autosave", "new", 1), _usage("context", "old", 40)]
+        policy = RetentionPolicy(max_age=timedelta(days=30))
+
+        assert _ids(select_evictions(usage, policy, NOW)) == ["old"]
+
+    def test_size_budget_evicts_least_recently_updated_first(self):
+        usage = [
+            _usage("autosave", "a1", 1),
+            _usage("context", "c1", 2),
+            _usage("subagent", "s1", 3),
+            _usage("autosave", "a2", 4),
+        ]
+        policy = RetentionPolicy(max_bytes=250)
+
+        assert _ids(select_evictions(usage, policy, NOW)) == ["a2", "s1"]
+
+    def test_exempt_stores_are_left_out_of_age_and_size_budgets(self):
+        usage = [
+            _usage("context", "big", 1, size=10_000),
+            _usage("autosave", "a1", 2),
+            _usage("context", "old", 400),
+            _usage("autosave", "a2", 3),
+        ]
+        policy = RetentionPolicy(
+            max_bytes=150,
+            max_age=timedelta(days=30),
+            exempt_stores=frozenset({"context"}),
+        )
+
+        assert _ids(select_evictions(usage, policy, NOW)) == ["a2"]
+
+    def test_saved_contexts_are_exempt_unless_configured(self):
+        with patch(
+            "ticca.config.get_session_retention_include_contexts", return_value=False
+        ):
+            _, policy, _, _ = default_retention_setup()
+        assert policy.exempt_stores == frozenset({"context"})
+
+        with patch(
+            "ticca.config.get_session_retention_include_contexts", return_value=True
+        ):
+            _, policy, _, _ = default_retention_setup()
+        assert policy.exempt_stores == frozenset()
+
+    def test_protected_and_recent_sessions_are_kept(self):
+        usage = [
+            _usage("autosave", "current", 10),
+            SessionUsage("autosave", "busy", NOW - timedelta(minutes=1), 100),
+            _usage("autosave", "old", 5),
+        ]
+        policy = RetentionPolicy(max_sessions={"autosave": 1}, max_bytes=1)
+
+        evicted = select_evictions(
+            usage, policy, NOW, protected=frozenset({("autosave", "current")})
+        )
+
+        assert _ids(evicted) == ["old"]
+
+
+def _age(storage, session_id, days):
+    with storage._transaction() as conn:
+        conn.execute(
+            "UPDATE sessions SET updated_at = ? WHERE session_id = ?",
+            (datetime.now(timezone.utc) - timedelta(days=days), session_id),
+        )
+
+
+class TestEnforceRetention:
+    def test_evicts_across_stores_and_reports_reclaimed_space(self, tmp_path: Path):
+        autosaves = create_storage(tmp_path / "autosaves")
+        for name, days in (("keep", 1), ("drop", 2)):
+            autosaves.save_session(
+                name, [ModelRequest(parts=[UserPromptPart(content=name)])]
+            )
+            _age(autosaves, name, days)
+
+        subagent_dir = tmp_path / "subagent_sessions"
+        subagent_dir.mkdir()
+        old = time.time() - 86400 * 60
+        for suffix in (".jsonl", ".txt"):
+            path = subagent_dir / f"stale{suffix}"
+            path.write_text("x" * 10)
+            os.utime(path, (old, old))
+
+        report = enforce_retention(
+            [
+                HybridSessionStore("autosave", tmp_path / "autosaves"),
+                SubagentSessionStore("subagent", subagent_dir),
+            ],
+            RetentionPolicy(max_sessions={"autosave": 1}, max_age=timedelta(days=30)),
+        )
+
+        assert report.evicted == {"autosave": ["drop"], "subagent": ["stale"]}
+        assert report.bytes_reclaimed >= 20
+        assert [m.session_id for m in autosaves.list_sessions()] == ["keep"]
+        assert list(subagent_dir.glob("stale.*")) == []
+
+    def test_removes_blobs_of_evicted_sessions_only(self, tmp_path: Path):
+        storage = create_storage(tmp_path / "autosaves")
+
+        def with_output(text):
+            return [
+                ModelRequest(
+                    parts=[
+                        ToolReturnPart(
+                            tool_name="read_file",
+                            content=text * 5000,
+                            tool_call_id="c1",
+                        )
+                    ]
+                )
+            ]
+
+        kept = with_output("k")
+        storage.save_session("keep", kept)
+        storage.save_session("drop", with_output("d"))
+        _age(storage, "keep", 1)
+        _age(storage, "drop", 2)
+        blobs = get_blob_store(tmp_path / "blobs")
+        old = time.time() - 86400
+        for path in blobs.root.glob("*/*.z"):
+            os.utime(path, (old, old))
+
+        report = enforce_retention(
+            [HybridSessionStore("autosave", tmp_path / "autosaves")],
+            RetentionPolicy(max_sessions={"autosave": 1}),
+            blob_root=tmp_path / "blobs",
+        )
+
+        assert report.blobs_removed == 1
+        assert len(list(blobs.root.glob("*/*.z"))) == 1
+        assert storage.load_messages("keep") == kept
@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Callable, List
 
 import pytest
 
 from ticca.session_storage import (
+    AutosaveWriter,
     cleanup_sessions,
+    count_sessions,
+    list_recent_sessions,
     list_sessions,
     load_session,
     save_session,
+    search_sessions,
 )
 
 
@@ -81,3 +86,81 @@ def test_cleanup_sessions(tmp_path: Path, history: List[str], token_estimator):
     assert removed == ["session_earliest"]
     remaining = list_sessions(tmp_path)
     assert sorted(remaining) == sorted(["session_middle", "session_latest"])
+
+
+def test_autosave_writer_coalesces_saves_of_the_same_session():
+    writer = AutosaveWriter()
+    started = threading.Event()
+    release = threading.Event()
+    written = []
+
+    def first_write():
+        started.set()
+        release.wait(5)
+        written.append("first")
+
+    writer.submit("session", first_write)
+    assert started.wait(5)
+    # Queued while the first save is still running; only the latest survives
+    for name in ("second", "third", "fourth"):
+        writer.submit("session", lambda name=name: written.append(name))
+    writer.submit("other", lambda: written.append("other"))
+    release.set()
+
+    assert writer.flush(timeout=5)
+    assert written == ["first", "fourth", "other"]
+
+
+def test_autosave_writer_survives_failed_saves():
+    writer = AutosaveWriter()
+    written = []
+
+    def broken_write():
+        raise OSError("disk full")
+
+    writer.submit("session", broken_write)
+    assert writer.flush(timeout=5)
+    writer.submit("session", lambda: written.append("ok"))
+    assert writer.flush(timeout=5)
+
+    assert written == ["ok"]
+
+
+def test_search_sessions(tmp_path: Path, token_estimator):
+    from pydantic_ai.messages import ModelRequest, UserPromptPart
+
+    history = [ModelRequest(parts=[UserPromptPart(content="fix the OAuth refresh")])]
+    save_session(
+        history=history,
+        session_name="auth",
+        base_dir=tmp_path,
+        timestamp="2024-01-01T00:00:00",
+        token_estimator=token_estimator,
+    )
+
+    results = search_sessions(tmp_path, "oauth", highlight=("<", ">"))
+
+    assert [r["session_id"] for r in results] == ["auth"]
+    assert "<OAuth>" in results[0]["snippet"]
+    assert search_sessions(tmp_path / "missing", "oauth") == []
+    assert search_sessions(tmp_path, "oauth", exclude_session="auth") == []
+
+
+def test_list_recent_sessions_migrates_legacy_pickles(tmp_path: Path):
+    import pickle
+
+    with (tmp_path / "legacy.pkl").open("wb") as f:
+        pickle.dump([], f)
+    save_session(
+        history=["one"],
+        session_name="current",
+        base_dir=tmp_path,
+        timestamp="2024-01-01T00:00:00",
+        token_estimator=lambda message: 1,
+    )
+
+    assert count_sessions(tmp_path) == 2
+    names = [m.session_id for m in list_recent_sessions(tmp_path, limit=1)]
+    names += [m.session_id for m in list_recent_sessions(tmp_path, offset=1, limit=1)]
+    assert sorted(names) == ["current", "legacy"]
+    assert not (tmp_path / "legacy.pkl").exists()
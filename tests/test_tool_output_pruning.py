@@ -0,0 +1,137 @@
+"""Tests for the tool-output pruning compaction strategy."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from ticca.agents.agent_code_agent import CodeAgent
+from ticca.agents.base_agent import ELIDED_TOOL_OUTPUT_MARKER
+
+
+def _tool_turn(call_id: str, output: str):
+    return [
+        ModelResponse(
+            parts=[
+                TextPart(content=f"reading {call_id}"),
+                ToolCallPart(
+                    tool_name="read_file",
+                    args={"file_path": f"{call_id}.py"},
+                    tool_call_id=call_id,
+                ),
+            ]
+        ),
+        ModelRequest(
+            parts=[
+                ToolReturnPart(
+                    tool_name="read_file", content=output, tool_call_id=call_id
+                )
+            ]
+        ),
+    ]
+
+
+def _big_output(name: str, lines: int = 200) -> str:
+    return "\n".join(f"{name} line {i} " + "x" * 40 for i in range(lines))
+
+
+@pytest.fixture
+def agent():
+    with patch("ticca.agents.base_agent.emit_info"):
+        yield CodeAgent()
+
+
+@pytest.fixture
+def history():
+    return (
+        [ModelRequest(parts=[SystemPromptPart(content="system prompt")])]
+        + [ModelRequest(parts=[UserPromptPart(content="look at the code")])]
+        + _tool_turn("old", _big_output("old"))
+        + _tool_turn("small", "ok")
+        + _tool_turn("recent", _big_output("recent", lines=5))
+    )
+
+
+class TestPruneToolOutputs:
+    def test_replaces_old_tool_output_with_stub(self, agent, history):
+        pruned, replaced = agent.prune_tool_outputs(history, protected_tokens=200)
+
+        stub = pruned[3].parts[0]
+        assert stub.content.startswith(ELIDED_TOOL_OUTPUT_MARKER)
+        assert stub.tool_call_id == "old"
+        assert '"file_path":"old.py"' in stub.content
+        assert "first: old line 0" in stub.content
+        assert "last: old line 199" in stub.content
+        assert "sha256:" in stub.content
+        assert replaced == [history[3]]
+
+    def test_keeps_text_small_outputs_and_protected_tail(self, agent, history):
+        pruned, _ = agent.prune_tool_outputs(history, protected_tokens=200)
+
+        assert pruned[1] is history[1]
+        assert pruned[2] is history[2]  # text and tool call untouched
+        assert pruned[5] is history[5]  # too small to be worth a stub
+        assert pruned[-1] is history[-1]  # protected tail
+
+    def test_stops_once_target_is_reached(self, agent, history):
+        history = history[:-2] + _tool_turn("newer", _big_output("newer"))
+        history += [ModelRequest(parts=[UserPromptPart(content="thanks")])]
+        total = sum(agent.estimate_tokens_for_message(m) for m in history)
+
+        pruned, replaced = agent.prune_tool_outputs(
+            history, protected_tokens=10, target_tokens=total - 100
+        )
+
+        assert len(replaced) == 1
+        pruned_again, replaced_again = agent.prune_tool_outputs(
+            pruned, protected_tokens=10
+        )
+        assert len(replaced_again) == 1  # existing stubs aren't elided twice
+
+    def test_processor_uses_tool_pruning_strategy(self, agent, history):
+        total = sum(agent.estimate_tokens_for_message(m) for m in history)
+
+        with (
+            patch(
+                "ticca.agents.base_agent.get_compaction_strategy",
+                return_value="tool_pruning",
+            ),
+            patch(
+                "ticca.agents.base_agent.get_compaction_threshold", return_value=0.85
+            ),
+            patch(
+                "ticca.agents.base_agent.get_compaction_soft_threshold",
+                return_value=0.75,
+            ),
+            patch(
+                "ticca.agents.base_agent.get_protected_token_count", return_value=200
+            ),
+            patch.object(agent, "get_model_context_length", return_value=total),
+            patch.object(agent, "summarize_messages") as mock_summarize,
+            patch("ticca.tui_state.is_tui_mode", return_value=False),
+        ):
+            result = agent.message_history_processor(MagicMock(), history)
+
+        mock_summarize.assert_not_called()
+        assert len(result) == len(history)
+        assert result[3].parts[0].content.startswith(ELIDED_TOOL_OUTPUT_MARKER)
+        assert agent.hash_message(history[3]) in agent.get_compacted_message_hashes()
+
+
+class TestTokenCountCache:
+    def test_estimate_is_computed_once_per_message(self, agent, history):
+        with patch.object(
+            agent, "_estimate_tokens_uncached", return_value=7
+        ) as mock_estimate:
+            assert agent.estimate_tokens_for_message(history[3]) == 7
+            assert agent.estimate_tokens_for_message(history[3]) == 7
+
+        mock_estimate.assert_called_once()
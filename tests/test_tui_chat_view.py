@@ -0,0 +1,156 @@
+"""Tests for the ChatView transcript window and history cap."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from textual.app import App, ComposeResult
+from textual.widgets.markdown import MarkdownBlock
+
+from ticca.tui.components.chat_view import ChatView
+from ticca.tui.components.chunked_message import ChunkedMessage
+from ticca.tui.models import ChatMessage, MessageType
+
+
+class ChatApp(App):
+    def compose(self) -> ComposeResult:
+        yield ChatView(id="chat-view")
+
+
+def _message(index, group_id=None):
+    # Alternate categories so every message gets its own box
+    message_type = MessageType.USER if index % 2 else MessageType.INFO
+    return ChatMessage(
+        id=f"msg-{index}",
+        type=message_type,
+        content=f"message {index}",
+        timestamp=datetime.now(timezone.utc),
+        group_id=group_id,
+    )
+
+
+@pytest.fixture(autouse=True)
+def small_window():
+    with (
+        patch.object(ChatView, "MAX_MOUNTED_ENTRIES", 6),
+        patch.object(ChatView, "PAGE_SIZE", 3),
+        patch("ticca.config.get_suppress_thinking_messages", return_value=False),
+        patch("ticca.config.get_suppress_informational_messages", return_value=False),
+        patch("ticca.config.get_tui_transcript_max_messages", return_value=0),
+    ):
+        yield
+
+
+def _mounted_text(chat_view):
+    return [widget.plain for widget in chat_view.query(ChunkedMessage)]
+
+
+async def test_only_the_window_of_entries_is_mounted():
+    app = ChatApp()
+    async with app.run_test() as pilot:
+        chat_view = app.query_one(ChatView)
+        for i in range(20):
+            chat_view.add_message(_message(i))
+        await pilot.pause()
+
+        assert _mounted_text(chat_view) == [f"message {i}" for i in range(14, 20)]
+        assert len(chat_view.messages) == 20
+        assert chat_view._entries[0].widget is None
+
+
+async def test_scrolling_to_the_top_mounts_earlier_entries():
+    app = ChatApp()
+    async with app.run_test(size=(80, 10)) as pilot:
+        chat_view = app.query_one(ChatView)
+        for i in range(20):
+            chat_view.add_message(_message(i))
+        await pilot.pause()
+
+        chat_view.scroll_home(animate=False)
+        await pilot.pause()
+        await pilot.pause()
+
+        mounted = _mounted_text(chat_view)
+        assert "message 11" in mounted
+        assert len(mounted) <= ChatView.MAX_MOUNTED_ENTRIES
+
+
+async def test_group_appends_reach_unmounted_entries():
+    app = ChatApp()
+    async with app.run_test() as pilot:
+        chat_view = app.query_one(ChatView)
+        chat_view.add_message(_message(0, group_id="grep_1"))
+        for i in range(1, 20):
+            chat_view.add_message(_message(i))
+        await pilot.pause()
+
+        late = _message(20, group_id="grep_1")
+        late.type = MessageType.INFO
+        chat_view.add_message(late)
+        await pilot.pause()
+
+        entry = chat_view.group_widgets["grep_1"]
+        assert entry.widget is None
+        assert entry.message_count == 2
+        assert chat_view._create_widget(entry).plain == "message 0\nmessage 20"
+
+
+async def test_history_cap_drops_oldest_entries():
+    app = ChatApp()
+    with patch("ticca.config.get_tui_transcript_max_messages", return_value=10):
+        async with app.run_test() as pilot:
+            chat_view = app.query_one(ChatView)
+            chat_view.add_message(_message(0, group_id="grep_1"))
+            for i in range(1, 30):
+                chat_view.add_message(_message(i))
+            await pilot.pause()
+
+            assert len(chat_view.messages) <= 10 + ChatView.PAGE_SIZE
+            assert len(chat_view._entries) == len(chat_view.messages)
+            assert chat_view.messages[-1].content == "message 29"
+            assert "grep_1" not in chat_view.group_widgets
+            assert chat_view._trimmed_count == 30 - len(chat_view.messages)
+
+
+async def test_streamed_text_continues_the_response():
+    app = ChatApp()
+    async with app.run_test() as pilot:
+        chat_view = app.query_one(ChatView)
+        response = _message(0, group_id="agent_stream_1")
+        response.type = MessageType.AGENT_RESPONSE
+        response.content = "Hel"
+        chat_view.add_message(response)
+        await pilot.pause()
+
+        assert chat_view.append_stream_text("agent_stream_1", "lo **wor")
+        assert chat_view.append_stream_text("agent_stream_1", "ld**")
+        assert not chat_view.append_stream_text("unknown", "text")
+        await pilot.pause()
+
+        entry = chat_view.group_widgets["agent_stream_1"]
+        assert entry.widget.document.source == "Hello **world**"
+        assert entry.message_count == 1
+        assert len(chat_view.messages) == 1
+
+
+async def test_streamed_blocks_are_appended_once_and_in_order():
+    app = ChatApp()
+    async with app.run_test() as pilot:
+        chat_view = app.query_one(ChatView)
+        response = _message(0, group_id="agent_stream_1")
+        response.type = MessageType.AGENT_RESPONSE
+        response.content = "part 0"
+        chat_view.add_message(response)
+        await pilot.pause()
+
+        for i in range(1, 6):
+            chat_view.append_stream_text("agent_stream_1", f"\n\npart {i}")
+        for _ in range(5):
+            await pilot.pause()
+
+        document = chat_view.group_widgets["agent_stream_1"].widget.document
+        paragraphs = [
+            block._content.plain.strip()
+            for block in document.query_children(MarkdownBlock)
+        ]
+        assert paragraphs == [f"part {i}" for i in range(6)]
@@ -0,0 +1,98 @@
+"""Tests for append-only rendering of grouped and combined chat messages."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from rich.text import Text
+from textual.app import App, ComposeResult
+
+from ticca.tui.components.chat_view import ChatView
+from ticca.tui.components.chunked_message import ChunkedMessage
+from ticca.tui.models import ChatMessage, MessageType
+
+
+class ChatApp(App):
+    def compose(self) -> ComposeResult:
+        yield ChatView(id="chat-view")
+
+
+def _message(message_type, content, group_id=None, index=0):
+    return ChatMessage(
+        id=f"msg-{index}",
+        type=message_type,
+        content=content,
+        timestamp=datetime.now(timezone.utc),
+        group_id=group_id,
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_suppression():
+    with (
+        patch("ticca.config.get_suppress_thinking_messages", return_value=False),
+        patch("ticca.config.get_suppress_informational_messages", return_value=False),
+    ):
+        yield
+
+
+async def test_group_appends_add_chunks_to_one_widget():
+    app = ChatApp()
+    async with app.run_test() as pilot:
+        chat_view = app.query_one(ChatView)
+        for i in range(3):
+            chat_view.add_message(
+                _message(MessageType.TOOL_OUTPUT, f"line {i}", "grep_1", i)
+            )
+        await pilot.pause()
+
+        widgets = list(chat_view.query(ChunkedMessage))
+        assert len(widgets) == 1
+        assert widgets[0].plain == "line 0\nline 1\nline 2"
+        assert len(chat_view.messages) == 3
+
+
+async def test_append_renders_only_the_new_chunk():
+    app = ChatApp()
+    async with app.run_test() as pilot:
+        chat_view = app.query_one(ChatView)
+        chat_view.add_message(_message(MessageType.TOOL_OUTPUT, "first", "grep_1"))
+        await pilot.pause()
+        widget = chat_view.query_one(ChunkedMessage)
+
+        with patch.object(
+            widget, "_render_chunk", wraps=widget._render_chunk
+        ) as render_chunk:
+            chat_view.add_message(
+                _message(MessageType.TOOL_OUTPUT, "[bold]second[/bold]", "grep_1", 1)
+            )
+            await pilot.pause()
+
+        rendered = [call.args[0] for call in render_chunk.call_args_list]
+        assert [chunk.plain for chunk in rendered] == ["second"]
+        assert widget.plain == "first\nsecond"
+
+
+async def test_category_combining_separates_message_types():
+    app = ChatApp()
+    async with app.run_test() as pilot:
+        chat_view = app.query_one(ChatView)
+        chat_view.add_message(_message(MessageType.INFO, "info"))
+        chat_view.add_message(_message(MessageType.SUCCESS, "done", index=1))
+        await pilot.pause()
+
+        widget = chat_view.query_one(ChunkedMessage)
+        assert widget.plain == "info\n\n── Success ──\ndone"
+
+
+async def test_widget_height_grows_with_chunks():
+    app = ChatApp()
+    async with app.run_test() as pilot:
+        widget = ChunkedMessage(Text("one"))
+        await app.query_one(ChatView).mount(widget)
+        await pilot.pause()
+        assert widget.size.height == 1
+
+        widget.append(Text("two\nthree"))
+        await pilot.pause()
+        assert widget.size.height == 3
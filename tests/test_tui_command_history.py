@@ -0,0 +1,122 @@
+"""Tests for the TUI's incremental command history reader."""
+
+from unittest.mock import patch
+
+import pytest
+
+from ticca import config
+from ticca.tui.models import command_history
+from ticca.tui.models.command_history import HistoryFileReader
+
+
+def _entry(i):
+    return f"\n# 2025-01-01T00:{i // 60:02d}:{i % 60:02d}\ncommand {i}\n"
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    path = tmp_path / "command_history.txt"
+    path.write_text("".join(_entry(i) for i in range(10)))
+    return path
+
+
+def _commands(entries):
+    return [entry["command"] for entry in entries]
+
+
+def test_reads_newest_entries_first(history_file):
+    reader = HistoryFileReader(str(history_file))
+
+    entries = reader.read_history(max_entries=3)
+
+    assert _commands(entries) == ["command 9", "command 8", "command 7"]
+    assert entries[0]["timestamp"] == "2025-01-01T00:00:09"
+
+
+def test_appended_entries_are_read_incrementally(history_file):
+    reader = HistoryFileReader(str(history_file))
+    reader.read_history(max_entries=5)
+
+    with history_file.open("a") as f:
+        f.write(_entry(10) + _entry(11))
+    with patch.object(
+        command_history._HistoryIndex, "_load_tail", side_effect=AssertionError
+    ):
+        entries = reader.read_history(max_entries=3)
+
+    assert _commands(entries) == ["command 11", "command 10", "command 9"]
+
+
+def test_tail_is_read_in_blocks_from_the_end(tmp_path):
+    path = tmp_path / "command_history.txt"
+    path.write_text("".join(_entry(i) for i in range(500)))
+    parsed = []
+    real_parse = command_history._parse_entries
+
+    def tracking_parse(data, base, pos=0):
+        parsed.append(len(data))
+        return real_parse(data, base, pos)
+
+    with (
+        patch.object(command_history, "TAIL_BLOCK_SIZE", 256),
+        patch.object(command_history, "HISTORY_INDEX_SIZE", 5),
+        patch.object(command_history, "_parse_entries", tracking_parse),
+    ):
+        entries = HistoryFileReader(str(path)).read_history(max_entries=5)
+
+    assert _commands(entries) == [f"command {i}" for i in range(499, 494, -1)]
+    assert len(parsed) == 1
+    assert parsed[0] <= 512 < path.stat().st_size
+
+
+def test_asking_for_more_entries_reads_further_back(history_file):
+    reader = HistoryFileReader(str(history_file))
+    with patch.object(command_history, "HISTORY_INDEX_SIZE", 2):
+        reader.read_history(max_entries=2)
+        entries = reader.read_history(max_entries=8)
+
+    assert len(entries) == 8
+
+
+def test_multiline_commands_and_markers_inside_lines(tmp_path):
+    path = tmp_path / "command_history.txt"
+    path.write_text(
+        "\n# 2025-01-01T00:00:00\nfirst line\nsee # 2025-01-01T00:00:01 here\n"
+        "\n# 2025-01-01T00:00:02\n\n"
+    )
+
+    entries = HistoryFileReader(str(path)).read_history()
+
+    assert _commands(entries) == ["first line\nsee # 2025-01-01T00:00:01 here"]
+
+
+def test_missing_file_has_no_history(tmp_path):
+    assert HistoryFileReader(str(tmp_path / "missing.txt")).read_history() == []
+
+
+def test_compaction_keeps_the_newest_whole_entries(history_file):
+    reader = HistoryFileReader(str(history_file))
+    reader.read_history()
+    size = history_file.stat().st_size
+
+    with patch.object(config, "COMMAND_HISTORY_FILE", str(history_file)):
+        assert not config.compact_command_history(max_bytes=size)
+        assert config.compact_command_history(max_bytes=size // 2)
+
+    content = history_file.read_text()
+    assert content.startswith("# 2025-01-01T")
+    assert content.endswith(_entry(9))
+    assert _commands(reader.read_history())[0] == "command 9"
+    assert len(reader.read_history()) < 10
+
+
+def test_startup_compacts_large_history(history_file):
+    with (
+        patch.object(config, "COMMAND_HISTORY_FILE", str(history_file)),
+        patch.object(config, "CONFIG_DIR", str(history_file.parent)),
+        patch("ticca.config.get_command_history_max_bytes", return_value=200),
+    ):
+        config.initialize_command_history_file()
+
+    assert history_file.stat().st_size <= 100
+    assert history_file.read_text().endswith(_entry(9))
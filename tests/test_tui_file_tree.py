@@ -0,0 +1,63 @@
+"""Tests for the file tree backed by the shared directory cache."""
+
+import pytest
+from textual.app import App, ComposeResult
+
+from ticca.directory_cache import DirectoryCache
+from ticca.tui.components.file_tree import CachedDirectoryTree
+
+
+class TreeApp(App):
+    def __init__(self, path, cache):
+        super().__init__()
+        self.path = path
+        self.cache = cache
+
+    def compose(self) -> ComposeResult:
+        yield CachedDirectoryTree(self.path, cache=self.cache)
+
+
+@pytest.fixture
+def cache():
+    cache = DirectoryCache()
+    yield cache
+    cache.stop_watching()
+
+
+def _labels(node):
+    return [str(child.label) for child in node.children]
+
+
+async def _settle(pilot, tree, predicate):
+    for _ in range(50):
+        await pilot.pause(0.1)
+        if predicate(tree):
+            return
+
+
+async def test_ignored_directories_are_left_out(tmp_path, cache):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "README.md").write_text("# readme")
+
+    app = TreeApp(tmp_path, cache)
+    async with app.run_test() as pilot:
+        tree = app.query_one(CachedDirectoryTree)
+        await _settle(pilot, tree, lambda tree: tree.root.children)
+
+        assert _labels(tree.root) == ["src", "README.md"]
+
+
+async def test_created_files_appear_without_a_refresh(tmp_path, cache):
+    pytest.importorskip("watchdog")
+    (tmp_path / "README.md").write_text("# readme")
+
+    app = TreeApp(tmp_path, cache)
+    async with app.run_test() as pilot:
+        tree = app.query_one(CachedDirectoryTree)
+        await _settle(pilot, tree, lambda tree: tree.root.children)
+
+        (tmp_path / "created.txt").write_text("created")
+        await _settle(pilot, tree, lambda tree: len(tree.root.children) == 2)
+
+        assert _labels(tree.root) == ["created.txt", "README.md"]
@@ -0,0 +1,112 @@
+"""Tests for the frame-rate-limited TUI refresh scheduler."""
+
+import asyncio
+import threading
+import time
+
+from ticca.tui.refresh_scheduler import RefreshScheduler, get_refresh_scheduler
+
+
+def _scheduler(fps=50):
+    scheduler = RefreshScheduler(fps=fps)
+    scheduler.start()
+    return scheduler
+
+
+async def _next_frame(scheduler):
+    await asyncio.sleep(scheduler.interval * 2)
+
+
+async def test_updates_within_a_frame_apply_only_the_latest_value():
+    scheduler = _scheduler()
+    applied = []
+
+    for i in range(5):
+        scheduler.update("tokens", i, applied.append)
+    await _next_frame(scheduler)
+
+    assert applied == [4]
+
+
+async def test_unchanged_values_are_not_reapplied():
+    scheduler = _scheduler()
+    applied = []
+
+    scheduler.update("tokens", 1, applied.append)
+    await _next_frame(scheduler)
+    scheduler.update("tokens", 1, applied.append)
+    await _next_frame(scheduler)
+
+    assert applied == [1]
+
+
+async def test_forget_forces_the_next_update():
+    scheduler = _scheduler()
+    applied = []
+
+    scheduler.update("tokens", 1, applied.append)
+    await _next_frame(scheduler)
+    scheduler.forget("tokens")
+    scheduler.update("tokens", 1, applied.append)
+    await _next_frame(scheduler)
+
+    assert applied == [1, 1]
+
+
+async def test_flushes_are_rate_limited():
+    scheduler = _scheduler(fps=10)
+    flush_times = []
+
+    for i in range(3):
+        scheduler.update("tokens", i, lambda _: flush_times.append(time.monotonic()))
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.25)
+
+    assert len(flush_times) == 2
+    assert flush_times[1] - flush_times[0] >= scheduler.interval * 0.9
+
+
+async def test_updates_from_other_threads_are_applied_on_the_loop():
+    scheduler = _scheduler()
+    applied = []
+
+    thread = threading.Thread(
+        target=lambda: scheduler.update(
+            "tokens", 42, lambda value: applied.append((value, threading.get_ident()))
+        )
+    )
+    thread.start()
+    thread.join()
+    await _next_frame(scheduler)
+
+    assert applied == [(42, threading.get_ident())]
+
+
+async def test_failed_update_is_retried():
+    scheduler = _scheduler()
+    applied = []
+
+    def fail(value):
+        raise RuntimeError("widget not mounted")
+
+    scheduler.update("tokens", 1, fail)
+    await _next_frame(scheduler)
+    scheduler.update("tokens", 1, applied.append)
+    await _next_frame(scheduler)
+
+    assert applied == [1]
+
+
+async def test_updates_before_start_are_applied_once_started():
+    scheduler = RefreshScheduler(fps=50)
+    applied = []
+
+    scheduler.update("tokens", 1, applied.append)
+    scheduler.start()
+    await _next_frame(scheduler)
+
+    assert applied == [1]
+
+
+def test_apps_without_a_scheduler_get_none():
+    assert get_refresh_scheduler(object()) is None
@@ -0,0 +1,79 @@
+"""Tests for the sidebar's command history list."""
+
+from textual.app import App, ComposeResult
+
+from ticca.tui.components.sidebar import HistoryCommandLabel, HistoryItem, Sidebar
+from ticca.tui.models.command_history import HistoryFileReader
+
+
+class SidebarApp(App):
+    def compose(self) -> ComposeResult:
+        yield Sidebar()
+
+
+def _write(path, commands):
+    with path.open("a") as f:
+        for i, command in commands:
+            f.write(f"\n# 2025-01-01T10:00:{i:02d}\n{command}\n")
+
+
+def _shown(sidebar):
+    return [
+        item.command_entry["command"]
+        for item in sidebar.query_one("#history-list").children
+        if isinstance(item, HistoryItem)
+    ]
+
+
+async def test_new_commands_are_prepended_to_the_list(tmp_path):
+    history_file = tmp_path / "command_history.txt"
+    _write(history_file, [(0, "first"), (1, "/help"), (2, "second")])
+
+    app = SidebarApp()
+    async with app.run_test() as pilot:
+        sidebar = app.query_one(Sidebar)
+        sidebar.history_reader = HistoryFileReader(str(history_file))
+        sidebar.load_command_history()
+        await pilot.pause()
+        first_items = list(sidebar.query(HistoryItem))
+
+        _write(history_file, [(3, "third")])
+        sidebar.load_command_history()
+        await pilot.pause()
+
+        assert _shown(sidebar) == ["third", "second", "first"]
+        assert list(sidebar.query(HistoryItem))[1:] == first_items
+        assert sidebar.get_current_command_entry()["command"] == "third"
+        # Styled by the sidebar's .history-command rule, as the plain labels were
+        label = first_items[0].query_one(HistoryCommandLabel)
+        assert label.has_class("history-command")
+        assert label.styles.padding.left == 1
+
+
+async def test_list_is_rebuilt_when_the_history_is_replaced(tmp_path):
+    history_file = tmp_path / "command_history.txt"
+    _write(history_file, [(0, "old")])
+
+    app = SidebarApp()
+    async with app.run_test() as pilot:
+        sidebar = app.query_one(Sidebar)
+        sidebar.history_reader = HistoryFileReader(str(history_file))
+        sidebar.load_command_history()
+        await pilot.pause()
+
+        replacement = tmp_path / "replacement.txt"
+        _write(replacement, [(5, "new")])
+        replacement.replace(history_file)
+        sidebar.load_command_history()
+        await pilot.pause()
+
+        assert _shown(sidebar) == ["new"]
+
+
+async def test_history_item_text_is_formatted_literally():
+    label = HistoryCommandLabel(
+        {"timestamp": "2025-01-01T10:00:00", "command": "echo [bold]hi[/bold]"},
+        HistoryFileReader(),
+    )
+
+    assert label.render().plain == "[10:00:00] echo [bold]hi[/bold]"
@@ -0,0 +1,75 @@
+"""Tests for searching past sessions from the agent tool."""
+
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from ticca.tools import session_search
+from ticca.tools.session_search import find_in_past_sessions, register_search_sessions
+
+
+def _match(session_id, score):
+    return {
+        "session_id": session_id,
+        "agent_name": "code-agent",
+        "updated_at": datetime(2025, 1, 1, 12, 0),
+        "role": "user",
+        "snippet": f"about {session_id}",
+        "score": score,
+    }
+
+
+def test_rankings_of_each_store_are_interleaved():
+    results = {
+        Path("autosaves"): [_match("auto-1", -1.0), _match("auto-2", -0.9)],
+        # Scores from another index aren't comparable, however good they look
+        Path("contexts"): [_match("ctx-1", -20.0), _match("ctx-2", -19.0)],
+    }
+
+    with (
+        patch.object(session_search, "AUTOSAVE_DIR", "autosaves"),
+        patch.object(session_search, "CONTEXTS_DIR", "contexts"),
+        patch.object(
+            session_search,
+            "search_sessions",
+            side_effect=lambda base_dir, *args, **kwargs: results[base_dir],
+        ),
+    ):
+        matches = find_in_past_sessions("query", limit=3)
+
+    assert [(m.session_id, m.source) for m in matches] == [
+        ("auto-1", "autosave"),
+        ("ctx-1", "context"),
+        ("auto-2", "autosave"),
+    ]
+
+
+def test_tool_leaves_out_the_current_autosave_session():
+    tools = {}
+    agent = MagicMock()
+    agent.tool = lambda func: tools.setdefault(func.__name__, func)
+    register_search_sessions(agent)
+    searched = {}
+
+    def fake_search(base_dir, query, **kwargs):
+        searched[base_dir] = kwargs["exclude_session"]
+        return []
+
+    with (
+        patch.object(session_search, "AUTOSAVE_DIR", "autosaves"),
+        patch.object(session_search, "CONTEXTS_DIR", "contexts"),
+        patch.object(session_search, "search_sessions", side_effect=fake_search),
+        patch.object(
+            session_search,
+            "get_current_autosave_session_name",
+            return_value="auto_session_now",
+        ),
+        patch.object(session_search, "emit_info") as mock_emit,
+    ):
+        output = tools["search_sessions"](MagicMock(), "[bold]oauth")
+
+    assert output.matches == []
+    assert searched == {Path("autosaves"): "auto_session_now", Path("contexts"): None}
+    # The query is escaped so it can't inject markup
+    assert "\\[bold]oauth" in mock_emit.call_args.args[0]
+    assert mock_emit.call_args.kwargs["message_group"].startswith("search_sessions")
@@ -32,6 +32,7 @@ class CodeAgent(BaseAgent):
             "delete_file",
             "agent_run_shell_command",
             "agent_share_your_reasoning",
+            "search_sessions",
         ]
 
     def get_system_prompt(self) -> str:
@@ -82,6 +83,11 @@ Use `list_agents()` to discover available specialized agents. Delegate to specia
 
 Use `invoke_agent(agent_name, prompt, session_id)` with unique session IDs (e.g., "feature-auth-x7k9") only when the agent needs conversation context.
 
+## Past Sessions
+
+Use `search_sessions(query)` to recall earlier work when the user refers to a
+previous session or past decisions would help.
+
 Return your final response as plain text.
 """
 
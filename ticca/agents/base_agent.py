@@ -1,12 +1,16 @@
 """Base agent configuration class for defining agent properties."""
 
 import asyncio
+import dataclasses
+import hashlib
 import json
 import math
 import signal
 import threading
 import uuid
+import weakref
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, wait
 from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 import mcp
@@ -43,12 +47,15 @@ from ticca.config import (
     get_agent_system_prompt_suffix,
     get_agent_temperature,
     get_agent_top_p,
+    get_compaction_soft_threshold,
     get_compaction_strategy,
     get_compaction_threshold,
     get_global_model_name,
     get_message_limit,
     get_openai_reasoning_effort,
     get_protected_token_count,
+    get_summarization_chunk_tokens,
+    get_summarization_wait_timeout,
     get_use_dbos,
     get_value,
     load_mcp_server_configs,
@@ -64,17 +71,42 @@ from ticca.messaging.spinner import (
     update_spinner_context,
 )
 from ticca.model_factory import ModelFactory
-from ticca.summarization_agent import run_summarization_sync
+from ticca.summarization_agent import (
+    run_in_summarizer_loop,
+    run_summarization,
+    run_summarization_sync,
+)
 from ticca.tools.agent_tools import _active_subagent_tasks
 from ticca.tools.command_runner import (
     is_awaiting_user_input,
 )
 
-# Global flag to track delayed compaction requests
-_delayed_compaction_requested = False
-
 _reload_count = 0
 
+SUMMARIZATION_INSTRUCTIONS = (
+    "The input will be a log of Agentic AI steps that have been taken"
+    " as well as user queries, etc. Summarize the contents of these steps."
+    " The high level details should remain but the bulk of the content from tool-call"
+    " responses should be compacted and summarized. For example if you see a tool-call"
+    " reading a file, and the file contents are large, then in your summary you might just"
+    " write: * used read_file on space_invaders.cpp - contents removed."
+    "\n Make sure your result is a bulleted list of all steps and interactions."
+    "\n\nNOTE: This summary represents older conversation history. Recent messages are preserved separately."
+)
+
+SUMMARY_MERGE_INSTRUCTIONS = (
+    "The input is a sequence of summaries of consecutive parts of an earlier"
+    " conversation, oldest first. Merge them into a single bulleted summary that"
+    " keeps the high level steps, decisions and important technical details in order."
+    "\n\nNOTE: This summary represents older conversation history. Recent messages are preserved separately."
+)
+
+# Upper bound on cached chunk summaries kept per agent
+MAX_CACHED_CHUNK_SUMMARIES = 256
+
+# Marker at the start of a tool return that was replaced by a stub
+ELIDED_TOOL_OUTPUT_MARKER = "[tool output elided]"
+
 
 class BaseAgent(ABC):
     """Base class for all agent configurations."""
@@ -83,6 +115,15 @@ class BaseAgent(ABC):
         self.id = str(uuid.uuid4())
         self._message_history: List[Any] = []
         self._compacted_message_hashes: Set[str] = set()
+        # In-flight background summarization and the hashes of the messages it covers
+        self._background_compaction: Optional[Future] = None
+        self._background_compaction_source: List[int] = []
+        # Chunk summaries keyed by the hash of all the chunk's message hashes,
+        # and hashes of summary messages so they aren't summarized again
+        self._chunk_summary_cache: Dict[int, List[ModelMessage]] = {}
+        self._summary_message_hashes: Set[int] = set()
+        # Token estimates keyed by message id; entries drop when the message dies
+        self._token_count_cache: Dict[int, Tuple[weakref.ref, int]] = {}
         # Agent construction cache
         self._code_generation_agent = None
         self._last_model_name: Optional[str] = None
@@ -159,6 +200,9 @@ class BaseAgent(ABC):
         """Clear the message history for this agent."""
         self._message_history = []
         self._compacted_message_hashes.clear()
+        self.cancel_background_compaction()
+        self._chunk_summary_cache.clear()
+        self._summary_message_hashes.clear()
 
     def append_to_message_history(self, message: Any) -> None:
         """Append a message to this agent's history.
@@ -335,7 +379,26 @@ class BaseAgent(ABC):
         """
         Estimate the number of tokens in a message using len(message)
         Simple and fast replacement for tiktoken.
+
+        Messages aren't modified once they are in the history, so estimates are
+        cached per message object for as long as that object is alive.
         """
+        key = id(message)
+        cached = self._token_count_cache.get(key)
+        if cached is not None and cached[0]() is message:
+            return cached[1]
+
+        tokens = self._estimate_tokens_uncached(message)
+        try:
+            ref = weakref.ref(
+                message, lambda _, k=key: self._token_count_cache.pop(k, None)
+            )
+        except TypeError:
+            return tokens
+        self._token_count_cache[key] = (ref, tokens)
+        return tokens
+
+    def _estimate_tokens_uncached(self, message: ModelMessage) -> int:
         total_tokens = 0
 
         for part in message.parts:
@@ -448,6 +511,10 @@ class BaseAgent(ABC):
         """
         Summarize messages while protecting recent messages up to PROTECTED_TOKENS.
 
+        This blocks the calling thread until the summary is ready, for at most
+        `summarization_wait_timeout` seconds; on timeout the original messages
+        are returned unchanged.
+
         Returns:
             Tuple of (compacted_messages, summarized_source_messages)
             where compacted_messages always preserves the original system message
@@ -473,27 +540,11 @@ class BaseAgent(ABC):
             # Nothing to summarize, so just return the original sequence
             return self.prune_interrupted_tool_calls(messages), []
 
-        instructions = (
-            "The input will be a log of Agentic AI steps that have been taken"
-            " as well as user queries, etc. Summarize the contents of these steps."
-            " The high level details should remain but the bulk of the content from tool-call"
-            " responses should be compacted and summarized. For example if you see a tool-call"
-            " reading a file, and the file contents are large, then in your summary you might just"
-            " write: * used read_file on space_invaders.cpp - contents removed."
-            "\n Make sure your result is a bulleted list of all steps and interactions."
-            "\n\nNOTE: This summary represents older conversation history. Recent messages are preserved separately."
+        future = run_in_summarizer_loop(
+            self.summarize_incrementally(messages_to_summarize)
         )
-
         try:
-            new_messages = run_summarization_sync(
-                instructions, message_history=messages_to_summarize
-            )
-
-            if not isinstance(new_messages, list):
-                emit_warning(
-                    "Summarization agent returned non-list output; wrapping into message request"
-                )
-                new_messages = [ModelRequest([TextPart(str(new_messages))])]
+            new_messages = future.result(timeout=get_summarization_wait_timeout())
 
             compacted: List[ModelMessage] = [system_message] + list(new_messages)
 
@@ -505,10 +556,240 @@ class BaseAgent(ABC):
             compacted.extend(protected_tail)
 
             return self.prune_interrupted_tool_calls(compacted), messages_to_summarize
+        except TimeoutError:
+            future.cancel()
+            emit_error("Summarization timed out during compaction")
+            return messages, []
         except Exception as e:
             emit_error(f"Summarization failed during compaction: {e}")
             return messages, []  # Return original messages on failure
 
+    def chunk_messages_for_summarization(
+        self, messages: List[ModelMessage]
+    ) -> List[List[ModelMessage]]:
+        """
+        Split messages into consecutive chunks of roughly `summarization_chunk_tokens`.
+
+        Chunks only end where every tool call in them has its return, so a call
+        and its result are always summarized together. Boundaries depend only on
+        the messages themselves, which keeps chunk cache keys stable.
+        """
+        budget = get_summarization_chunk_tokens()
+        chunks: List[List[ModelMessage]] = []
+        current: List[ModelMessage] = []
+        current_tokens = 0
+        open_calls: Set[str] = set()
+
+        for message in messages:
+            current.append(message)
+            current_tokens += self.estimate_tokens_for_message(message)
+            for part in getattr(message, "parts", []) or []:
+                tool_call_id = getattr(part, "tool_call_id", None)
+                if not tool_call_id:
+                    continue
+                if self._is_tool_call_part(part):
+                    open_calls.add(tool_call_id)
+                elif self._is_tool_return_part(part):
+                    open_calls.discard(tool_call_id)
+
+            if current_tokens >= budget and not open_calls:
+                chunks.append(current)
+                current = []
+                current_tokens = 0
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _summarize_chunk(
+        self, chunk: List[ModelMessage], instructions: str
+    ) -> List[ModelMessage]:
+        """Summarize one chunk, reusing the cached summary of an identical range."""
+        key = hash(tuple(self.hash_message(m) for m in chunk))
+        cached = self._chunk_summary_cache.get(key)
+        if cached is not None:
+            return cached
+
+        summary = await run_summarization(instructions, message_history=chunk)
+        if not isinstance(summary, list):
+            emit_warning(
+                "Summarization agent returned non-list output; wrapping into message request"
+            )
+            summary = [ModelRequest([TextPart(str(summary))])]
+
+        if len(self._chunk_summary_cache) >= MAX_CACHED_CHUNK_SUMMARIES:
+            self._chunk_summary_cache.pop(next(iter(self._chunk_summary_cache)))
+        self._chunk_summary_cache[key] = summary
+        self._summary_message_hashes.update(self.hash_message(m) for m in summary)
+        return summary
+
+    async def summarize_incrementally(
+        self, messages: List[ModelMessage]
+    ) -> List[ModelMessage]:
+        """
+        Summarize messages chunk by chunk, merging the summaries hierarchically.
+
+        Summaries produced by earlier compactions at the head of `messages` are
+        kept as they are, and each chunk of new messages is summarized once (in
+        parallel). When the summaries together exceed one chunk budget they are
+        merged level by level, so the cost of a compaction is bounded by the new
+        messages rather than the length of the whole session.
+
+        Returns:
+            The summary messages replacing `messages`
+        """
+        prior_count = 0
+        for message in messages:
+            if self.hash_message(message) not in self._summary_message_hashes:
+                break
+            prior_count += 1
+
+        # Work on whole summaries ("units") so a merge never splits one apart
+        units: List[List[ModelMessage]] = []
+        if prior_count:
+            units.append(list(messages[:prior_count]))
+        chunks = self.chunk_messages_for_summarization(messages[prior_count:])
+        units.extend(
+            await asyncio.gather(
+                *(self._summarize_chunk(c, SUMMARIZATION_INSTRUCTIONS) for c in chunks)
+            )
+        )
+
+        budget = get_summarization_chunk_tokens()
+        unit_tokens = [
+            sum(self.estimate_tokens_for_message(m) for m in unit) for unit in units
+        ]
+        while len(units) > 1 and sum(unit_tokens) > budget:
+            groups: List[List[List[ModelMessage]]] = [[]]
+            group_tokens = 0
+            for unit, tokens in zip(units, unit_tokens):
+                if groups[-1] and group_tokens + tokens > budget:
+                    groups.append([])
+                    group_tokens = 0
+                groups[-1].append(unit)
+                group_tokens += tokens
+            if len(groups) == len(units):
+                # Every summary fills a chunk on its own; merge them all at once
+                groups = [units]
+
+            units = await asyncio.gather(
+                *(
+                    self._summarize_chunk(
+                        [m for unit in group for m in unit], SUMMARY_MERGE_INSTRUCTIONS
+                    )
+                    if len(group) > 1
+                    else asyncio.sleep(0, result=group[0])
+                    for group in groups
+                )
+            )
+            unit_tokens = [
+                sum(self.estimate_tokens_for_message(m) for m in unit)
+                for unit in units
+            ]
+
+        return [m for unit in units for m in unit]
+
+    def _tool_output_stub(
+        self, part: ToolReturnPart, call: Optional[ToolCallPart]
+    ) -> str:
+        """Describe an elided tool return: tool, args, size, hash, first/last lines."""
+        content = self.stringify_message_part(part)
+        digest = hashlib.sha256(content.encode("utf-8", "replace")).hexdigest()[:12]
+        args = call.args_as_json_str() if call is not None else ""
+        if len(args) > 200:
+            args = args[:200] + "..."
+        lines = content.strip().splitlines() or [""]
+
+        stub = [
+            f"{ELIDED_TOOL_OUTPUT_MARKER} {part.tool_name}({args}) -> "
+            f"{len(content)} chars, {len(lines)} lines, sha256:{digest}",
+            f"first: {lines[0][:200]}",
+        ]
+        if len(lines) > 1:
+            stub.append(f"last: {lines[-1][:200]}")
+        return "\n".join(stub)
+
+    def prune_tool_outputs(
+        self,
+        messages: List[ModelMessage],
+        protected_tokens: int,
+        target_tokens: int = 0,
+    ) -> Tuple[List[ModelMessage], List[ModelMessage]]:
+        """
+        Replace old tool returns with short stubs, without calling a model.
+
+        Tool returns in the protected tail and the system message are left alone,
+        as is all conversational text. The returns with the largest savings are
+        elided first, and only until the history fits in `target_tokens`.
+
+        Returns:
+            Tuple of (pruned_messages, original_messages_that_were_replaced)
+        """
+        if len(messages) <= 1:
+            return messages, []
+
+        # Protected tail, counted from the end like truncation
+        protected_start = len(messages)
+        tail_tokens = 0
+        for i in range(len(messages) - 1, 0, -1):
+            tail_tokens += self.estimate_tokens_for_message(messages[i])
+            if tail_tokens > protected_tokens:
+                break
+            protected_start = i
+
+        calls: Dict[str, ToolCallPart] = {}
+        for message in messages:
+            for part in getattr(message, "parts", []) or []:
+                if isinstance(part, ToolCallPart):
+                    calls[part.tool_call_id] = part
+
+        # (savings, message index, part index, stub)
+        candidates: List[Tuple[int, int, int, str]] = []
+        for msg_idx in range(1, protected_start):
+            for part_idx, part in enumerate(messages[msg_idx].parts):
+                if not isinstance(part, ToolReturnPart):
+                    continue
+                if isinstance(part.content, str) and part.content.startswith(
+                    ELIDED_TOOL_OUTPUT_MARKER
+                ):
+                    continue
+                stub = self._tool_output_stub(part, calls.get(part.tool_call_id))
+                savings = self.estimate_token_count(
+                    self.stringify_message_part(part)
+                ) - self.estimate_token_count(stub)
+                if savings > 0:
+                    candidates.append((savings, msg_idx, part_idx, stub))
+
+        total_tokens = sum(self.estimate_tokens_for_message(m) for m in messages)
+        stubs: Dict[int, Dict[int, str]] = {}
+        for savings, msg_idx, part_idx, stub in sorted(candidates, reverse=True):
+            if total_tokens <= target_tokens:
+                break
+            stubs.setdefault(msg_idx, {})[part_idx] = stub
+            total_tokens -= savings
+
+        if not stubs:
+            return messages, []
+
+        pruned = list(messages)
+        replaced: List[ModelMessage] = []
+        for msg_idx, part_stubs in stubs.items():
+            original = messages[msg_idx]
+            parts = [
+                dataclasses.replace(part, content=part_stubs[i])
+                if i in part_stubs
+                else part
+                for i, part in enumerate(original.parts)
+            ]
+            pruned[msg_idx] = dataclasses.replace(original, parts=parts)
+            replaced.append(original)
+
+        emit_info(
+            f"✂️ Elided {sum(len(p) for p in stubs.values())} old tool outputs",
+            message_group="token_context_status",
+        )
+        return pruned, replaced
+
     def get_model_context_length(self) -> int:
         """
         Return the context length for this agent's effective model.
@@ -527,6 +808,15 @@ class BaseAgent(ABC):
             # Be safe; don't blow up status/compaction if model lookup fails
             return 128000
 
+    def get_history_token_budget(self) -> int:
+        """
+        Return how many tokens of saved history are worth restoring.
+
+        That's what fits in the context window before compaction would kick in;
+        anything older would be compacted away on the next request anyway.
+        """
+        return int(self.get_model_context_length() * get_compaction_threshold())
+
     def has_pending_tool_calls(self, messages: List[ModelMessage]) -> bool:
         """
         Check if there are any pending tool calls in the message history.
@@ -559,38 +849,122 @@ class BaseAgent(ABC):
         pending_calls = tool_call_ids - tool_return_ids
         return len(pending_calls) > 0
 
-    def request_delayed_compaction(self) -> None:
+    def start_background_compaction(self, messages: List[ModelMessage]) -> bool:
         """
-        Request that compaction be attempted after the current tool calls complete.
+        Start summarizing the older part of the history in the background.
 
-        This sets a global flag that will be checked during the next message
-        processing cycle to trigger compaction when it's safe to do so.
+        The protected tail is left alone; only the messages that would be
+        summarized right now are snapshotted and sent to the summarization agent.
+        The result is swapped in later by `apply_background_compaction`.
+
+        Returns:
+            True if a background summarization is (now) in flight
         """
-        global _delayed_compaction_requested
-        _delayed_compaction_requested = True
+        if self._background_compaction is not None:
+            return True
+
+        messages_to_summarize, _ = self.split_messages_for_protected_summarization(
+            self.filter_huge_messages(messages)
+        )
+        if not messages_to_summarize:
+            return False
+
+        # The summary replaces the history up to the last summarized message.
+        # Huge and interrupted messages in that range are dropped, just as a
+        # synchronous compaction drops them.
+        last = messages_to_summarize[-1]
+        end = next(i for i, m in enumerate(messages) if m is last) + 1
+        self._background_compaction_source = [
+            self.hash_message(m) for m in messages[1:end]
+        ]
+        self._background_compaction = run_in_summarizer_loop(
+            self.summarize_incrementally(messages_to_summarize)
+        )
         emit_info(
-            "🔄 Delayed compaction requested - will attempt after tool calls complete",
+            f"🔄 Summarizing {len(messages_to_summarize)} older messages in the background",
             message_group="token_context_status",
         )
+        return True
 
-    def should_attempt_delayed_compaction(self) -> bool:
+    def apply_background_compaction(
+        self, messages: List[ModelMessage]
+    ) -> Optional[List[ModelMessage]]:
         """
-        Check if delayed compaction was requested and it's now safe to proceed.
+        Swap a finished background summary into the history, if it's safe to.
+
+        The swap only happens at a safe boundary (no pending tool calls) and only
+        if the summarized messages are still the head of the history; otherwise
+        the result is left for later or discarded.
 
         Returns:
-            True if delayed compaction was requested and no tool calls are pending
+            The compacted history, or None if nothing was applied
         """
-        global _delayed_compaction_requested
-        if not _delayed_compaction_requested:
-            return False
+        future = self._background_compaction
+        if future is None or not future.done():
+            return None
+        source_hashes = self._background_compaction_source
+        # Interrupted tool calls in the summarized messages are dropped with them
+        if self.has_pending_tool_calls(messages[1 + len(source_hashes) :]):
+            return None
 
-        # Check if it's now safe to compact
-        messages = self.get_message_history()
-        if not self.has_pending_tool_calls(messages):
-            _delayed_compaction_requested = False  # Reset the flag
-            return True
+        self._background_compaction = None
+        self._background_compaction_source = []
+
+        try:
+            summary = future.result()
+        except Exception as e:
+            emit_warning(
+                f"Background summarization failed: {e}",
+                message_group="token_context_status",
+            )
+            return None
+
+        if not messages:
+            return None
+        head_hashes = [
+            self.hash_message(m) for m in messages[1 : 1 + len(source_hashes)]
+        ]
+        if head_hashes != source_hashes:
+            # History changed underneath the summary (cleared, truncated, ...)
+            return None
+
+        compacted = self.prune_interrupted_tool_calls(
+            [messages[0]] + list(summary) + messages[1 + len(source_hashes) :]
+        )
+        for message_hash in source_hashes:
+            self.add_compacted_message_hash(message_hash)
+        emit_info(
+            "✅ Background summarization applied",
+            message_group="token_context_status",
+        )
+        return compacted
+
+    def wait_for_background_compaction(
+        self, messages: List[ModelMessage], timeout: float
+    ) -> Optional[List[ModelMessage]]:
+        """
+        Wait up to `timeout` seconds for the in-flight background summary, then
+        apply it.
 
-        return False
+        Used when the context is full and the request can't be sent as-is. This
+        blocks the calling thread (the agent's event loop, when called from the
+        history processor), which is why the wait is bounded.
+
+        Returns:
+            The compacted history, or None if nothing was applied
+        """
+        future = self._background_compaction
+        if future is None:
+            return None
+        wait([future], timeout=timeout)
+        return self.apply_background_compaction(messages)
+
+    def cancel_background_compaction(self) -> None:
+        """Drop any in-flight background summarization."""
+        if self._background_compaction is not None:
+            self._background_compaction.cancel()
+        self._background_compaction = None
+        self._background_compaction_source = []
 
     def get_pending_tool_call_count(self, messages: List[ModelMessage]) -> int:
         """
@@ -691,8 +1065,7 @@ class BaseAgent(ABC):
             if tui_app:
                 try:
                     # Update the status bar instead of emitting a chat message
-                    status_bar = tui_app.query_one("StatusBar")
-                    status_bar.update_token_info(
+                    tui_app.publish_token_info(
                         total_current_tokens, model_max, proportion_used
                     )
                 except Exception as e:
@@ -708,22 +1081,22 @@ class BaseAgent(ABC):
         # Get the configured compaction strategy
         compaction_strategy = get_compaction_strategy()
 
-        if proportion_used > compaction_threshold:
-            # RACE CONDITION PROTECTION: Check for pending tool calls before summarization
-            if compaction_strategy == "summarization" and self.has_pending_tool_calls(
-                messages
-            ):
-                pending_count = self.get_pending_tool_call_count(messages)
-                emit_warning(
-                    f"⚠️  Summarization deferred: {pending_count} pending tool call(s) detected. "
-                    "Waiting for tool execution to complete before compaction.",
-                    message_group="token_context_status",
+        if compaction_strategy == "summarization":
+            # Swap in a background summary that finished since the last request
+            compacted_messages = self.apply_background_compaction(messages)
+            if compacted_messages is not None:
+                messages = compacted_messages
+                self.set_message_history(messages)
+                total_current_tokens = sum(
+                    self.estimate_tokens_for_message(msg) for msg in messages
                 )
-                # Request delayed compaction for when tool calls complete
-                self.request_delayed_compaction()
-                # Return original messages without compaction
-                return messages, []
+                proportion_used = total_current_tokens / model_max
 
+            # Start summarizing early so the result is ready before it's needed
+            if proportion_used > get_compaction_soft_threshold():
+                self.start_background_compaction(messages)
+
+        if proportion_used > compaction_threshold:
             if compaction_strategy == "truncation":
                 # Use truncation instead of summarization
                 protected_tokens = get_protected_token_count()
@@ -731,11 +1104,68 @@ class BaseAgent(ABC):
                     self.filter_huge_messages(messages), protected_tokens
                 )
                 summarized_messages = []  # No summarization in truncation mode
+            elif compaction_strategy == "tool_pruning":
+                # Elide old tool outputs down to the soft threshold, leaving some
+                # headroom; fall back to truncation if that isn't enough
+                protected_tokens = get_protected_token_count()
+                result_messages, summarized_messages = self.prune_tool_outputs(
+                    messages,
+                    protected_tokens,
+                    target_tokens=int(model_max * get_compaction_soft_threshold()),
+                )
+                pruned_tokens = sum(
+                    self.estimate_tokens_for_message(msg) for msg in result_messages
+                )
+                if pruned_tokens / model_max > compaction_threshold:
+                    result_messages = self.truncation(
+                        self.filter_huge_messages(result_messages), protected_tokens
+                    )
             else:
-                # Default to summarization (safe to proceed - no pending tool calls)
-                result_messages, summarized_messages = self.summarize_messages(
-                    self.filter_huge_messages(messages)
+                # Summarization runs in the background; the request only waits for
+                # it when the context is already full and can't be sent as-is.
+                if self._background_compaction is None:
+                    self.start_background_compaction(messages)
+                if proportion_used < 1.0 and self._background_compaction is not None:
+                    return messages
+
+                # RACE CONDITION PROTECTION: Check for pending tool calls before summarization
+                if self.has_pending_tool_calls(messages):
+                    pending_count = self.get_pending_tool_call_count(messages)
+                    emit_warning(
+                        f"⚠️  Summarization deferred: {pending_count} pending tool call(s) detected. "
+                        "Waiting for tool execution to complete before compaction.",
+                        message_group="token_context_status",
+                    )
+                    return messages
+
+                # Bounded wait on the event loop; if the summary isn't ready
+                # (or isn't enough), truncate rather than block any longer
+                compacted_messages = self.wait_for_background_compaction(
+                    messages, timeout=get_summarization_wait_timeout()
                 )
+                if compacted_messages is not None:
+                    messages = compacted_messages
+                    proportion_used = (
+                        sum(self.estimate_tokens_for_message(m) for m in messages)
+                        / model_max
+                    )
+
+                if (
+                    compacted_messages is not None
+                    and proportion_used <= compaction_threshold
+                ):
+                    result_messages = messages
+                else:
+                    self.cancel_background_compaction()
+                    emit_warning(
+                        "Summarization not ready in time; truncating history instead",
+                        message_group="token_context_status",
+                    )
+                    result_messages = self.truncation(
+                        self.filter_huge_messages(messages),
+                        get_protected_token_count(),
+                    )
+                summarized_messages = []
 
             final_token_count = sum(
                 self.estimate_tokens_for_message(msg) for msg in result_messages
@@ -750,8 +1180,7 @@ class BaseAgent(ABC):
                 tui_app = get_tui_app_instance()
                 if tui_app:
                     try:
-                        status_bar = tui_app.query_one("StatusBar")
-                        status_bar.update_token_info(
+                        tui_app.publish_token_info(
                             final_token_count, model_max, final_token_count / model_max
                         )
                     except Exception:
@@ -1319,20 +1748,12 @@ class BaseAgent(ABC):
                     self.prune_interrupted_tool_calls(self.get_message_history())
                 )
 
-                # DELAYED COMPACTION: Check if we should attempt delayed compaction
-                if self.should_attempt_delayed_compaction():
-                    emit_info(
-                        "🔄 Attempting delayed compaction (tool calls completed)",
-                        message_group="token_context_status",
-                    )
-                    current_messages = self.get_message_history()
-                    compacted_messages, _ = self.compact_messages(current_messages)
-                    if compacted_messages != current_messages:
-                        self.set_message_history(compacted_messages)
-                        emit_info(
-                            "✅ Delayed compaction completed successfully",
-                            message_group="token_context_status",
-                        )
+                # Swap in any background summary that finished since the last run
+                compacted_messages = self.apply_background_compaction(
+                    self.get_message_history()
+                )
+                if compacted_messages is not None:
+                    self.set_message_history(compacted_messages)
 
                 usage_limits = UsageLimits(request_limit=get_message_limit())
 
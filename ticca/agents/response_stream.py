@@ -0,0 +1,155 @@
+"""
+Streaming of the agent's response while it is generated.
+
+ResponseStream is used as the pydantic-ai ``event_stream_handler`` of an
+agent run. Text deltas are buffered and handed to ``on_text`` at most once
+per frame, tool calls are passed to ``on_tool_call`` as soon as they start,
+and the text of the latest response block is kept so callers can tell
+whether the run's final output has already been shown.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterable, Callable, Optional
+
+from pydantic_ai import RunContext
+from pydantic_ai.messages import (
+    AgentStreamEvent,
+    FunctionToolCallEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+)
+
+# Longest time (in seconds) streamed text is held back before it is shown
+RESPONSE_STREAM_FRAME = 0.1
+
+_FENCE = re.compile(r"^\s*(```|~~~)", re.MULTILINE)
+
+
+def complete_markdown_blocks(text: str) -> int:
+    """Length of the prefix of `text` made of complete markdown blocks.
+
+    Blocks end at a blank line outside of code fences, so each prefix can be
+    rendered on its own.
+    """
+    end = len(text)
+    while True:
+        cut = text.rfind("\n\n", 0, end)
+        if cut == -1:
+            return 0
+        if len(_FENCE.findall(text, 0, cut)) % 2 == 0:
+            return cut + 2
+        end = cut
+
+
+class ResponseStream:
+    """Forwards an agent run's text and tool calls while it is generated.
+
+    ``on_text(text, new_block)`` receives buffered text; ``new_block`` is True
+    for the first text of each response block (a new text part, or text
+    after a tool call). With ``markdown_blocks`` only complete markdown blocks
+    are passed on until the block ends.
+    """
+
+    def __init__(
+        self,
+        on_text: Callable[[str, bool], None],
+        on_tool_call: Optional[Callable[[str], None]] = None,
+        frame: float = RESPONSE_STREAM_FRAME,
+        markdown_blocks: bool = False,
+    ):
+        self.on_text = on_text
+        self.on_tool_call = on_tool_call
+        self.frame = frame
+        self.markdown_blocks = markdown_blocks
+        self.block_text = ""
+        self._buffer = ""
+        self._new_block = True
+        self._last_flush = 0.0
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+
+    async def __call__(
+        self, ctx: RunContext, events: AsyncIterable[AgentStreamEvent]
+    ) -> None:
+        async for event in events:
+            self.handle_event(event)
+        self.flush(force=True)
+
+    def handle_event(self, event: Any) -> None:
+        """Process a single streamed event."""
+        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+            self.end_block()
+            self._append(event.part.content)
+        elif isinstance(event, PartDeltaEvent) and isinstance(
+            event.delta, TextPartDelta
+        ):
+            self._append(event.delta.content_delta)
+        elif isinstance(event, FunctionToolCallEvent):
+            self.end_block()
+            if self.on_tool_call is not None:
+                self.on_tool_call(event.part.tool_name)
+
+    def shows(self, output: Any) -> bool:
+        """Whether `output` is the text already streamed as the latest block."""
+        return (
+            isinstance(output, str)
+            and bool(output.strip())
+            and output.strip() == self.block_text.strip()
+        )
+
+    def end_block(self) -> None:
+        """Show what is buffered and start a new response block."""
+        self.flush(force=True)
+        if self.block_text:
+            self._new_block = True
+            self.block_text = ""
+
+    def _append(self, text: str) -> None:
+        if not text:
+            return
+        self._buffer += text
+        self.block_text += text
+        self.flush()
+
+    def flush(self, force: bool = False) -> None:
+        """Pass buffered text on, at most once per frame unless forced."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._buffer:
+            return
+
+        now = time.monotonic()
+        wait = self._last_flush + self.frame - now
+        if not force and wait > 0:
+            self._schedule_flush(wait)
+            return
+
+        if force or not self.markdown_blocks:
+            cut = len(self._buffer)
+        else:
+            cut = complete_markdown_blocks(self._buffer)
+            if cut == 0:
+                return
+        chunk = self._buffer[:cut]
+        if self._new_block and not chunk.strip():
+            # Don't open a block with whitespace only
+            if force:
+                self._buffer = ""
+            return
+        self._buffer = self._buffer[cut:]
+
+        self._last_flush = now
+        self.on_text(chunk, self._new_block)
+        self._new_block = False
+
+    def _schedule_flush(self, delay: float) -> None:
+        # Show held-back text even if the model pauses between deltas
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_timer = loop.call_later(delay, self.flush)
@@ -0,0 +1,50 @@
+"""Crash-safe file writes.
+
+A file written with these helpers is either fully replaced or left untouched:
+data goes to a temporary file in the same directory, is flushed to disk, and
+is then moved over the target with ``os.replace``.
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+
+def fsync_directory(path: Path) -> None:
+    """Persist a rename in `path` (no-op where directories can't be fsynced)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_durably(path: Path, data: bytes, append: bool = False) -> None:
+    """Write (or append) `data` to `path` and flush it to disk."""
+    with open(path, "ab" if append else "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace the contents of `path` with `data` atomically."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        write_durably(tmp_path, data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    fsync_directory(path.parent)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """Replace the contents of `path` with `text` atomically."""
+    atomic_write_bytes(path, text.encode(encoding))
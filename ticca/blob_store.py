@@ -0,0 +1,176 @@
+"""Content-addressed blob store for large session payloads.
+
+Large tool outputs and binary attachments are stored once, keyed by the sha256
+of their bytes, as zlib-compressed files under ``<root>/<aa>/<digest>.z``.
+Persisted messages keep a small ``{"$blob": digest, "$type": ...}`` reference in
+their place, so the same file read many times (or saved in many snapshots)
+takes disk space only once.
+"""
+
+import base64
+import hashlib
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Set, Tuple
+
+from ticca.atomic_io import atomic_write_bytes
+
+# Payloads smaller than this stay inline; references aren't worth it
+BLOB_MIN_SIZE = 4096
+
+BLOB_REF_KEY = "$blob"
+BLOB_TYPE_KEY = "$type"
+
+
+class BlobStore:
+    """sha256-addressed store of zlib-compressed payloads."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root).expanduser().resolve()
+        # Keeps a sweep from deleting a blob that `put` is re-referencing
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.z"
+
+    def put(self, data: bytes) -> str:
+        """Store `data` (if not stored already) and return its digest.
+
+        Storing a payload that is already there refreshes its mtime, so it gets
+        the same grace period from `remove_unreferenced` as a new blob.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        with self._lock:
+            try:
+                os.utime(path)
+                return digest
+            except FileNotFoundError:
+                pass
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(path, zlib.compress(data))
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Return the payload stored under `digest`.
+
+        Raises:
+            FileNotFoundError: If no blob has that digest
+        """
+        with self._path(digest).open("rb") as f:
+            return zlib.decompress(f.read())
+
+    def stream(self, digest: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield the payload stored under `digest` in decompressed chunks."""
+        decompressor = zlib.decompressobj()
+        with self._path(digest).open("rb") as f:
+            while chunk := f.read(chunk_size):
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    def exists(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def delete(self, digest: str) -> None:
+        self._path(digest).unlink(missing_ok=True)
+
+    def remove_unreferenced(
+        self, referenced: Set[str], grace_seconds: float = 3600
+    ) -> Tuple[int, int]:
+        """Delete blobs not in `referenced`; returns (blobs removed, bytes freed).
+
+        Blobs written in the last `grace_seconds` are kept, since a save that
+        is still in progress stores its blobs before recording the message.
+        """
+        if not self.root.exists():
+            return 0, 0
+        cutoff = time.time() - grace_seconds
+        removed = freed = 0
+        for path in self.root.glob("*/*.z"):
+            if path.stem in referenced:
+                continue
+            try:
+                with self._lock:
+                    stat = path.stat()
+                    if stat.st_mtime > cutoff:
+                        continue
+                    path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += stat.st_size
+        return removed, freed
+
+    def externalize(self, message: Any, min_size: int = BLOB_MIN_SIZE) -> Any:
+        """Move large payloads of a JSON-mode message dump into the store.
+
+        Handles tool-return text, including every string in structured tool
+        outputs (e.g. ReadFileOutput.content or a shell command's stdout), and
+        binary content anywhere in a part's content. The message is modified in
+        place and returned.
+        """
+        for part in message.get("parts", []) if isinstance(message, dict) else []:
+            content = part.get("content")
+            if content is not None:
+                part["content"] = self._externalize_value(
+                    content, min_size, part.get("part_kind") == "tool-return"
+                )
+        return message
+
+    def _externalize_value(self, value: Any, min_size: int, text: bool) -> Any:
+        if isinstance(value, str):
+            if text and len(value) >= min_size:
+                return self._reference(value.encode("utf-8"), "text")
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = self._externalize_value(item, min_size, text)
+        elif isinstance(value, dict):
+            data = value.get("data")
+            if (
+                value.get("kind") == "binary"
+                and isinstance(data, str)
+                and len(data) >= min_size
+            ):
+                value["data"] = self._reference(base64.b64decode(data), "base64")
+            else:
+                for key, item in value.items():
+                    value[key] = self._externalize_value(item, min_size, text)
+        return value
+
+    def _reference(self, data: bytes, kind: str) -> Dict[str, str]:
+        return {BLOB_REF_KEY: self.put(data), BLOB_TYPE_KEY: kind}
+
+    def internalize(self, value: Any) -> Any:
+        """Replace blob references in a JSON-mode message dump with their payloads."""
+        if isinstance(value, list):
+            return [self.internalize(item) for item in value]
+        if isinstance(value, dict):
+            if BLOB_REF_KEY in value:
+                data = self.get(value[BLOB_REF_KEY])
+                if value.get(BLOB_TYPE_KEY) == "base64":
+                    return base64.b64encode(data).decode("ascii")
+                return data.decode("utf-8")
+            return {key: self.internalize(item) for key, item in value.items()}
+        return value
+
+
+_blob_stores: Dict[Path, BlobStore] = {}
+_blob_stores_lock = threading.Lock()
+
+
+def get_blob_store(root: Path) -> BlobStore:
+    """Return the (cached) blob store rooted at `root`."""
+    root = Path(root).expanduser().resolve()
+    with _blob_stores_lock:
+        store = _blob_stores.get(root)
+        if store is None:
+            store = BlobStore(root)
+            _blob_stores[root] = store
+        return store
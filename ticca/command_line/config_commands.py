@@ -62,7 +62,7 @@ def handle_show_command(command: str) -> bool:
 [bold]auto_save_session:[/bold]     {"[green]enabled[/green]" if auto_save else "[yellow]disabled[/yellow]"}
 [bold]protected_tokens:[/bold]      [cyan]{protected_tokens:,}[/cyan] recent tokens preserved
 [bold]compaction_threshold:[/bold]     [cyan]{compaction_threshold:.1%}[/cyan] context usage triggers compaction
-[bold]compaction_strategy:[/bold]   [cyan]{compaction_strategy}[/cyan] (summarization or truncation)
+[bold]compaction_strategy:[/bold]   [cyan]{compaction_strategy}[/cyan] (summarization, truncation or tool_pruning)
 [bold]reasoning_effort:[/bold]      [cyan]{get_openai_reasoning_effort()}[/cyan]
 
 """
@@ -142,7 +142,7 @@ def handle_set_command(command: str) -> bool:
             "\n  [cyan]auto_save_session[/cyan]    Auto-save chat after every response (true/false)"
         )
         emit_warning(
-            f"Usage: /set KEY=VALUE or /set KEY VALUE\nConfig keys: {', '.join(config_keys)}\n[dim]Note: compaction_strategy can be 'summarization' or 'truncation'[/dim]{session_help}"
+            f"Usage: /set KEY=VALUE or /set KEY VALUE\nConfig keys: {', '.join(config_keys)}\n[dim]Note: compaction_strategy can be 'summarization', 'truncation' or 'tool_pruning'[/dim]{session_help}"
         )
         return True
     if key:
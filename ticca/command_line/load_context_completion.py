@@ -3,6 +3,7 @@ from pathlib import Path
 from prompt_toolkit.completion import Completer, Completion
 
 from ticca.config import CONFIG_DIR
+from ticca.session_storage import list_sessions
 
 
 class LoadContextCompleter(Completer):
@@ -38,8 +39,8 @@ class LoadContextCompleter(Completer):
         try:
             contexts_dir = Path(CONFIG_DIR) / "contexts"
             if contexts_dir.exists():
-                for pkl_file in contexts_dir.glob("*.pkl"):
-                    session_name = pkl_file.stem  # removes .pkl extension
+                # Saved sessions (SQLite) plus legacy .pkl files
+                for session_name in list_sessions(contexts_dir):
                     if session_name.startswith(session_filter):
                         yield Completion(
                             session_name,
@@ -98,6 +98,10 @@ def handle_compact_command(command: str) -> bool:
         if compaction_strategy == "truncation":
             compacted = current_agent.truncation(history, protected_tokens)
             summarized_messages = []  # No summarization in truncation mode
+        elif compaction_strategy == "tool_pruning":
+            compacted, summarized_messages = current_agent.prune_tool_outputs(
+                history, protected_tokens
+            )
         else:
             # Default to summarization
             compacted, summarized_messages = current_agent.summarize_messages(
@@ -122,7 +126,7 @@ def handle_compact_command(command: str) -> bool:
 
         strategy_info = (
             f"using {compaction_strategy} strategy"
-            if compaction_strategy == "truncation"
+            if compaction_strategy in ("truncation", "tool_pruning")
             else "via summarization"
         )
         emit_success(
@@ -259,8 +263,11 @@ def handle_load_context_command(command: str) -> bool:
     contexts_dir = Path(CONTEXTS_DIR)
     session_path = contexts_dir / f"{session_name}.pkl"
 
+    agent = get_current_agent()
     try:
-        history = load_session(session_name, contexts_dir)
+        history = load_session(
+            session_name, contexts_dir, max_tokens=agent.get_history_token_budget()
+        )
     except FileNotFoundError:
         emit_error(f"Context file not found: {session_path}")
         available = list_sessions(contexts_dir)
@@ -271,7 +278,6 @@ def handle_load_context_command(command: str) -> bool:
         emit_error(f"Failed to load context: {exc}")
         return True
 
-    agent = get_current_agent()
     agent.set_message_history(history)
     total_tokens = sum(agent.estimate_tokens_for_message(m) for m in history)
 
@@ -287,3 +293,58 @@ def handle_load_context_command(command: str) -> bool:
         f"📁 From: {session_path}{autosave_info}"
     )
     return True
+
+
+@register_command(
+    name="search_sessions",
+    description="Keyword search over past sessions and saved contexts",
+    usage="/search_sessions <query>",
+    category="session",
+    detailed_help="""
+    Search the messages of autosaved sessions and saved contexts.
+
+    Every word of the query must appear in a message (case-insensitive,
+    word endings ignored). Works offline using a local full-text index.
+
+    Examples:
+      /search_sessions oauth refresh
+      /search_sessions migration sqlite
+    """,
+)
+def handle_search_sessions_command(command: str) -> bool:
+    """Search past sessions by keyword."""
+    from rich.markup import escape
+
+    from ticca.messaging import emit_error, emit_info, emit_warning
+    from ticca.tools.session_search import find_in_past_sessions
+
+    query = command.partition(" ")[2].strip()
+    if not query:
+        emit_warning("Usage: /search_sessions <query>")
+        return True
+
+    try:
+        # Control characters mark the matches so snippets can be escaped safely
+        matches = find_in_past_sessions(query, limit=20, highlight=("\x02", "\x03"))
+    except Exception as exc:
+        emit_error(f"Session search failed: {exc}")
+        return True
+
+    if not matches:
+        emit_info(f"No sessions match '{escape(query)}'")
+        return True
+
+    lines = [f"[bold]Sessions matching '{escape(query)}'[/bold]"]
+    for match in matches:
+        snippet = (
+            escape(" ".join(match.snippet.split()))
+            .replace("\x02", "[bold yellow]")
+            .replace("\x03", "[/bold yellow]")
+        )
+        lines.append(
+            f"[cyan]{match.session_id}[/cyan] "
+            f"[dim]({match.source}, {match.agent_name}, "
+            f"{match.updated_at}, {match.role})[/dim]\n  {snippet}"
+        )
+    emit_info("\n".join(lines))
+    return True
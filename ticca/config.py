@@ -5,7 +5,7 @@ import os
 import pathlib
 from typing import Optional
 
-from ticca.session_storage import save_session
+from ticca.session_storage import get_autosave_writer, save_session
 
 CONFIG_DIR = os.path.join(os.getenv("HOME", os.path.expanduser("~")), ".ticca")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "puppy.cfg")
@@ -481,7 +481,8 @@ def get_user_agents_directory() -> str:
 def initialize_command_history_file():
     """Create the command history file if it doesn't exist.
     Handles migration from the old history file location for backward compatibility.
-    Also normalizes the command history format if needed.
+    Also normalizes the command history format if needed, and compacts an
+    existing history that has grown past get_command_history_max_bytes().
     """
     import os
     from pathlib import Path
@@ -514,6 +515,12 @@ def initialize_command_history_file():
             direct_console = Console()
             error_msg = f"❌ An unexpected error occurred while trying to initialize history file: {str(e)}"
             direct_console.print(f"[bold red]{error_msg}[/bold red]")
+    else:
+        # Keep the history from growing without bound across sessions
+        try:
+            compact_command_history()
+        except Exception:
+            pass
 
 
 def get_yolo_mode():
@@ -607,20 +614,80 @@ def get_compaction_threshold():
         return 0.85
 
 
+def get_compaction_soft_threshold():
+    """
+    Returns the proportion of model context at which summarization starts in the
+    background, ahead of the hard compaction threshold.
+    Defaults to 0.1 below the compaction threshold if unset or misconfigured.
+    Configurable by 'compaction_soft_threshold' key.
+    """
+    hard_threshold = get_compaction_threshold()
+    val = get_value("compaction_soft_threshold")
+    try:
+        threshold = float(val) if val else hard_threshold - 0.1
+    except (ValueError, TypeError):
+        threshold = hard_threshold - 0.1
+    # Never start later than the hard threshold
+    return max(0.3, min(hard_threshold, threshold))
+
+
+def get_summarization_chunk_tokens():
+    """
+    Returns the token budget of a single summarization chunk.
+    Older history is summarized in chunks of roughly this size, and chunk
+    summaries are merged once together they grow past it.
+    Defaults to 20000 if unset or misconfigured (minimum 1000).
+    Configurable by 'summarization_chunk_tokens' key.
+    """
+    val = get_value("summarization_chunk_tokens")
+    try:
+        return max(1000, int(val)) if val else 20000
+    except (ValueError, TypeError):
+        return 20000
+
+
+def get_summarization_wait_timeout():
+    """
+    Returns how many seconds a request may block on summarization once the
+    context is full (the wait happens on the caller's event loop).
+    If the summary isn't ready by then, the history is truncated instead.
+    Defaults to 30 if unset or misconfigured (minimum 1).
+    Configurable by 'summarization_wait_timeout' key.
+    """
+    val = get_value("summarization_wait_timeout")
+    try:
+        return max(1.0, float(val)) if val else 30.0
+    except (ValueError, TypeError):
+        return 30.0
+
+
 def get_compaction_strategy() -> str:
     """
     Returns the user-configured compaction strategy.
-    Options are 'summarization' or 'truncation'.
-    Defaults to 'summarization' if not set or misconfigured.
+    Options are 'summarization', 'truncation' or 'tool_pruning'.
+    Defaults to 'truncation' if not set or misconfigured.
     Configurable by 'compaction_strategy' key.
     """
     val = get_value("compaction_strategy")
-    if val and val.lower() in ["summarization", "truncation"]:
+    if val and val.lower() in ["summarization", "truncation", "tool_pruning"]:
         return val.lower()
-    # Default to summarization
+    # Default to truncation
     return "truncation"
 
 
+def get_message_queue_overflow_policy() -> str:
+    """
+    Returns what the UI message queue does when its consumer falls behind.
+    Options are 'block', 'coalesce' or 'spill'.
+    Defaults to 'coalesce' if not set or misconfigured.
+    Configurable by 'message_queue_overflow_policy' key.
+    """
+    val = get_value("message_queue_overflow_policy")
+    if val and val.lower() in ["block", "coalesce", "spill"]:
+        return val.lower()
+    return "coalesce"
+
+
 def get_http2() -> bool:
     """
     Get the http2 configuration value.
@@ -704,6 +771,45 @@ def save_command_to_history(command: str):
         direct_console.print(f"[bold red]{error_msg}[/bold red]")
 
 
+def compact_command_history(max_bytes: Optional[int] = None) -> bool:
+    """Drop the oldest command history entries once the file is too large.
+
+    The newest entries, up to half of `max_bytes`, are kept so that the
+    file is rewritten rarely.
+
+    Args:
+        max_bytes: Size limit; defaults to get_command_history_max_bytes().
+
+    Returns:
+        True if the file was compacted.
+    """
+    import re
+    from pathlib import Path
+
+    from ticca.atomic_io import atomic_write_bytes
+
+    if max_bytes is None:
+        max_bytes = get_command_history_max_bytes()
+    if max_bytes <= 0:
+        return False
+    try:
+        size = os.path.getsize(COMMAND_HISTORY_FILE)
+    except OSError:
+        return False
+    if size <= max_bytes:
+        return False
+
+    with open(COMMAND_HISTORY_FILE, "rb") as f:
+        f.seek(size - max_bytes // 2)
+        tail = f.read()
+    # Keep whole entries: start at the first timestamp line in the tail
+    match = re.search(rb"\n# \d{4}-\d{2}-\d{2}", tail)
+    if match is None:
+        return False
+    atomic_write_bytes(Path(COMMAND_HISTORY_FILE), tail[match.start() + 1 :])
+    return True
+
+
 def get_agent_pinned_model(agent_name: str) -> str:
     """Get the pinned model for a specific agent.
 
@@ -897,6 +1003,90 @@ def set_max_saved_sessions(max_sessions: int):
     set_config_value("max_saved_sessions", str(max_sessions))
 
 
+def get_max_subagent_sessions() -> int:
+    """
+    Gets the maximum number of sub-agent sessions to keep (0 for unlimited).
+    Defaults to 100 if not set.
+    """
+    cfg_val = get_value("max_subagent_sessions")
+    if cfg_val is not None:
+        try:
+            return max(0, int(cfg_val))
+        except (ValueError, TypeError):
+            pass
+    return 100
+
+
+def get_session_retention_max_mb() -> int:
+    """
+    Gets the disk budget in MB shared by autosaves and sub-agent sessions
+    (and saved contexts, if session_retention_include_contexts is set; 0 for
+    unlimited). Defaults to 1024 if not set.
+    """
+    cfg_val = get_value("session_retention_max_mb")
+    if cfg_val is not None:
+        try:
+            return max(0, int(cfg_val))
+        except (ValueError, TypeError):
+            pass
+    return 1024
+
+
+def get_session_retention_include_contexts() -> bool:
+    """
+    Whether saved contexts are subject to the age and disk retention budgets
+    like autosaves. Defaults to False (saved contexts are only deleted by the
+    user).
+    """
+    val = get_value("session_retention_include_contexts")
+    if val is None:
+        return False
+    return str(val).strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_session_retention_max_age_days() -> int:
+    """
+    Gets the age in days after which autosaves and sub-agent sessions are
+    deleted (0 to keep sessions regardless of age). Defaults to 0 if not set.
+    """
+    cfg_val = get_value("session_retention_max_age_days")
+    if cfg_val is not None:
+        try:
+            return max(0, int(cfg_val))
+        except (ValueError, TypeError):
+            pass
+    return 0
+
+
+def get_tui_transcript_max_messages() -> int:
+    """
+    Gets the maximum number of messages the TUI chat view keeps (0 for
+    unlimited). Older messages are removed from the view; the conversation
+    itself is unaffected. Defaults to 2000 if not set.
+    """
+    cfg_val = get_value("tui_transcript_max_messages")
+    if cfg_val is not None:
+        try:
+            return max(0, int(cfg_val))
+        except (ValueError, TypeError):
+            pass
+    return 2000
+
+
+def get_command_history_max_bytes() -> int:
+    """
+    Gets the size (in bytes) above which the command history file is
+    compacted to its newest entries (0 to never compact). Defaults to 5 MiB.
+    """
+    cfg_val = get_value("command_history_max_bytes")
+    if cfg_val is not None:
+        try:
+            return max(0, int(cfg_val))
+        except (ValueError, TypeError):
+            pass
+    return 5 * 1024 * 1024
+
+
 def get_diff_highlight_style() -> str:
     """
     Get the diff highlight style preference.
@@ -1077,7 +1267,11 @@ def set_current_autosave_from_session_name(session_name: str) -> str:
 
 
 def auto_save_session_if_enabled() -> bool:
-    """Automatically save the current session if auto_save_session is enabled."""
+    """Automatically save the current session if auto_save_session is enabled.
+
+    The save itself runs on the background autosave writer; this only takes a
+    snapshot of the history and queues it.
+    """
     if not get_auto_save_session():
         return False
 
@@ -1094,18 +1288,25 @@ def auto_save_session_if_enabled() -> bool:
         now = datetime.datetime.now()
         session_name = get_current_autosave_session_name()
         autosave_dir = pathlib.Path(AUTOSAVE_DIR)
-
-        metadata = save_session(
-            history=history,
-            session_name=session_name,
-            base_dir=autosave_dir,
-            timestamp=now.isoformat(),
-            token_estimator=current_agent.estimate_tokens_for_message,
-            auto_saved=True,
-        )
+        # Messages aren't modified once in the history, so a shallow copy is a
+        # stable snapshot even while the agent keeps appending
+        snapshot = list(history)
+        agent_name = current_agent.display_name
+
+        def write() -> None:
+            save_session(
+                history=snapshot,
+                session_name=session_name,
+                base_dir=autosave_dir,
+                timestamp=now.isoformat(),
+                token_estimator=current_agent.estimate_tokens_for_message,
+                auto_saved=True,
+                agent_name=agent_name,
+            )
 
         # Autosave happens silently in the background
         # No UI notification needed - sessions are automatically saved
+        get_autosave_writer().submit(session_name, write)
         return True
 
     except Exception as exc:  # pragma: no cover - defensive logging
@@ -1135,6 +1336,8 @@ def get_diff_context_lines() -> int:
 def finalize_autosave_session() -> str:
     """Persist the current autosave snapshot and rotate to a fresh session."""
     auto_save_session_if_enabled()
+    # Make sure the session is on disk before moving on from it
+    get_autosave_writer().flush()
     return rotate_autosave_id()
 
 
@@ -0,0 +1,279 @@
+"""
+Shared cache of directory listings.
+
+The TUI file tree and list_files read directories through one
+DirectoryCache. Listings leave out directories matching DIR_IGNORE_PATTERNS
+(matched against the end of the directory's path, so an ignored ancestor
+such as /tmp doesn't hide a whole project) and are reused until the
+directory changes. Once watching is enabled (it needs watchdog, installed
+with the `ticca[watch]` extra), each listed directory is watched on its
+own, so ignored trees such as node_modules are never watched, and filesystem
+events invalidate listings and notify listeners. Without watchdog, a listing is
+read again when its directory's mtime changes.
+"""
+
+import fnmatch
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dep
+    FileSystemEventHandler = object  # type: ignore
+    Observer = None  # type: ignore
+
+from ticca.tools.common import DIR_IGNORE_PATTERNS
+
+# Listings kept before the least recently used are dropped
+DIRECTORY_CACHE_SIZE = 2000
+
+# Changes within this many seconds of an mtime may not change the mtime
+MTIME_GRANULARITY = 2.0
+
+
+@lru_cache(maxsize=1)
+def _ignore_rules() -> Tuple["re.Pattern[str]", Tuple[Tuple[str, ...], ...]]:
+    """DIR_IGNORE_PATTERNS as a regex for names and multi-part name patterns."""
+    names = set()
+    multi_part = set()
+    for pattern in DIR_IGNORE_PATTERNS:
+        if pattern.startswith("**/"):
+            pattern = pattern[3:]
+        if pattern.endswith("/**"):
+            pattern = pattern[:-3]
+        if "**" in pattern:
+            # File patterns below a directory, e.g. node_modules/**/*.js
+            continue
+        parts = tuple(pattern.split("/"))
+        if len(parts) == 1:
+            names.add(fnmatch.translate(pattern))
+        else:
+            multi_part.add(parts)
+    return re.compile("|".join(sorted(names))), tuple(sorted(multi_part))
+
+
+def is_ignored_dir(path: str) -> bool:
+    """Whether the directory `path` matches DIR_IGNORE_PATTERNS."""
+    name_pattern, multi_part = _ignore_rules()
+    if name_pattern.match(os.path.basename(path)):
+        return True
+    parts = path.split(os.sep)
+    return any(
+        len(parts) >= len(rule)
+        and all(
+            fnmatch.fnmatchcase(part, rule_part)
+            for part, rule_part in zip(parts[-len(rule) :], rule)
+        )
+        for rule in multi_part
+    )
+
+
+@dataclass(frozen=True)
+class CachedEntry:
+    """An entry of a cached directory listing."""
+
+    name: str
+    path: str
+    is_dir: bool
+
+
+@dataclass
+class _Listing:
+    entries: List[CachedEntry]
+    by_name: Dict[str, CachedEntry]
+    mtime_ns: int
+    # False if the directory may have changed without it being noticed
+    trusted: bool
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    def __init__(self, cache: "DirectoryCache"):
+        self._cache = cache
+
+    def on_any_event(self, event) -> None:
+        # Only entries appearing, disappearing or moving change a listing
+        if event.event_type not in ("created", "deleted", "moved"):
+            return
+        self._cache.invalidate(os.path.dirname(os.fsdecode(event.src_path)))
+        dest_path = getattr(event, "dest_path", "")
+        if dest_path:
+            self._cache.invalidate(os.path.dirname(os.fsdecode(dest_path)))
+
+
+class DirectoryCache:
+    """Directory listings, cached until the directory changes."""
+
+    def __init__(self, max_listings: int = DIRECTORY_CACHE_SIZE):
+        self.max_listings = max_listings
+        self._lock = threading.Lock()
+        self._listings: "OrderedDict[str, _Listing]" = OrderedDict()
+        self._changes = 0
+        self._listeners: List[Callable[[str], None]] = []
+        # Watches are (un)scheduled outside of _lock: the observer holds its
+        # own lock while it dispatches events, which take _lock
+        self._watch_lock = threading.Lock()
+        self._watches: Dict[str, object] = {}
+        self._observer = None
+        self._handler = _ChangeHandler(self)
+
+    def list_dir(self, path: str) -> List[CachedEntry]:
+        """List `path`, directories first, without ignored directories.
+
+        Raises:
+            OSError: If the directory can't be read.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            listing = self._listings.get(path)
+            if listing is not None and listing.trusted and path in self._watches:
+                self._listings.move_to_end(path)
+                return listing.entries
+
+        # Watched before the checks below, so no later change goes unnoticed
+        self._watch(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        if listing is not None and listing.trusted and listing.mtime_ns == mtime_ns:
+            return listing.entries
+
+        with self._lock:
+            changes = self._changes
+        listing = self._scan(path, mtime_ns)
+
+        evicted = []
+        with self._lock:
+            # An event during the scan may not be reflected in it
+            listing.trusted = listing.trusted and changes == self._changes
+            self._listings[path] = listing
+            self._listings.move_to_end(path)
+            while len(self._listings) > self.max_listings:
+                evicted.append(self._listings.popitem(last=False)[0])
+        for evicted_path in evicted:
+            self._unwatch(evicted_path)
+        return listing.entries
+
+    def is_dir(self, path: str) -> Optional[bool]:
+        """Whether `path` is a directory, if its parent's listing is cached."""
+        parent, name = os.path.split(os.path.abspath(path))
+        with self._lock:
+            listing = self._listings.get(parent)
+            entry = listing.by_name.get(name) if listing is not None else None
+        return None if entry is None else entry.is_dir
+
+    def invalidate(self, path: str) -> None:
+        """Forget the listing of `path` and tell listeners it changed."""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._changes += 1
+            listing = self._listings.pop(path, None)
+            listeners = list(self._listeners)
+        if listing is None:
+            return
+        for listener in listeners:
+            try:
+                listener(path)
+            except Exception:
+                pass
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Call `listener(path)` when a cached directory changes.
+
+        Listeners are called from the watcher's thread.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def enable_watching(self) -> bool:
+        """Watch listed directories for changes.
+
+        Returns False if watchdog isn't installed; listings are then checked
+        against their directory's mtime instead.
+        """
+        if Observer is None:
+            return False
+        with self._watch_lock:
+            if self._observer is None:
+                observer = Observer()
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+        return True
+
+    def stop_watching(self) -> None:
+        """Stop watching; cached listings are then checked by mtime."""
+        with self._watch_lock:
+            observer, self._observer = self._observer, None
+            self._watches.clear()
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+
+    def _scan(self, path: str, mtime_ns: int) -> _Listing:
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir and is_ignored_dir(entry.path):
+                    continue
+                entries.append(CachedEntry(entry.name, entry.path, is_dir))
+        entries.sort(key=lambda entry: (not entry.is_dir, entry.name.lower()))
+        recently_modified = time.time_ns() - mtime_ns < MTIME_GRANULARITY * 1e9
+        return _Listing(
+            entries=entries,
+            by_name={entry.name: entry for entry in entries},
+            mtime_ns=mtime_ns,
+            trusted=not recently_modified,
+        )
+
+    def _watch(self, path: str) -> None:
+        with self._watch_lock:
+            if self._observer is None or path in self._watches:
+                return
+            try:
+                self._watches[path] = self._observer.schedule(
+                    self._handler, path, recursive=False
+                )
+            except OSError:
+                # e.g. out of inotify watches; the mtime check still applies
+                pass
+
+    def _unwatch(self, path: str) -> None:
+        with self._watch_lock:
+            watch = self._watches.pop(path, None)
+            if watch is None or self._observer is None:
+                return
+            try:
+                self._observer.unschedule(watch)
+            except Exception:
+                pass
+
+
+_directory_cache: Optional[DirectoryCache] = None
+_directory_cache_lock = threading.Lock()
+
+
+def get_directory_cache() -> DirectoryCache:
+    """The directory cache shared by the file tree and the file tools."""
+    global _directory_cache
+    with _directory_cache_lock:
+        if _directory_cache is None:
+            _directory_cache = DirectoryCache()
+        return _directory_cache
@@ -2,18 +2,48 @@
 
 This module implements a three-tier storage system for chat sessions:
 1. SQLite - Fast metadata queries
-2. JSON - Human-readable message storage
+2. JSONL - Human-readable, append-only message log
 3. ChromaDB - Semantic search (optional)
 
+Alongside the human-readable log, complete pydantic-ai messages (tool calls and
+returns included) are kept in an append-only file of zlib-compressed JSON frames,
+one per message, with their offsets indexed in SQLite so any tail of a session
+can be read without decoding the rest. Large tool outputs and binary attachments
+in those messages are moved to the shared content-addressed blob store.
+
 See HYBRID_STORAGE.md for full documentation.
 """
 
+import hashlib
 import json
+import os
+import queue
+import re
 import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ticca.atomic_io import fsync_directory, write_durably
+from ticca.blob_store import BLOB_REF_KEY, BlobStore, get_blob_store
+
+# Blob references inside the compact JSON of a message frame
+_BLOB_REF_PATTERN = re.compile(rb'"\$blob":"([0-9a-f]{64})"')
+
+# Files modified this recently may belong to a save still in progress (possibly
+# in another process), so startup recovery leaves them alone
+RECOVERY_GRACE_SECONDS = 60
+
+# Length of the last-user-message preview kept with each session
+PREVIEW_LENGTH = 200
+
+# Messages embedded per ChromaDB upsert by the background indexer
+CHROMA_INDEX_BATCH_SIZE = 64
 
 # Conditional ChromaDB import
 try:
@@ -54,28 +84,56 @@ class SessionMetadata:
     message_count: int
     total_tokens: int
     auto_saved: bool
+    preview: Optional[str] = None
 
 
 class HybridStorage:
     """Hybrid storage implementation with SQLite + JSON + optional ChromaDB."""
 
-    def __init__(self, base_dir: Path, enable_semantic_search: bool = False):
+    def __init__(
+        self,
+        base_dir: Path,
+        enable_semantic_search: bool = False,
+        blob_store: Optional[BlobStore] = None,
+    ):
         # Ensure base_dir is always an absolute path under ~/.ticca/
         self.base_dir = Path(base_dir).expanduser().resolve()
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
-        # Setup SQLite
+        # Blobs live next to the storage dirs (~/.ticca/blobs), so payloads are
+        # shared between autosaves, saved contexts and sub-agent sessions
+        self.blob_store = blob_store or get_blob_store(self.base_dir.parent / "blobs")
+
+        # Setup SQLite: one long-lived connection shared by all callers (the
+        # autosave writer runs on its own thread), serialized by a lock
         self.db_path = self.base_dir / "sessions.db"
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self.enable_full_text_search = False
+        self._search_backfill_needed = False
         self._init_database()
 
         # Setup JSON storage directory
         self.json_dir = self.base_dir / "sessions"
         self.json_dir.mkdir(parents=True, exist_ok=True)
+        self.recover_sessions()
 
         # Setup ChromaDB (optional)
         self.enable_semantic_search = enable_semantic_search and CHROMADB_AVAILABLE
         self.chroma_client = None
         self.chroma_collection = None
+        # Embedding happens on a background thread, fed through this queue
+        self._index_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._indexer_thread: Optional[threading.Thread] = None
+
+        # Sessions saved before the full-text index existed are indexed once,
+        # in the background
+        if self._search_backfill_needed:
+            threading.Thread(
+                target=self._backfill_search_index, name="fts-backfill", daemon=True
+            ).start()
 
         if self.enable_semantic_search:
             try:
@@ -84,10 +142,27 @@ class HybridStorage:
                 print(f"Warning: Failed to initialize ChromaDB: {e}")
                 self.enable_semantic_search = False
 
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Use the shared connection; commit on success, roll back on error."""
+        with self._lock:
+            try:
+                yield self._conn
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def close(self) -> None:
+        """Finish pending semantic indexing and close the SQLite connection."""
+        if self._indexer_thread is not None and self._indexer_thread.is_alive():
+            self.flush_index()
+        with self._lock:
+            self._conn.close()
+
     def _init_database(self):
         """Initialize SQLite database schema."""
-        conn = sqlite3.connect(str(self.db_path))
-        try:
+        with self._transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS sessions (
                     session_id TEXT PRIMARY KEY,
@@ -101,9 +176,76 @@ class HybridStorage:
             """)
             conn.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON sessions(created_at DESC)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_agent_name ON sessions(agent_name)")
-            conn.commit()
-        finally:
-            conn.close()
+
+            # Bookkeeping for the append-only message log (added after the
+            # initial schema, so older databases get the columns here)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+            for column, definition in (
+                ("persisted_count", "INTEGER NOT NULL DEFAULT 0"),
+                ("stored_count", "INTEGER NOT NULL DEFAULT 0"),
+                ("log_size", "INTEGER NOT NULL DEFAULT 0"),
+                ("last_message_digest", "TEXT"),
+                ("preview", "TEXT"),
+                ("pending_rewrite", "INTEGER NOT NULL DEFAULT 0"),
+            ):
+                if column not in columns:
+                    conn.execute(
+                        f"ALTER TABLE sessions ADD COLUMN {column} {definition}"
+                    )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_updated_at ON sessions(updated_at DESC)"
+            )
+
+            # Hashes of messages already embedded in ChromaDB
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS indexed_messages (
+                    session_id TEXT NOT NULL,
+                    message_hash TEXT NOT NULL,
+                    PRIMARY KEY (session_id, message_hash)
+                ) WITHOUT ROWID
+            """)
+
+            # Offsets of the full-fidelity message frames, one row per message
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS session_messages (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    PRIMARY KEY (session_id, seq)
+                ) WITHOUT ROWID
+            """)
+
+            # Full-text index: one document row per stored message, matched by
+            # rowid with the FTS5 table (so a session's rows can be found and
+            # deleted without scanning the whole index)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_documents (
+                    id INTEGER PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    message_index INTEGER NOT NULL,
+                    role TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_documents_session "
+                "ON search_documents(session_id)"
+            )
+            fts_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'"
+            ).fetchone()
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts "
+                    "USING fts5(content, tokenize='porter unicode61')"
+                )
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5
+                return
+            self.enable_full_text_search = True
+            self._search_backfill_needed = not fts_exists and bool(
+                conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone()
+            )
 
     def _init_chromadb(self):
         """Initialize ChromaDB for semantic search."""
@@ -196,6 +338,214 @@ class HybridStorage:
             tool_call_id=tool_call_id
         )
 
+    @staticmethod
+    def _message_digest(msg: Any) -> str:
+        """Stable digest of a message, used to check the saved log is still a prefix."""
+        try:
+            from pydantic_ai.messages import ModelMessagesTypeAdapter
+
+            data = ModelMessagesTypeAdapter.dump_json([msg], warnings=False)
+        except Exception:
+            data = repr(msg).encode("utf-8", "replace")
+        return hashlib.sha1(data).hexdigest()
+
+    def _log_path(self, session_id: str) -> Path:
+        return self.json_dir / f"{session_id}.jsonl"
+
+    def _messages_path(self, session_id: str) -> Path:
+        return self.json_dir / f"{session_id}.msgs"
+
+    @staticmethod
+    def _rewrite_path(path: Path) -> Path:
+        """Where a rewritten file is staged until its row is committed."""
+        return path.with_name(path.name + ".tmp")
+
+    def _finish_rewrite(self, session_id: str) -> None:
+        """Install the staged files of a committed rewrite.
+
+        Idempotent, so recovery can complete a rewrite interrupted by a crash.
+        """
+        with self._lock:
+            for path in (self._log_path(session_id), self._messages_path(session_id)):
+                staged = self._rewrite_path(path)
+                if staged.exists():
+                    os.replace(staged, path)
+
+            with self._transaction() as conn:
+                has_frames = conn.execute(
+                    "SELECT 1 FROM session_messages WHERE session_id = ? LIMIT 1",
+                    (session_id,),
+                ).fetchone()
+            # Stale frames (history not representable in full fidelity) and the
+            # legacy whole-session JSON file are superseded by the new log
+            stale = [self.json_dir / f"{session_id}.json"]
+            if not has_frames:
+                stale.append(self._messages_path(session_id))
+            for path in stale:
+                path.unlink(missing_ok=True)
+            fsync_directory(self.json_dir)
+
+            with self._transaction() as conn:
+                conn.execute(
+                    "UPDATE sessions SET pending_rewrite = 0 WHERE session_id = ?",
+                    (session_id,),
+                )
+
+    def recover_sessions(self) -> List[str]:
+        """Repair sessions left inconsistent by a crash during a save.
+
+        Completes rewrites that were committed but not installed, removes
+        staged files of rewrites that never committed, and truncates logs and
+        frame files back to their last committed size. Files modified within
+        RECOVERY_GRACE_SECONDS are left alone, as another process may be
+        writing them.
+
+        Returns:
+            IDs of the sessions that were repaired
+        """
+        repaired = []
+        cutoff = time.time() - RECOVERY_GRACE_SECONDS
+
+        def settled(path: Path) -> bool:
+            try:
+                return path.stat().st_mtime < cutoff
+            except OSError:
+                return False
+
+        with self._lock:
+            with self._transaction() as conn:
+                pending = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT session_id FROM sessions WHERE pending_rewrite = 1"
+                    )
+                ]
+            for session_id in pending:
+                self._finish_rewrite(session_id)
+                repaired.append(session_id)
+
+            for staged in self.json_dir.glob("*.tmp"):
+                if settled(staged):
+                    staged.unlink(missing_ok=True)
+
+            with self._transaction() as conn:
+                rows = conn.execute("""
+                    SELECT s.session_id, s.log_size,
+                           COUNT(m.seq), COALESCE(MAX(m.offset + m.length), 0)
+                    FROM sessions s
+                    LEFT JOIN session_messages m ON m.session_id = s.session_id
+                    GROUP BY s.session_id
+                """).fetchall()
+
+            for session_id, log_size, frame_count, frames_end in rows:
+                damaged = False
+
+                log_path = self._log_path(session_id)
+                if (
+                    log_path.exists()
+                    and log_path.stat().st_size > log_size
+                    and settled(log_path)
+                ):
+                    # Appended but never committed
+                    os.truncate(log_path, log_size)
+                    damaged = True
+
+                if frame_count:
+                    messages_path = self._messages_path(session_id)
+                    size = messages_path.stat().st_size if messages_path.exists() else 0
+                    if size > frames_end and settled(messages_path):
+                        os.truncate(messages_path, frames_end)
+                        damaged = True
+                    elif size < frames_end:
+                        # Frames lost; loads fall back to the readable log
+                        with self._transaction() as conn:
+                            conn.execute(
+                                "DELETE FROM session_messages WHERE session_id = ?",
+                                (session_id,),
+                            )
+                        messages_path.unlink(missing_ok=True)
+                        damaged = True
+
+                if damaged and session_id not in repaired:
+                    repaired.append(session_id)
+
+        return repaired
+
+    def _encode_messages(self, messages: List[Any]) -> Optional[List[bytes]]:
+        """Encode messages as compressed JSON frames.
+
+        Returns None if any of them isn't a ModelMessage. Large payloads are
+        replaced by references into the blob store.
+        """
+        try:
+            from pydantic_ai.messages import ModelMessagesTypeAdapter
+
+            frames = []
+            for msg in messages:
+                data = ModelMessagesTypeAdapter.dump_python(
+                    [msg], mode="json", warnings="error"
+                )[0]
+                self.blob_store.externalize(data)
+                frames.append(
+                    zlib.compress(
+                        json.dumps(
+                            data, ensure_ascii=False, separators=(",", ":")
+                        ).encode("utf-8")
+                    )
+                )
+            return frames
+        except Exception:
+            return None
+
+    def _message_frames_intact(
+        self, conn: sqlite3.Connection, session_id: str, count: int
+    ) -> bool:
+        """Check the frame file and its index cover exactly `count` messages."""
+        indexed, end = conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(offset + length), 0)"
+            " FROM session_messages WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        path = self._messages_path(session_id)
+        return indexed == count and path.exists() and path.stat().st_size == end
+
+    def _write_message_frames(
+        self,
+        conn: sqlite3.Connection,
+        session_id: str,
+        start: int,
+        frames: Optional[List[bytes]],
+    ) -> None:
+        """Append frames for messages `start..`, or stage a rewrite when start is 0.
+
+        Staged rewrites are installed by `_finish_rewrite` once committed.
+        """
+        path = self._messages_path(session_id)
+        if not start or frames is None:
+            conn.execute(
+                "DELETE FROM session_messages WHERE session_id = ?", (session_id,)
+            )
+            if frames is None:
+                # Not representable in full fidelity; loads use the readable log
+                # (the stale frame file is removed by _finish_rewrite)
+                return
+
+        offset = path.stat().st_size if start else 0
+        rows = []
+        for seq, frame in enumerate(frames, start=start):
+            rows.append((session_id, seq, offset, len(frame)))
+            offset += len(frame)
+
+        if start:
+            write_durably(path, b"".join(frames), append=True)
+        else:
+            write_durably(self._rewrite_path(path), b"".join(frames))
+        conn.executemany(
+            "INSERT INTO session_messages (session_id, seq, offset, length)"
+            " VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
     def save_session(
         self,
         session_id: str,
@@ -216,45 +566,113 @@ class HybridStorage:
         Returns:
             SessionMetadata for the saved session
         """
-        # Convert messages to storable format (filter out None for messages with no content)
-        stored_messages = [
-            self._convert_message_to_stored(msg)
-            for msg in messages
-        ]
-        stored_messages = [msg for msg in stored_messages if msg is not None]
+        log_path = self._log_path(session_id)
+        # Held until a rewrite is installed, so readers never see it half-done
+        with self._lock:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    """
+                    SELECT persisted_count, stored_count, log_size, last_message_digest,
+                           total_tokens, preview
+                    FROM sessions WHERE session_id = ?
+                    """,
+                    (session_id,),
+                ).fetchone()
+
+                # Only the messages added since the last save are written, as long as
+                # the saved log is intact and still a prefix of the history. Anything
+                # else (compacted history, torn write, first save) rewrites the log.
+                start = 0
+                stored_count = 0
+                total_tokens = 0
+                preview = None
+                log_size = 0
+                if row and log_path.exists():
+                    (
+                        persisted_count,
+                        prev_stored,
+                        prev_log_size,
+                        last_digest,
+                        prev_tokens,
+                        prev_preview,
+                    ) = row
+                    if (
+                        0 < persisted_count <= len(messages)
+                        and log_path.stat().st_size == prev_log_size
+                        and self._message_digest(messages[persisted_count - 1])
+                        == last_digest
+                        and self._message_frames_intact(
+                            conn, session_id, persisted_count
+                        )
+                    ):
+                        start = persisted_count
+                        stored_count = prev_stored
+                        total_tokens = prev_tokens
+                        preview = prev_preview
+                        log_size = prev_log_size
+
+                new_messages = messages[start:]
+                # Convert messages to storable format (filter out None for
+                # messages with no content)
+                stored_messages = [
+                    self._convert_message_to_stored(msg)
+                    for msg in new_messages
+                ]
+                stored_messages = [msg for msg in stored_messages if msg is not None]
+                preview = self._preview(stored_messages) or preview
+                lines = "".join(
+                    json.dumps(msg.to_dict(), ensure_ascii=False) + "\n"
+                    for msg in stored_messages
+                )
 
-        # Save to JSON
-        json_path = self.json_dir / f"{session_id}.json"
-        with json_path.open('w', encoding='utf-8') as f:
-            json.dump(
-                [msg.to_dict() for msg in stored_messages],
-                f,
-                indent=2,
-                ensure_ascii=False
-            )
+                # Appends are flushed to disk before the row recording them is
+                # committed. Rewrites are staged next to the live files and only
+                # replace them after the commit (see _finish_rewrite), so a crash
+                # at any point leaves the committed version of the session intact.
+                data = lines.encode("utf-8")
+                if start:
+                    if data:
+                        write_durably(log_path, data, append=True)
+                else:
+                    write_durably(self._rewrite_path(log_path), data)
+                log_size += len(data)
+
+                self._index_messages_for_search(
+                    conn, session_id, stored_messages, stored_count, replace=not start
+                )
 
-        # Calculate tokens
-        total_tokens = 0
-        if token_estimator:
-            total_tokens = sum(token_estimator(msg) for msg in messages)
+                self._write_message_frames(
+                    conn, session_id, start, self._encode_messages(new_messages)
+                )
 
-        # Save metadata to SQLite
-        now = datetime.now(timezone.utc)
-        conn = sqlite3.connect(str(self.db_path))
-        try:
-            conn.execute("""
-                INSERT OR REPLACE INTO sessions
-                (session_id, agent_name, created_at, updated_at, message_count, total_tokens, auto_saved)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (session_id, agent_name, now, now, len(messages), total_tokens, auto_saved))
-            conn.commit()
-        finally:
-            conn.close()
+                # Calculate tokens for the new messages only
+                if token_estimator:
+                    total_tokens += sum(token_estimator(msg) for msg in new_messages)
+
+                # Save metadata to SQLite
+                now = datetime.now(timezone.utc)
+                conn.execute("""
+                    INSERT OR REPLACE INTO sessions
+                    (session_id, agent_name, created_at, updated_at, message_count,
+                     total_tokens, auto_saved, persisted_count, stored_count,
+                     log_size, last_message_digest, preview, pending_rewrite)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    session_id, agent_name, now, now, len(messages), total_tokens,
+                    auto_saved, len(messages), stored_count + len(stored_messages),
+                    log_size, self._message_digest(messages[-1]) if messages else None,
+                    preview, 0 if start else 1,
+                ))
+
+            if not start:
+                self._finish_rewrite(session_id)
 
         # Index in ChromaDB (if enabled)
         if self.enable_semantic_search and self.chroma_collection:
             try:
-                self._index_messages_in_chromadb(session_id, stored_messages, agent_name)
+                self._index_messages_in_chromadb(
+                    session_id, stored_messages, agent_name, start_index=stored_count
+                )
             except Exception as e:
                 print(f"Warning: Failed to index in ChromaDB: {e}")
 
@@ -265,40 +683,195 @@ class HybridStorage:
             updated_at=now,
             message_count=len(messages),
             total_tokens=total_tokens,
-            auto_saved=auto_saved
+            auto_saved=auto_saved,
+            preview=preview,
         )
 
-    def _index_messages_in_chromadb(self, session_id: str, messages: List[StoredMessage], agent_name: str):
-        """Index messages in ChromaDB for semantic search."""
+    @staticmethod
+    def _preview(messages: List[StoredMessage]) -> Optional[str]:
+        """One-line preview of the last non-empty user message, if any."""
+        for msg in reversed(messages):
+            if msg.role == "user":
+                content = " ".join(msg.content.split())
+                if content:
+                    return content[:PREVIEW_LENGTH]
+        return None
+
+    def _index_messages_for_search(
+        self,
+        conn: sqlite3.Connection,
+        session_id: str,
+        messages: List[StoredMessage],
+        start_index: int,
+        replace: bool,
+    ):
+        """Add messages to the full-text index (replacing the session's rows)."""
+        if not self.enable_full_text_search:
+            return
+        if replace:
+            conn.execute(
+                "DELETE FROM messages_fts WHERE rowid IN "
+                "(SELECT id FROM search_documents WHERE session_id = ?)",
+                (session_id,),
+            )
+            conn.execute(
+                "DELETE FROM search_documents WHERE session_id = ?", (session_id,)
+            )
+        for i, msg in enumerate(messages, start=start_index):
+            if msg.role == "system":
+                continue
+            cursor = conn.execute(
+                "INSERT INTO search_documents (session_id, message_index, role)"
+                " VALUES (?, ?, ?)",
+                (session_id, i, msg.role),
+            )
+            conn.execute(
+                "INSERT INTO messages_fts (rowid, content) VALUES (?, ?)",
+                (cursor.lastrowid, msg.content),
+            )
+
+    def _backfill_search_index(self):
+        """Index sessions saved before the full-text index existed."""
+        with self._transaction() as conn:
+            session_ids = [
+                row[0] for row in conn.execute("SELECT session_id FROM sessions")
+            ]
+        for session_id in session_ids:
+            try:
+                with self._transaction() as conn:
+                    if conn.execute(
+                        "SELECT 1 FROM search_documents WHERE session_id = ? LIMIT 1",
+                        (session_id,),
+                    ).fetchone():
+                        continue
+                    self._index_messages_for_search(
+                        conn,
+                        session_id,
+                        self.load_session(session_id),
+                        0,
+                        replace=False,
+                    )
+            except Exception:
+                continue
+
+    @staticmethod
+    def _stored_message_hash(msg: StoredMessage) -> str:
+        return hashlib.sha1(f"{msg.role}\0{msg.content}".encode("utf-8")).hexdigest()
+
+    def _index_messages_in_chromadb(
+        self,
+        session_id: str,
+        messages: List[StoredMessage],
+        agent_name: str,
+        start_index: int = 0,
+    ):
+        """Queue messages that aren't embedded yet for semantic search indexing.
+
+        Messages are keyed by a hash of their role and content, so a rewritten
+        log (e.g. after compaction) only embeds what actually changed. The
+        embedding itself runs in batches on a background thread.
+        `start_index` is the position of the first message in the session log.
+        """
         if not self.chroma_collection:
             return
 
         # Only index user and assistant messages (skip tool calls)
-        indexable = [msg for msg in messages if msg.role in ("user", "assistant")]
-        if not indexable:
+        candidates: Dict[str, tuple] = {}
+        for i, msg in enumerate(messages, start=start_index):
+            if msg.role in ("user", "assistant"):
+                candidates.setdefault(self._stored_message_hash(msg), (i, msg))
+        if not candidates:
             return
 
-        ids = [f"{session_id}_{i}" for i in range(len(indexable))]
-        documents = [msg.content for msg in indexable]
-        metadatas = [
-            {
-                "session_id": session_id,
-                "agent_name": agent_name,
-                "role": msg.role,
-                "timestamp": msg.timestamp,
-                "message_index": i
-            }
-            for i, msg in enumerate(indexable)
-        ]
+        hashes = list(candidates)
+        indexed = set()
+        with self._transaction() as conn:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for pos in range(0, len(hashes), 500):
+                chunk = hashes[pos:pos + 500]
+                placeholders = ",".join("?" * len(chunk))
+                indexed.update(
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT message_hash FROM indexed_messages "
+                        f"WHERE session_id = ? AND message_hash IN ({placeholders})",
+                        [session_id, *chunk],
+                    )
+                )
+
+        for message_hash in hashes:
+            if message_hash not in indexed:
+                index, msg = candidates[message_hash]
+                self._index_queue.put(
+                    (session_id, agent_name, message_hash, index, msg)
+                )
 
-        self.chroma_collection.add(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas
+        with self._lock:
+            if self._indexer_thread is None or not self._indexer_thread.is_alive():
+                self._indexer_thread = threading.Thread(
+                    target=self._run_indexer, name="chroma-indexer", daemon=True
+                )
+                self._indexer_thread.start()
+
+    def _run_indexer(self):
+        """Embed queued messages in batches until the process exits."""
+        while True:
+            batch = [self._index_queue.get()]
+            while len(batch) < CHROMA_INDEX_BATCH_SIZE:
+                try:
+                    batch.append(self._index_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._embed_batch(batch)
+            except Exception as e:
+                print(f"Warning: Failed to index in ChromaDB: {e}")
+            finally:
+                for _ in batch:
+                    self._index_queue.task_done()
+
+    def _embed_batch(self, batch: List[tuple]):
+        """Upsert one batch into ChromaDB and record the hashes as embedded."""
+        entries = {
+            f"{session_id}_{message_hash}": (
+                session_id,
+                agent_name,
+                message_hash,
+                index,
+                msg,
+            )
+            for session_id, agent_name, message_hash, index, msg in batch
+        }
+        self.chroma_collection.upsert(
+            ids=list(entries),
+            documents=[entry[4].content for entry in entries.values()],
+            metadatas=[
+                {
+                    "session_id": session_id,
+                    "agent_name": agent_name,
+                    "role": msg.role,
+                    "timestamp": msg.timestamp,
+                    "message_index": index,
+                }
+                for session_id, agent_name, _, index, msg in entries.values()
+            ],
         )
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO indexed_messages (session_id, message_hash)"
+                " VALUES (?, ?)",
+                [
+                    (session_id, message_hash)
+                    for session_id, _, message_hash, _, _ in entries.values()
+                ],
+            )
+
+    def flush_index(self):
+        """Wait until every queued message has been embedded."""
+        self._index_queue.join()
 
     def load_session(self, session_id: str) -> List[StoredMessage]:
-        """Load a session from JSON storage.
+        """Load a session from its JSONL message log (or a legacy JSON file).
 
         Args:
             session_id: Session identifier
@@ -309,6 +882,26 @@ class HybridStorage:
         Raises:
             FileNotFoundError: If session doesn't exist
         """
+        log_path = self._log_path(session_id)
+        if log_path.exists():
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT log_size FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                with log_path.open('rb') as f:
+                    # Only the committed part of the log; anything past it is
+                    # an append that never completed
+                    data = f.read(row[0]) if row and row[0] else f.read()
+
+            stored = []
+            for line in data.decode('utf-8', errors='replace').splitlines():
+                try:
+                    stored.append(StoredMessage.from_dict(json.loads(line)))
+                except (ValueError, TypeError):
+                    # Torn write at the end of the log; keep what came before
+                    break
+            return stored
+
         json_path = self.json_dir / f"{session_id}.json"
         if not json_path.exists():
             raise FileNotFoundError(f"Session '{session_id}' not found")
@@ -318,6 +911,103 @@ class HybridStorage:
 
         return [StoredMessage.from_dict(msg_data) for msg_data in data]
 
+    def load_messages(
+        self,
+        session_id: str,
+        tail: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> List[Any]:
+        """Load the complete pydantic-ai messages of a session.
+
+        Only the frames that are asked for are read and decoded. With `tail`, the
+        last `tail` messages are returned, and with `max_tokens` the most recent
+        messages that fit roughly that many tokens; either way they are preceded
+        by the first message (which carries the system prompt) if it isn't among
+        them. The tail is extended back as far as needed for every tool return
+        in it to have its tool call, since the model API rejects a return
+        without its call.
+
+        Args:
+            session_id: Session identifier
+            tail: Number of most recent messages to load (default: all)
+            max_tokens: Token budget for the loaded messages (default: no limit)
+
+        Returns:
+            List of ModelMessage objects
+
+        Raises:
+            FileNotFoundError: If the session has no full-fidelity messages
+        """
+        from pydantic_ai.messages import ModelMessagesTypeAdapter
+
+        with self._lock:
+            rows, frames = self._read_frames(session_id, tail, max_tokens)
+        if not rows:
+            raise FileNotFoundError(f"Session '{session_id}' has no stored messages")
+
+        # Validate everything in one go rather than message by message
+        return ModelMessagesTypeAdapter.validate_json(b"[" + b",".join(frames) + b"]")
+
+    def _read_frames(
+        self, session_id: str, tail: Optional[int], max_tokens: Optional[int]
+    ):
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT offset, length FROM session_messages"
+                " WHERE session_id = ? ORDER BY seq",
+                (session_id,),
+            ).fetchall()
+        if not rows:
+            return rows, []
+
+        with self._messages_path(session_id).open("rb") as f:
+            if tail is None and max_tokens is None:
+                return rows, [self._read_frame(f, *row) for row in rows]
+
+            # Walk back from the end until the tail is read (at least the last
+            # message) and every tool return in it has been matched with its
+            # tool call. Tokens are estimated at roughly three characters
+            # each, as the agents do.
+            first = self._read_frame(f, *rows[0])
+            tokens = len(first) // 3
+            frames = []
+            unmatched_returns = set()
+            start = len(rows)
+            while start > 1 and (
+                unmatched_returns
+                or (
+                    (tail is None or len(rows) - start < tail)
+                    and (
+                        max_tokens is None
+                        or tokens < max_tokens
+                        or start == len(rows)
+                    )
+                )
+            ):
+                start -= 1
+                frame = self._read_frame(f, *rows[start])
+                tokens += len(frame) // 3
+                frames.append(frame)
+                for part in json.loads(frame).get("parts", []):
+                    tool_call_id = part.get("tool_call_id")
+                    if not tool_call_id:
+                        continue
+                    if part.get("part_kind") == "tool-call":
+                        unmatched_returns.discard(tool_call_id)
+                    else:
+                        unmatched_returns.add(tool_call_id)
+            frames.append(first)
+        frames.reverse()
+        return rows, frames
+
+    def _read_frame(self, f, offset: int, length: int) -> bytes:
+        f.seek(offset)
+        frame = zlib.decompress(f.read(length))
+        if BLOB_REF_KEY.encode() in frame:
+            data = self.blob_store.internalize(json.loads(frame))
+            frame = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        return frame
+
     def get_session_metadata(self, session_id: str) -> Optional[SessionMetadata]:
         """Get metadata for a session from SQLite.
 
@@ -327,8 +1017,7 @@ class HybridStorage:
         Returns:
             SessionMetadata or None if not found
         """
-        conn = sqlite3.connect(str(self.db_path))
-        try:
+        with self._transaction() as conn:
             cursor = conn.execute(
                 "SELECT * FROM sessions WHERE session_id = ?",
                 (session_id,)
@@ -346,8 +1035,62 @@ class HybridStorage:
                 total_tokens=row[5],
                 auto_saved=bool(row[6])
             )
-        finally:
-            conn.close()
+
+    def count_sessions(self, auto_saved_only: bool = False) -> int:
+        """Number of sessions (optionally only autosaved ones)."""
+        query = "SELECT COUNT(*) FROM sessions"
+        if auto_saved_only:
+            query += " WHERE auto_saved = 1"
+        with self._transaction() as conn:
+            return conn.execute(query).fetchone()[0]
+
+    def list_recent_sessions(
+        self, offset: int = 0, limit: int = 50, auto_saved_only: bool = False
+    ) -> List[SessionMetadata]:
+        """One page of sessions, most recently updated first, with previews.
+
+        Served from the updated_at index, so paging through thousands of
+        sessions never touches the message logs.
+        """
+        query = """
+            SELECT session_id, agent_name, created_at, updated_at, message_count,
+                   total_tokens, auto_saved, preview
+            FROM sessions
+        """
+        if auto_saved_only:
+            query += " WHERE auto_saved = 1"
+        query += " ORDER BY updated_at DESC LIMIT ? OFFSET ?"
+
+        with self._transaction() as conn:
+            rows = conn.execute(query, (limit, offset)).fetchall()
+
+        return [
+            SessionMetadata(
+                session_id=row[0],
+                agent_name=row[1],
+                created_at=datetime.fromisoformat(row[2]),
+                updated_at=datetime.fromisoformat(row[3]),
+                message_count=row[4],
+                total_tokens=row[5],
+                auto_saved=bool(row[6]),
+                preview=row[7],
+            )
+            for row in rows
+        ]
+
+    def load_preview(self, session_id: str) -> Optional[str]:
+        """Compute (and remember) the preview of a session saved without one."""
+        try:
+            preview = self._preview(self.load_session(session_id))
+        except FileNotFoundError:
+            return None
+        if preview:
+            with self._transaction() as conn:
+                conn.execute(
+                    "UPDATE sessions SET preview = ? WHERE session_id = ?",
+                    (preview, session_id),
+                )
+        return preview
 
     def list_sessions(
         self,
@@ -365,8 +1108,7 @@ class HybridStorage:
         Returns:
             List of SessionMetadata objects
         """
-        conn = sqlite3.connect(str(self.db_path))
-        try:
+        with self._transaction() as conn:
             query = "SELECT * FROM sessions WHERE 1=1"
             params = []
 
@@ -395,8 +1137,6 @@ class HybridStorage:
                 )
                 for row in rows
             ]
-        finally:
-            conn.close()
 
     def semantic_search(
         self,
@@ -438,6 +1178,69 @@ class HybridStorage:
 
         return output
 
+    def search_messages(
+        self,
+        query: str,
+        limit: int = 20,
+        agent_name: Optional[str] = None,
+        highlight: Tuple[str, str] = ("**", "**"),
+        exclude_session_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search saved messages by keyword using the local full-text index.
+
+        Every word of the query must match (stemmed, case-insensitive); words
+        are taken literally, not as FTS5 query syntax.
+
+        Args:
+            query: Search words
+            limit: Maximum number of results
+            agent_name: Filter by agent name (optional)
+            highlight: Markers placed around matched words in the snippet
+            exclude_session_id: Session to leave out of the results (optional)
+
+        Returns:
+            List of matches, best first, with session_id, agent_name,
+            updated_at, role, message_index, snippet and score
+        """
+        terms = query.split()
+        if not self.enable_full_text_search or not terms:
+            return []
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+        sql = """
+            SELECT d.session_id, s.agent_name, s.updated_at, d.role, d.message_index,
+                   snippet(messages_fts, 0, ?, ?, '...', 16), bm25(messages_fts)
+            FROM messages_fts
+            JOIN search_documents d ON d.id = messages_fts.rowid
+            JOIN sessions s ON s.session_id = d.session_id
+            WHERE messages_fts MATCH ?
+        """
+        params: List[Any] = [highlight[0], highlight[1], match]
+        if agent_name:
+            sql += " AND s.agent_name = ?"
+            params.append(agent_name)
+        if exclude_session_id:
+            sql += " AND d.session_id != ?"
+            params.append(exclude_session_id)
+        sql += " ORDER BY bm25(messages_fts) LIMIT ?"
+        params.append(limit)
+
+        with self._transaction() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        return [
+            {
+                'session_id': row[0],
+                'agent_name': row[1],
+                'updated_at': datetime.fromisoformat(row[2]),
+                'role': row[3],
+                'message_index': row[4],
+                'snippet': row[5],
+                'score': row[6],
+            }
+            for row in rows
+        ]
+
     def cleanup_old_sessions(self, max_sessions: int) -> List[str]:
         """Delete old sessions, keeping only the most recent ones.
 
@@ -447,8 +1250,7 @@ class HybridStorage:
         Returns:
             List of deleted session IDs
         """
-        conn = sqlite3.connect(str(self.db_path))
-        try:
+        with self._transaction() as conn:
             # Get sessions to delete (oldest first)
             cursor = conn.execute("""
                 SELECT session_id FROM sessions
@@ -458,14 +1260,64 @@ class HybridStorage:
 
             to_delete = [row[0] for row in cursor.fetchall()]
 
-            # Delete from SQLite
-            for session_id in to_delete:
-                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        self.delete_sessions(to_delete)
+        return to_delete
+
+    def _session_files(self, session_id: str) -> List[Path]:
+        """Every file belonging to a session (some may not exist)."""
+        return [
+            self._log_path(session_id),
+            self._messages_path(session_id),
+            self.json_dir / f"{session_id}.json",
+            self.base_dir / f"{session_id}_meta.json",
+        ]
+
+    def session_disk_usage(self) -> List[Tuple[str, datetime, int]]:
+        """(session_id, updated_at, bytes on disk) for every session."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT session_id, updated_at FROM sessions"
+            ).fetchall()
+
+        usage = []
+        for session_id, updated_at in rows:
+            size = 0
+            for path in self._session_files(session_id):
+                try:
+                    size += path.stat().st_size
+                except OSError:
+                    pass
+            usage.append((session_id, datetime.fromisoformat(updated_at), size))
+        return usage
+
+    def delete_sessions(self, session_ids: List[str]) -> int:
+        """Delete sessions and all their files; returns the bytes freed."""
+        freed = 0
+        with self._transaction() as conn:
+            params = [(session_id,) for session_id in session_ids]
+            conn.executemany("DELETE FROM sessions WHERE session_id = ?", params)
+            conn.executemany(
+                "DELETE FROM session_messages WHERE session_id = ?", params
+            )
+            conn.executemany(
+                "DELETE FROM indexed_messages WHERE session_id = ?", params
+            )
+            if self.enable_full_text_search:
+                conn.executemany(
+                    "DELETE FROM messages_fts WHERE rowid IN "
+                    "(SELECT id FROM search_documents WHERE session_id = ?)",
+                    params,
+                )
+            conn.executemany(
+                "DELETE FROM search_documents WHERE session_id = ?", params
+            )
 
-                # Delete JSON file
-                json_path = self.json_dir / f"{session_id}.json"
-                if json_path.exists():
-                    json_path.unlink()
+            for session_id in session_ids:
+                # Delete message files, the legacy JSON file and saved metadata
+                for path in self._session_files(session_id):
+                    if path.exists():
+                        freed += path.stat().st_size
+                        path.unlink()
 
                 # Delete from ChromaDB
                 if self.enable_semantic_search and self.chroma_collection:
@@ -477,17 +1329,53 @@ class HybridStorage:
                     except Exception:
                         pass
 
-            conn.commit()
-            return to_delete
-        finally:
-            conn.close()
+        return freed
+
+    def referenced_blobs(self) -> set:
+        """Digests of every blob referenced by a stored message."""
+        with self._transaction() as conn:
+            session_ids = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT DISTINCT session_id FROM session_messages"
+                )
+            ]
+
+        referenced = set()
+        for session_id in session_ids:
+            with self._transaction() as conn:
+                frames = conn.execute(
+                    "SELECT offset, length FROM session_messages WHERE session_id = ?",
+                    (session_id,),
+                ).fetchall()
+                try:
+                    data = self._messages_path(session_id).read_bytes()
+                except OSError:
+                    continue
+            for offset, length in frames:
+                try:
+                    frame = zlib.decompress(data[offset:offset + length])
+                except zlib.error:
+                    continue
+                referenced.update(
+                    digest.decode("ascii")
+                    for digest in _BLOB_REF_PATTERN.findall(frame)
+                )
+        return referenced
+
+
+_storage_cache: Dict[Tuple[Path, bool], HybridStorage] = {}
+_storage_cache_lock = threading.Lock()
 
 
 def create_storage(
     base_dir: Path,
     enable_semantic_search: bool = False
 ) -> HybridStorage:
-    """Create a hybrid storage instance.
+    """Get the hybrid storage instance for a directory, creating it on first use.
+
+    Instances are cached per base directory, so the schema is initialized and
+    the SQLite connection opened only once per process.
 
     Args:
         base_dir: Base directory for storage
@@ -496,4 +1384,10 @@ def create_storage(
     Returns:
         HybridStorage instance
     """
-    return HybridStorage(base_dir, enable_semantic_search)
+    key = (Path(base_dir).expanduser().resolve(), enable_semantic_search)
+    with _storage_cache_lock:
+        storage = _storage_cache.get(key)
+        if storage is None:
+            storage = HybridStorage(base_dir, enable_semantic_search)
+            _storage_cache[key] = storage
+        return storage
@@ -408,6 +408,12 @@ async def interactive_mode(message_renderer, initial_command: str = None) -> Non
     emit_system_message(
         "[dim]Use [bold blue]/diff[/bold blue] to configure diff highlighting colors for file changes.[/dim]"
     )
+
+    # Trim old sessions to the retention budgets without delaying startup
+    from ticca.session_retention import start_retention_sweep
+
+    start_retention_sweep()
+
     try:
         from ticca.command_line.motd import print_motd
 
@@ -666,9 +672,13 @@ async def run_prompt_with_attachments(
     *,
     spinner_console=None,
     use_spinner: bool = True,
+    **run_kwargs,
 ):
     """Run the agent after parsing CLI attachments for image/document support.
 
+    Extra keyword arguments (e.g. ``event_stream_handler``) are passed on to
+    ``agent.run_with_mcp``.
+
     Returns:
         tuple: (result, task) where result is the agent response and task is the asyncio task
     """
@@ -706,6 +716,7 @@ async def run_prompt_with_attachments(
             processed_prompt.prompt,
             attachments=attachments,
             link_attachments=link_attachments,
+            **run_kwargs,
         )
     )
 
@@ -735,20 +746,33 @@ async def execute_single_prompt(prompt: str, message_renderer) -> None:
     emit_info(f"[bold blue]Executing prompt:[/bold blue] {prompt}")
 
     try:
+        from rich.markup import escape
+
+        from ticca.agents.response_stream import ResponseStream
+        from ticca.messaging import emit_agent_response
+
         # Get agent through runtime manager and use helper for attachments
         agent = get_current_agent()
-        response = await run_prompt_with_attachments(
+        # Show each complete markdown block of the response as it is generated
+        response_stream = ResponseStream(
+            lambda text, new_block: emit_agent_response(text.strip("\n")),
+            lambda tool_name: emit_system_message(
+                f"[dim]🔧 {escape(tool_name)}[/dim]"
+            ),
+            markdown_blocks=True,
+        )
+        response, _ = await run_prompt_with_attachments(
             agent,
             prompt,
             spinner_console=message_renderer.console,
+            event_stream_handler=response_stream,
         )
         if response is None:
             return
 
         agent_response = response.output
-        from ticca.messaging import emit_agent_response
-
-        emit_agent_response(agent_response)
+        if not response_stream.shows(agent_response):
+            emit_agent_response(agent_response)
 
     except asyncio.CancelledError:
         from ticca.messaging import emit_warning
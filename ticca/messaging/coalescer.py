@@ -0,0 +1,78 @@
+"""
+Coalescing of bursts of small messages.
+
+Tools emit output line by line into one message_group (grep matches, shell
+output, MCP server stderr). Consecutive messages of the same group and type
+that are emitted within a short window are merged into one message before
+they are dispatched, so renderers do work per batch rather than per line.
+"""
+
+from typing import TYPE_CHECKING, Deque, Optional
+
+from rich.text import Text
+
+if TYPE_CHECKING:
+    from .message_queue import UIMessage
+
+# Longest time (in seconds) grouped messages are held back to absorb more lines
+COALESCE_WINDOW = 0.03
+
+
+def message_group(message: "UIMessage") -> Optional[str]:
+    return message.metadata.get("message_group") if message.metadata else None
+
+
+def merge_messages(target: "UIMessage", message: "UIMessage") -> bool:
+    """Append `message`'s content to `target` if they can be shown as one.
+
+    Only messages of the same type and message_group with string or Text
+    content are merged. Returns True if `target` now includes `message`.
+    """
+    group = message_group(target)
+    if (
+        group is None
+        or target.type != message.type
+        or message_group(message) != group
+        or not isinstance(target.content, (str, Text))
+        or not isinstance(message.content, (str, Text))
+    ):
+        return False
+
+    if isinstance(target.content, str) and isinstance(message.content, str):
+        target.content = f"{target.content}\n{message.content}"
+    else:
+        content = (
+            target.content.copy()
+            if isinstance(target.content, Text)
+            else Text(target.content)
+        )
+        content.append("\n")
+        content.append(message.content)
+        target.content = content
+    return True
+
+
+class MessageCoalescer:
+    """Merges consecutive same-group, same-type messages within `window` seconds."""
+
+    def __init__(self, window: float = COALESCE_WINDOW):
+        self.window = window
+
+    def absorb(self, pending: Deque["UIMessage"], message: "UIMessage") -> bool:
+        """Merge `message` into the newest pending message if possible.
+
+        The window is measured from the first message merged into the pending
+        one, so merging never holds output back for longer than `window`.
+        """
+        if self.window <= 0 or not pending:
+            return False
+        last = pending[-1]
+        if (message.timestamp - last.timestamp).total_seconds() > self.window:
+            return False
+        return merge_messages(last, message)
+
+    def hold_time(self, message: "UIMessage") -> float:
+        """How long a newly queued message should wait for more lines."""
+        if self.window <= 0 or message_group(message) is None:
+            return 0.0
+        return self.window
@@ -6,15 +6,17 @@ but render them differently based on their capabilities.
 """
 
 import asyncio
-import queue
 import threading
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, Optional, Union
+from typing import Any, Deque, Dict, Optional, Union
 
 from rich.text import Text
 
+from .coalescer import COALESCE_WINDOW, MessageCoalescer, merge_messages, message_group
+
 
 class MessageType(Enum):
     """Types of messages that can be sent through the queue."""
@@ -61,30 +63,67 @@ class UIMessage:
             self.metadata = {}
 
 
-class MessageQueue:
-    """Thread-safe message queue for UI messages."""
+# What emit does when the queue already holds maxsize messages:
+# - "block": wait for the consumer to catch up (up to BLOCK_TIMEOUT seconds,
+#   then spill); never blocks the event loop thread itself
+# - "coalesce": merge into a queued message of the same message_group and
+#   type when possible, otherwise spill
+# - "spill": queue the message beyond maxsize
+OVERFLOW_POLICIES = ("block", "coalesce", "spill")
+BLOCK_TIMEOUT = 5.0
+
+
+@dataclass
+class QueueStats:
+    """Counters for messages that went through the queue."""
 
-    def __init__(self, maxsize: int = 1000):
-        self._queue = queue.Queue(maxsize=maxsize)
+    emitted: int = 0
+    delivered: int = 0
+    coalesced: int = 0
+    spilled: int = 0
+    blocked: int = 0
+
+
+class MessageQueue:
+    """Thread-safe message queue for UI messages.
+
+    Messages can be emitted from any thread. An async consumer (`get_async`)
+    gets them on its event loop: emitting schedules one drain per batch with
+    `call_soon_threadsafe`, and drains only hand over as many messages as the
+    consumer has room for. Synchronous consumers use `get`/`get_nowait`.
+    Messages are never dropped; see OVERFLOW_POLICIES for what happens when
+    the consumer falls behind.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        overflow_policy: str = "coalesce",
+        coalesce_window: float = COALESCE_WINDOW,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self._maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self._pending: Deque[UIMessage] = deque()
+        self._cond = threading.Condition()
+        self._drain_scheduled = False
+        self._drain_delayed = False
+        self._coalescer = MessageCoalescer(coalesce_window)
         self._async_queue = None  # Will be created when needed
-        self._async_queue_maxsize = maxsize
+        self._event_loop = None  # Store reference to the event loop
+        self._loop_thread_id = None
         self._listeners = []
         self._running = False
-        self._thread = None
         self._startup_buffer = []  # Buffer messages before any renderer starts
         self._has_active_renderer = False
-        self._event_loop = None  # Store reference to the event loop
         self._prompt_responses = {}  # Store responses to human input requests
         self._prompt_id_counter = 0  # Counter for unique prompt IDs
+        self.stats = QueueStats()
 
     def start(self):
         """Start the queue processing."""
-        if self._running:
-            return
-
         self._running = True
-        self._thread = threading.Thread(target=self._process_messages, daemon=True)
-        self._thread.start()
 
     def get_buffered_messages(self):
         """Get all currently buffered messages without waiting."""
@@ -92,12 +131,10 @@ class MessageQueue:
         messages = list(self._startup_buffer)
 
         # Then get any queued messages
-        while True:
-            try:
-                message = self._queue.get_nowait()
-                messages.append(message)
-            except queue.Empty:
-                break
+        with self._cond:
+            messages.extend(self._pending)
+            self._pending.clear()
+            self._cond.notify_all()
         return messages
 
     def clear_startup_buffer(self):
@@ -107,8 +144,9 @@ class MessageQueue:
     def stop(self):
         """Stop the queue processing."""
         self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=1.0)
+        with self._cond:
+            # Wake consumers blocked in get() and producers blocked in emit()
+            self._cond.notify_all()
 
     def emit(self, message: UIMessage):
         """Emit a message to the queue."""
@@ -117,15 +155,95 @@ class MessageQueue:
             self._startup_buffer.append(message)
             return
 
+        with self._cond:
+            self.stats.emitted += 1
+            # Bursts of lines for the same message group go out as one message
+            if self._coalescer.absorb(self._pending, message):
+                self.stats.coalesced += 1
+                return
+            if len(self._pending) >= self._maxsize and self._handle_overflow(message):
+                return
+            self._pending.append(message)
+            self._cond.notify()
+            self._schedule_drain(self._coalescer.hold_time(message))
+
+    def _handle_overflow(self, message: UIMessage) -> bool:
+        """Apply the overflow policy; returns True if `message` was absorbed.
+
+        Called with the lock held, when the queue is full.
+        """
+        if self.overflow_policy == "coalesce":
+            group = message_group(message)
+            if group is not None:
+                # Merge into the newest queued message of the same group
+                for queued in reversed(self._pending):
+                    if message_group(queued) == group:
+                        if merge_messages(queued, message):
+                            self.stats.coalesced += 1
+                            return True
+                        break
+        elif (
+            self.overflow_policy == "block"
+            and threading.get_ident() != self._loop_thread_id
+        ):
+            self.stats.blocked += 1
+            self._cond.wait_for(
+                lambda: len(self._pending) < self._maxsize or not self._running,
+                timeout=BLOCK_TIMEOUT,
+            )
+            if len(self._pending) < self._maxsize:
+                return False
+
+        self.stats.spilled += 1
+        return False
+
+    def _schedule_drain(self, delay: float = 0.0):
+        """Ask the event loop to drain pending messages (lock held).
+
+        A drain delayed to give a message time to absorb more lines is
+        brought forward when a message that mustn't wait is queued.
+        """
+        if self._event_loop is None:
+            return
+        if self._drain_scheduled and (delay or not self._drain_delayed):
+            return
         try:
-            self._queue.put_nowait(message)
-        except queue.Full:
-            # Drop oldest message to make room
-            try:
-                self._queue.get_nowait()
-                self._queue.put_nowait(message)
-            except queue.Empty:
-                pass
+            if delay:
+                self._event_loop.call_soon_threadsafe(self._drain_later, delay)
+            else:
+                self._event_loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # Event loop is closed; messages stay queued for sync consumers
+            return
+        self._drain_scheduled = True
+        self._drain_delayed = bool(delay)
+
+    def _drain_later(self, delay: float):
+        self._event_loop.call_later(delay, self._drain)
+
+    def _drain(self):
+        """Move pending messages to the async consumer (runs on the event loop)."""
+        with self._cond:
+            self._drain_scheduled = False
+            self._drain_delayed = False
+            room = self._maxsize - self._async_queue.qsize()
+            batch = [
+                self._pending.popleft()
+                for _ in range(max(0, min(room, len(self._pending))))
+            ]
+            if batch:
+                # Wake producers waiting for room
+                self._cond.notify_all()
+
+        for message in batch:
+            self._async_queue.put_nowait(message)
+            # Notify listeners of each delivered message
+            for listener in self._listeners:
+                try:
+                    listener(message)
+                except Exception:
+                    pass  # Don't let listener errors break processing
+        self.stats.delivered += len(batch)
 
     def emit_simple(self, message_type: MessageType, content: Any, **metadata):
         """Emit a simple message with just type and content."""
@@ -134,47 +252,35 @@ class MessageQueue:
 
     def get_nowait(self) -> Optional[UIMessage]:
         """Get a message without blocking."""
-        try:
-            return self._queue.get_nowait()
-        except queue.Empty:
-            return None
+        return self.get(timeout=0)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[UIMessage]:
+        """Wait for a message; returns None on timeout or when the queue stops."""
+        with self._cond:
+            if timeout != 0:
+                self._cond.wait_for(
+                    lambda: self._pending or not self._running, timeout=timeout
+                )
+            if not self._pending:
+                return None
+            message = self._pending.popleft()
+            self.stats.delivered += 1
+            self._cond.notify_all()
+            return message
 
     async def get_async(self) -> UIMessage:
         """Get a message asynchronously."""
         # Lazy initialization of async queue and store event loop reference
         if self._async_queue is None:
-            self._async_queue = asyncio.Queue(maxsize=self._async_queue_maxsize)
+            self._async_queue = asyncio.Queue()
             self._event_loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+        # Messages emitted before the loop was known, or left behind because
+        # the consumer was full, are picked up here
+        if not self._drain_scheduled:
+            self._drain()
         return await self._async_queue.get()
 
-    def _process_messages(self):
-        """Process messages from sync to async queue."""
-        while self._running:
-            try:
-                message = self._queue.get(timeout=0.1)
-
-                # Try to put in async queue if we have an event loop reference
-                if self._event_loop is not None and self._async_queue is not None:
-                    # Use thread-safe call to put message in async queue
-                    # Create a bound method to avoid closure issues
-                    try:
-                        self._event_loop.call_soon_threadsafe(
-                            self._async_queue.put_nowait, message
-                        )
-                    except Exception:
-                        # Handle any errors with the async queue operation
-                        pass
-
-                # Notify listeners immediately for sync processing
-                for listener in self._listeners:
-                    try:
-                        listener(message)
-                    except Exception:
-                        pass  # Don't let listener errors break processing
-
-            except queue.Empty:
-                continue
-
     def add_listener(self, callback):
         """Add a listener for messages (for direct sync consumption)."""
         self._listeners.append(callback)
@@ -251,7 +357,11 @@ def get_global_queue() -> MessageQueue:
 
     with _queue_lock:
         if _global_queue is None:
-            _global_queue = MessageQueue()
+            from ticca.config import get_message_queue_overflow_policy
+
+            _global_queue = MessageQueue(
+                overflow_policy=get_message_queue_overflow_policy()
+            )
             _global_queue.start()
 
     return _global_queue
@@ -52,19 +52,11 @@ class QueueConsole:
             processed_values = []
             for v in values:
                 if hasattr(v, "__rich_console__"):
-                    # For Rich objects, try to extract their text content
-                    from io import StringIO
-
-                    from rich.console import Console
-
-                    string_io = StringIO()
-                    # Use markup=True to properly process rich styling
-                    # Use a reasonable width to prevent wrapping issues
-                    temp_console = Console(
-                        file=string_io, width=80, legacy_windows=False, markup=True
-                    )
-                    temp_console.print(v)
-                    processed_values.append(string_io.getvalue().rstrip("\n"))
+                    # For Rich objects, extract their text content (cached);
+                    # markup=True to properly process rich styling
+                    from .rich_text import render_to_text
+
+                    processed_values.append(render_to_text(v, markup=True))
                 else:
                     processed_values.append(str(v))
 
@@ -8,13 +8,13 @@ appropriately for their respective interfaces.
 import asyncio
 import threading
 from abc import ABC, abstractmethod
-from io import StringIO
 from typing import Optional
 
 from rich.console import Console
 from rich.markdown import Markdown
 
 from .message_queue import MessageQueue, MessageType, UIMessage
+from .rich_text import render_to_text
 
 
 class MessageRenderer(ABC):
@@ -56,10 +56,8 @@ class MessageRenderer(ABC):
         """Consume messages from the queue."""
         while self._running:
             try:
-                message = await asyncio.wait_for(self.queue.get_async(), timeout=0.1)
+                message = await self.queue.get_async()
                 await self.render_message(message)
-            except asyncio.TimeoutError:
-                continue
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -186,14 +184,8 @@ class TUIRenderer(MessageRenderer):
 
         # Convert content to string for TUI display (for all other cases)
         if hasattr(message.content, "__rich_console__"):
-            # For Rich objects, render to plain text using a Console
-            string_io = StringIO()
-            # Use markup=False to prevent interpretation of square brackets as markup
-            temp_console = Console(
-                file=string_io, width=80, legacy_windows=False, markup=False
-            )
-            temp_console.print(message.content)
-            content_str = string_io.getvalue().rstrip("\n")
+            # For Rich objects, render to plain text (cached)
+            content_str = render_to_text(message.content)
         else:
             content_str = str(message.content)
 
@@ -282,9 +274,9 @@ class SynchronousInteractiveRenderer:
     async/await consistently and use InteractiveRenderer instead.
 
     Current responsibilities:
-    - Consumes messages from the queue in a background thread
+    - Consumes messages from the queue in a background thread as soon as they are
+      emitted
     - Renders messages to the console in real-time without requiring async code
-    - Registers as a direct listener to the message queue for immediate processing
     """
 
     def __init__(self, queue: MessageQueue, console: Optional[Console] = None):
@@ -301,8 +293,6 @@ class SynchronousInteractiveRenderer:
         self._running = True
         # Mark the queue as having an active renderer
         self.queue.mark_renderer_active()
-        # Add ourselves as a listener for immediate processing
-        self.queue.add_listener(self._render_message)
         self._thread = threading.Thread(target=self._consume_messages, daemon=True)
         self._thread.start()
 
@@ -311,22 +301,17 @@ class SynchronousInteractiveRenderer:
         self._running = False
         # Mark the queue as having no active renderer
         self.queue.mark_renderer_inactive()
-        # Remove ourselves as a listener
-        self.queue.remove_listener(self._render_message)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=1.0)
 
     def _consume_messages(self):
         """Consume messages synchronously."""
         while self._running:
-            message = self.queue.get_nowait()
+            # Returns as soon as a message arrives; the timeout only bounds
+            # how long stop() waits for this thread
+            message = self.queue.get(timeout=0.5)
             if message:
                 self._render_message(message)
-            else:
-                # No messages, sleep briefly
-                import time
-
-                time.sleep(0.01)
 
     def _render_message(self, message: UIMessage):
         """Render a message using Rich console."""
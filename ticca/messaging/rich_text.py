@@ -0,0 +1,93 @@
+"""
+Cached plain-text rendering of Rich objects.
+
+Tables, syntax blocks and markdown shown in the TUI are often rendered to
+text. Rendering goes through one reusable capture console per thread, and
+results are cached per width: Text and Markdown by their content, other
+objects by identity (so they must not be changed once they are displayed).
+Strings inside them (e.g. table cells) are only parsed as console markup
+when asked for, as QueueConsole does.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from io import StringIO
+from typing import Any, Hashable, Optional, Tuple
+
+from rich.console import Console
+from rich.markdown import Markdown
+from rich.text import Text
+
+RENDER_CACHE_SIZE = 256
+
+_local = threading.local()
+_cache: "OrderedDict[Hashable, Tuple[Optional[weakref.ref], str]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _capture_console(markup: bool = False) -> Console:
+    consoles = getattr(_local, "consoles", None)
+    if consoles is None:
+        consoles = _local.consoles = {}
+    console = consoles.get(markup)
+    if console is None:
+        console = Console(
+            file=StringIO(), width=80, legacy_windows=False, markup=markup
+        )
+        consoles[markup] = console
+    return console
+
+
+def _cache_key(renderable: Any, width: int, markup: bool) -> Hashable:
+    if isinstance(renderable, Text):
+        return (
+            "text",
+            renderable.plain,
+            tuple(renderable.spans),
+            renderable.style,
+            width,
+            markup,
+        )
+    if isinstance(renderable, Markdown):
+        return ("markdown", renderable.markup, renderable.code_theme, width, markup)
+    return ("id", id(renderable), width, markup)
+
+
+def render_to_text(renderable: Any, width: int = 80, markup: bool = False) -> str:
+    """Render a Rich object to plain text `width` columns wide.
+
+    With markup=False, square brackets in strings inside `renderable` are
+    left alone; with markup=True they are parsed as console markup.
+    """
+    key = _cache_key(renderable, width, markup)
+    with _cache_lock:
+        cached = _cache.get(key)
+        # An identity entry may belong to a collected object whose id was reused
+        if cached is not None and (cached[0] is None or cached[0]() is renderable):
+            _cache.move_to_end(key)
+            return cached[1]
+
+    console = _capture_console(markup)
+    console.width = width
+    with console.capture() as capture:
+        console.print(renderable)
+    text = capture.get().rstrip("\n")
+
+    ref = None
+    if key[0] == "id":
+        try:
+            ref = weakref.ref(renderable)
+        except TypeError:
+            return text
+    with _cache_lock:
+        _cache[key] = (ref, text)
+        _cache.move_to_end(key)
+        while len(_cache) > RENDER_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return text
+
+
+def clear_render_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
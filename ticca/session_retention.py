@@ -0,0 +1,292 @@
+"""Retention budgets for saved sessions.
+
+Autosaves, saved contexts and sub-agent sessions all accumulate under
+``~/.ticca``. A retention sweep enforces a session count per store plus an age
+and a total disk budget shared by the stores, evicting the least recently
+updated sessions first. Saved contexts are named by the user, so by default
+they are exempt from the age and disk budgets (and don't count towards the
+latter). Blobs no surviving session references are removed afterwards.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ticca.blob_store import get_blob_store
+from ticca.hybrid_storage import create_storage
+
+# Sessions updated this recently are never evicted (they may still be in use,
+# possibly by another ticca process)
+RECENT_SESSION_GRACE = timedelta(minutes=10)
+
+
+@dataclass(slots=True)
+class SessionUsage:
+    store: str
+    session_id: str
+    updated_at: datetime
+    size: int
+
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    # Per store; a missing or 0 entry means no count limit
+    max_sessions: Dict[str, int] = field(default_factory=dict)
+    max_bytes: int = 0
+    max_age: Optional[timedelta] = None
+    # Stores whose sessions the age and size budgets leave alone
+    exempt_stores: frozenset = frozenset()
+
+
+@dataclass(slots=True)
+class RetentionReport:
+    evicted: Dict[str, List[str]] = field(default_factory=dict)
+    bytes_reclaimed: int = 0
+    blobs_removed: int = 0
+
+    @property
+    def sessions_evicted(self) -> int:
+        return sum(len(ids) for ids in self.evicted.values())
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class HybridSessionStore:
+    """Sessions kept in a HybridStorage directory (autosaves, contexts)."""
+
+    def __init__(self, name: str, base_dir: Path):
+        self.name = name
+        self.base_dir = Path(base_dir)
+
+    def _storage(self):
+        return create_storage(self.base_dir)
+
+    def usage(self) -> List[SessionUsage]:
+        if not (self.base_dir / "sessions.db").exists():
+            return []
+        return [
+            SessionUsage(self.name, session_id, _as_utc(updated_at), size)
+            for session_id, updated_at, size in self._storage().session_disk_usage()
+        ]
+
+    def evict(self, session_ids: List[str]) -> int:
+        return self._storage().delete_sessions(session_ids)
+
+    def referenced_blobs(self) -> set:
+        if not (self.base_dir / "sessions.db").exists():
+            return set()
+        return self._storage().referenced_blobs()
+
+
+class SubagentSessionStore(HybridSessionStore):
+    """Sub-agent sessions: ``<id>.jsonl`` logs with ``<id>.txt`` metadata.
+
+    Sessions from before the JSONL logs live in a HybridStorage in the same
+    directory and are handled by the base class.
+    """
+
+    def usage(self) -> List[SessionUsage]:
+        usage = {entry.session_id: entry for entry in super().usage()}
+        for path in self.base_dir.glob("*.jsonl"):
+            session_id = path.stem
+            size = 0
+            updated_at = 0.0
+            for file in (path, path.with_suffix(".txt")):
+                try:
+                    stat = file.stat()
+                except OSError:
+                    continue
+                size += stat.st_size
+                updated_at = max(updated_at, stat.st_mtime)
+            updated = datetime.fromtimestamp(updated_at, timezone.utc)
+            legacy = usage.get(session_id)
+            if legacy:
+                size += legacy.size
+                updated = max(updated, legacy.updated_at)
+            usage[session_id] = SessionUsage(self.name, session_id, updated, size)
+        return list(usage.values())
+
+    def evict(self, session_ids: List[str]) -> int:
+        freed = 0
+        if (self.base_dir / "sessions.db").exists():
+            freed += super().evict(session_ids)
+        for session_id in session_ids:
+            for suffix in (".jsonl", ".txt"):
+                path = self.base_dir / f"{session_id}{suffix}"
+                try:
+                    freed += path.stat().st_size
+                    path.unlink()
+                except OSError:
+                    pass
+        return freed
+
+
+def select_evictions(
+    usage: List[SessionUsage],
+    policy: RetentionPolicy,
+    now: datetime,
+    protected: frozenset = frozenset(),
+) -> List[SessionUsage]:
+    """Pick the sessions to evict, least recently updated first.
+
+    Sessions that are protected or were updated within RECENT_SESSION_GRACE
+    are kept even if that leaves a budget exceeded.
+    """
+
+    def evictable(entry: SessionUsage) -> bool:
+        return (
+            entry.store,
+            entry.session_id,
+        ) not in protected and now - entry.updated_at > RECENT_SESSION_GRACE
+
+    newest_first = sorted(usage, key=lambda entry: entry.updated_at, reverse=True)
+    evicted = []
+    kept = []
+    seen: Dict[str, int] = {}
+    for entry in newest_first:
+        seen[entry.store] = seen.get(entry.store, 0) + 1
+        limit = policy.max_sessions.get(entry.store, 0)
+        too_many = bool(limit) and seen[entry.store] > limit
+        too_old = (
+            policy.max_age is not None
+            and entry.store not in policy.exempt_stores
+            and now - entry.updated_at > policy.max_age
+        )
+        if (too_many or too_old) and evictable(entry):
+            evicted.append(entry)
+        elif entry.store not in policy.exempt_stores:
+            kept.append(entry)
+
+    if policy.max_bytes:
+        total = sum(entry.size for entry in kept)
+        for entry in reversed(kept):
+            if total <= policy.max_bytes:
+                break
+            if evictable(entry):
+                evicted.append(entry)
+                total -= entry.size
+
+    return sorted(evicted, key=lambda entry: entry.updated_at)
+
+
+def enforce_retention(
+    stores: List[HybridSessionStore],
+    policy: RetentionPolicy,
+    protected: frozenset = frozenset(),
+    blob_root: Optional[Path] = None,
+) -> RetentionReport:
+    """Evict sessions beyond the policy's budgets and remove orphaned blobs."""
+    report = RetentionReport()
+    usage = [entry for store in stores for entry in store.usage()]
+    evictions = select_evictions(usage, policy, datetime.now(timezone.utc), protected)
+
+    by_store: Dict[str, List[str]] = {}
+    for entry in evictions:
+        by_store.setdefault(entry.store, []).append(entry.session_id)
+    for store in stores:
+        session_ids = by_store.get(store.name)
+        if session_ids:
+            report.bytes_reclaimed += store.evict(session_ids)
+            report.evicted[store.name] = session_ids
+
+    if blob_root is not None and report.evicted:
+        referenced = set()
+        for store in stores:
+            referenced |= store.referenced_blobs()
+        removed, freed = get_blob_store(blob_root).remove_unreferenced(referenced)
+        report.blobs_removed = removed
+        report.bytes_reclaimed += freed
+
+    return report
+
+
+def default_retention_setup() -> tuple:
+    """Stores, policy and protected sessions from the user's configuration."""
+    from ticca.config import (
+        AUTOSAVE_DIR,
+        CONFIG_DIR,
+        CONTEXTS_DIR,
+        get_current_autosave_session_name,
+        get_max_saved_sessions,
+        get_max_subagent_sessions,
+        get_session_retention_include_contexts,
+        get_session_retention_max_age_days,
+        get_session_retention_max_mb,
+    )
+
+    stores = [
+        HybridSessionStore("autosave", Path(AUTOSAVE_DIR)),
+        HybridSessionStore("context", Path(CONTEXTS_DIR)),
+        SubagentSessionStore("subagent", Path(CONFIG_DIR) / "subagent_sessions"),
+    ]
+    max_age_days = get_session_retention_max_age_days()
+    policy = RetentionPolicy(
+        max_sessions={
+            "autosave": get_max_saved_sessions(),
+            "subagent": get_max_subagent_sessions(),
+        },
+        max_bytes=get_session_retention_max_mb() * 1024 * 1024,
+        max_age=timedelta(days=max_age_days) if max_age_days else None,
+        exempt_stores=(
+            frozenset()
+            if get_session_retention_include_contexts()
+            else frozenset({"context"})
+        ),
+    )
+    protected = frozenset({("autosave", get_current_autosave_session_name())})
+    return stores, policy, protected, Path(CONFIG_DIR) / "blobs"
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+_sweep_lock = threading.Lock()
+
+
+def run_retention_sweep() -> Optional[RetentionReport]:
+    """Enforce the configured budgets and report what was reclaimed.
+
+    Returns None if another sweep is already running.
+    """
+    if not _sweep_lock.acquire(blocking=False):
+        return None
+    try:
+        stores, policy, protected, blob_root = default_retention_setup()
+        report = enforce_retention(stores, policy, protected, blob_root)
+    finally:
+        _sweep_lock.release()
+
+    if report.sessions_evicted:
+        from ticca.messaging import emit_info
+
+        emit_info(
+            f"[dim]🧹 Removed {report.sessions_evicted} old sessions "
+            f"({_format_size(report.bytes_reclaimed)} reclaimed)[/dim]"
+        )
+    return report
+
+
+def start_retention_sweep() -> threading.Thread:
+    """Run the retention sweep on a background thread."""
+
+    def sweep() -> None:
+        try:
+            run_retention_sweep()
+        except Exception as exc:
+            logging.debug(f"Session retention sweep failed: {exc}")
+
+    thread = threading.Thread(target=sweep, name="session-retention", daemon=True)
+    thread.start()
+    return thread
@@ -12,13 +12,18 @@ Migration Path:
 
 from __future__ import annotations
 
+import atexit
 import json
+import logging
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List, Optional
+
+from ticca.atomic_io import atomic_write_text
 
 # Import hybrid storage
-from ticca.hybrid_storage import create_storage, StoredMessage
+from ticca.hybrid_storage import create_storage, SessionMetadata as StorageMetadata, StoredMessage
 
 SessionHistory = List[Any]
 TokenEstimator = Callable[[Any], int]
@@ -141,9 +146,12 @@ def save_session(
     timestamp: str,
     token_estimator: TokenEstimator,
     auto_saved: bool = False,
+    agent_name: Optional[str] = None,
 ) -> SessionMetadata:
-    """Save a session using hybrid storage (SQLite + JSON + ChromaDB).
+    """Save a session using hybrid storage (SQLite + JSONL + ChromaDB).
 
+    Only messages added since the previous save of the same session are written,
+    so repeated saves (autosave) cost the size of the turn, not the session.
     This maintains API compatibility with old pickle-based system.
     """
     ensure_directory(base_dir)
@@ -152,14 +160,15 @@ def save_session(
     storage = _get_storage(base_dir)
 
     # Determine agent name (try to infer from context)
-    agent_name = "unknown"
-    try:
-        from ticca.agents.agent_manager import get_current_agent
-        current_agent = get_current_agent()
-        if current_agent:
-            agent_name = current_agent.display_name
-    except Exception:
-        pass
+    if agent_name is None:
+        agent_name = "unknown"
+        try:
+            from ticca.agents.agent_manager import get_current_agent
+            current_agent = get_current_agent()
+            if current_agent:
+                agent_name = current_agent.display_name
+        except Exception:
+            pass
 
     # Save to hybrid storage
     storage_metadata = storage.save_session(
@@ -173,27 +182,109 @@ def save_session(
     # Build legacy paths
     paths = build_session_paths(base_dir, session_name)
 
-    # Create legacy metadata JSON for backward compatibility
-    total_tokens = sum(token_estimator(message) for message in history)
+    # Token totals are kept up to date incrementally by the storage layer
     metadata = SessionMetadata(
         session_name=session_name,
         timestamp=timestamp,
         message_count=len(history),
-        total_tokens=total_tokens,
+        total_tokens=storage_metadata.total_tokens,
         pickle_path=paths.pickle_path,
         metadata_path=paths.metadata_path,
         auto_saved=auto_saved,
     )
 
-    with paths.metadata_path.open("w", encoding="utf-8") as metadata_file:
-        json.dump(metadata.as_serialisable(), metadata_file, indent=2)
+    # Legacy metadata JSON for backward compatibility. Autosaves skip it: they
+    # run after every turn and SQLite already has the same metadata.
+    if not auto_saved:
+        atomic_write_text(
+            paths.metadata_path, json.dumps(metadata.as_serialisable(), indent=2)
+        )
 
     return metadata
 
 
-def load_session(session_name: str, base_dir: Path) -> SessionHistory:
+class AutosaveWriter:
+    """Runs session saves on a background thread so callers never wait on disk I/O.
+
+    Saves are keyed by session name and coalesced: if several snapshots of the
+    same session queue up while the worker is busy, only the latest is written.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, Callable[[], Any]] = {}
+        self._busy = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, key: str, write: Callable[[], Any]) -> None:
+        """Queue `write` for `key`, replacing any save of `key` not started yet."""
+        with self._condition:
+            self._pending[key] = write
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="autosave-writer", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued save has been written.
+
+        Returns:
+            False if the timeout expired first, True otherwise
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                key = next(iter(self._pending))
+                write = self._pending.pop(key)
+                self._busy = True
+            try:
+                write()
+            except Exception as exc:
+                # Autosave errors shouldn't interrupt the user's workflow
+                logging.debug(f"Auto-save failed: {exc}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+
+_autosave_writer: Optional[AutosaveWriter] = None
+_autosave_writer_lock = threading.Lock()
+
+
+def get_autosave_writer() -> AutosaveWriter:
+    """Return the process-wide autosave writer, flushed at interpreter exit."""
+    global _autosave_writer
+    with _autosave_writer_lock:
+        if _autosave_writer is None:
+            _autosave_writer = AutosaveWriter()
+            atexit.register(_autosave_writer.flush)
+    return _autosave_writer
+
+
+def load_session(
+    session_name: str,
+    base_dir: Path,
+    tail: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+) -> SessionHistory:
     """Load a session from hybrid storage.
 
+    Sessions are restored exactly as the model saw them, tool calls and returns
+    included. Pass `tail` or `max_tokens` to load only the most recent messages
+    (plus the first one, which holds the system prompt); older messages aren't
+    even decoded. Sessions saved before full-fidelity storage fall back to
+    their text-only log.
+
     Automatically migrates old pickle files on first access.
     """
     # Check if we need to migrate from pickle
@@ -202,6 +293,13 @@ def load_session(session_name: str, base_dir: Path) -> SessionHistory:
     # Load from hybrid storage
     storage = _get_storage(base_dir)
 
+    try:
+        return storage.load_messages(
+            session_name, tail=tail, max_tokens=max_tokens
+        )
+    except FileNotFoundError:
+        pass
+
     try:
         stored_messages = storage.load_session(session_name)
 
@@ -290,6 +388,71 @@ def list_sessions(base_dir: Path) -> List[str]:
     return sorted(session_names)
 
 
+# Directories whose legacy pickle sessions were already migrated this run
+_migrated_dirs: set[Path] = set()
+
+
+def _migrate_legacy_sessions(base_dir: Path) -> None:
+    """Migrate every legacy pickle session in `base_dir` (once per process)."""
+    key = base_dir.expanduser().resolve()
+    if key in _migrated_dirs:
+        return
+    for pkl_file in base_dir.glob("*.pkl"):
+        _migrate_pickle_if_exists(base_dir, pkl_file.stem)
+    _migrated_dirs.add(key)
+
+
+def count_sessions(base_dir: Path) -> int:
+    """Number of sessions saved in `base_dir`."""
+    if not base_dir.exists():
+        return 0
+
+    _migrate_legacy_sessions(base_dir)
+    return _get_storage(base_dir).count_sessions()
+
+
+def list_recent_sessions(
+    base_dir: Path, offset: int = 0, limit: int = 50
+) -> List[StorageMetadata]:
+    """One page of sessions in `base_dir`, most recently updated first.
+
+    Entries come straight from the SQLite index (name, timestamps, message
+    count, tokens, last user message preview) without reading any session
+    log. Sessions saved before previews existed have `preview=None`; use
+    `load_session_preview` for the ones actually shown.
+    """
+    if not base_dir.exists():
+        return []
+
+    _migrate_legacy_sessions(base_dir)
+    return _get_storage(base_dir).list_recent_sessions(offset=offset, limit=limit)
+
+
+def load_session_preview(base_dir: Path, session_name: str) -> Optional[str]:
+    """Preview of a session that was saved without one."""
+    return _get_storage(base_dir).load_preview(session_name)
+
+
+def search_sessions(
+    base_dir: Path,
+    query: str,
+    limit: int = 20,
+    highlight: tuple[str, str] = ("**", "**"),
+    exclude_session: Optional[str] = None,
+) -> List[dict]:
+    """Keyword search over the messages of sessions saved in `base_dir`.
+
+    Returns matches (best first) as returned by HybridStorage.search_messages.
+    """
+    if not base_dir.exists():
+        return []
+
+    storage = _get_storage(base_dir)
+    return storage.search_messages(
+        query, limit=limit, highlight=highlight, exclude_session_id=exclude_session
+    )
+
+
 def cleanup_sessions(base_dir: Path, max_sessions: int) -> List[str]:
     """Clean up old sessions, keeping only the most recent ones.
 
@@ -316,12 +479,11 @@ async def restore_autosave_interactively(base_dir: Path) -> None:
 
     This uses hybrid storage but maintains the same interactive flow.
     """
-    sessions = list_sessions(base_dir)
-    if not sessions:
+    total = count_sessions(base_dir)
+    if not total:
         return
 
     # Import locally to avoid pulling the messaging layer into storage modules
-    from datetime import datetime
     from prompt_toolkit.formatted_text import FormattedText
 
     from ticca.agents.agent_manager import get_current_agent
@@ -330,62 +492,19 @@ async def restore_autosave_interactively(base_dir: Path) -> None:
     )
     from ticca.messaging import emit_success, emit_system_message, emit_warning
 
-    # Get metadata from hybrid storage
-    storage = _get_storage(base_dir)
-    entries = []
-
-    for name in sessions:
-        try:
-            metadata = storage.get_session_metadata(name)
-            if metadata:
-                timestamp = metadata.created_at.isoformat()
-                message_count = metadata.message_count
-            else:
-                # Fallback to legacy metadata
-                meta_path = base_dir / f"{name}_meta.json"
-                if meta_path.exists():
-                    with meta_path.open("r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    timestamp = data.get("timestamp")
-                    message_count = data.get("message_count")
-                else:
-                    timestamp = None
-                    message_count = None
-            entries.append((name, timestamp, message_count))
-        except Exception:
-            timestamp = None
-            message_count = None
-            entries.append((name, timestamp, message_count))
-
-    def sort_key(entry):
-        _, timestamp, _ = entry
-        if timestamp:
-            try:
-                return datetime.fromisoformat(timestamp)
-            except ValueError:
-                return datetime.min
-        return datetime.min
-
-    entries.sort(key=sort_key, reverse=True)
-
     PAGE_SIZE = 5
-    total = len(entries)
     page = 0
+    page_entries: List[StorageMetadata] = []
 
     def render_page() -> None:
-        start = page * PAGE_SIZE
-        end = min(start + PAGE_SIZE, total)
-        page_entries = entries[start:end]
+        nonlocal page_entries
+        # Only the sessions on screen are fetched
+        page_entries = list_recent_sessions(base_dir, page * PAGE_SIZE, PAGE_SIZE)
         emit_system_message("[bold magenta]Autosave Sessions Available:[/bold magenta]")
-        for idx, (name, timestamp, message_count) in enumerate(page_entries, start=1):
-            timestamp_display = timestamp or "unknown time"
-            message_display = (
-                f"{message_count} messages"
-                if message_count is not None
-                else "unknown size"
-            )
+        for idx, entry in enumerate(page_entries, start=1):
             emit_system_message(
-                f"  [{idx}] {name} ({message_display}, saved at {timestamp_display})"
+                f"  [{idx}] {entry.session_id} ({entry.message_count} messages, "
+                f"saved at {entry.updated_at.isoformat()})"
             )
         if total > PAGE_SIZE:
             page_count = (total + PAGE_SIZE - 1) // PAGE_SIZE
@@ -427,10 +546,8 @@ async def restore_autosave_interactively(base_dir: Path) -> None:
                 page = (page + 1) % ((total + PAGE_SIZE - 1) // PAGE_SIZE)
                 continue
             if 1 <= num <= 5:
-                start = page * PAGE_SIZE
-                idx = start + (num - 1)
-                if 0 <= idx < total:
-                    chosen_name = entries[idx][0]
+                if num <= len(page_entries):
+                    chosen_name = page_entries[num - 1].session_id
                     break
                 else:
                     emit_warning("Invalid selection for this page")
@@ -438,19 +555,19 @@ async def restore_autosave_interactively(base_dir: Path) -> None:
             emit_warning("Invalid selection; choose 1-5 or 6 for next")
             continue
 
-        for name, _ts, _mc in entries:
-            if name == selection:
-                chosen_name = name
-                break
-        if chosen_name:
+        if _get_storage(base_dir).get_session_metadata(selection):
+            chosen_name = selection
             break
         emit_warning("No autosave loaded (invalid selection)")
 
     if not chosen_name:
         return
 
+    agent = get_current_agent()
     try:
-        history = load_session(chosen_name, base_dir)
+        history = load_session(
+            chosen_name, base_dir, max_tokens=agent.get_history_token_budget()
+        )
     except FileNotFoundError:
         emit_warning(f"Autosave '{chosen_name}' could not be found")
         return
@@ -458,7 +575,6 @@ async def restore_autosave_interactively(base_dir: Path) -> None:
         emit_warning(f"Failed to load autosave '{chosen_name}': {exc}")
         return
 
-    agent = get_current_agent()
     agent.set_message_history(history)
 
     # Set current autosave session id
@@ -1,56 +1,71 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import List
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, List, TypeVar
 
 from pydantic_ai import Agent
 
 from ticca.config import get_use_dbos, get_global_model_name
 from ticca.model_factory import ModelFactory
 
+T = TypeVar("T")
+
 # Keep a module-level agent reference to avoid rebuilding per call
 _summarization_agent = None
+_summarization_model_name: str | None = None
 
-# Safe sync runner for async agent.run calls
-# Avoids "event loop is already running" by offloading to a separate thread loop when needed
-_thread_pool: ThreadPoolExecutor | None = None
+# Summarization runs on a dedicated, long-lived event loop thread. This keeps the
+# cached agent (and its HTTP client) bound to a single loop, and lets callers on
+# another loop wait for the result without blocking that loop.
+_summarizer_loop: asyncio.AbstractEventLoop | None = None
+_summarizer_lock = threading.Lock()
 
 # Reload counter
 _reload_count = 0
 
 
-def _ensure_thread_pool():
-    global _thread_pool
-    if _thread_pool is None:
-        _thread_pool = ThreadPoolExecutor(
-            max_workers=1, thread_name_prefix="summarizer-loop"
-        )
-    return _thread_pool
+def _ensure_summarizer_loop() -> asyncio.AbstractEventLoop:
+    global _summarizer_loop
+    with _summarizer_lock:
+        if _summarizer_loop is None or _summarizer_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="summarizer-loop", daemon=True
+            )
+            thread.start()
+            _summarizer_loop = loop
+    return _summarizer_loop
 
 
-async def _run_agent_async(agent: Agent, prompt: str, message_history: List):
-    return await agent.run(prompt, message_history=message_history)
+async def _run_agent_async(prompt: str, message_history: List) -> List:
+    agent = get_summarization_agent()
+    result = await agent.run(prompt, message_history=message_history)
+    return result.new_messages()
 
 
-def run_summarization_sync(prompt: str, message_history: List) -> List:
-    agent = get_summarization_agent()
-    try:
-        # Try to detect if we're already in an event loop
-        asyncio.get_running_loop()
-
-        # We're in an event loop: offload to a dedicated thread with its own loop
-        def _worker(prompt_: str):
-            return asyncio.run(
-                _run_agent_async(agent, prompt_, message_history=message_history)
-            )
+def run_in_summarizer_loop(coro: Coroutine[Any, Any, T]) -> "Future[T]":
+    """Schedule a coroutine on the summarizer loop and return its future.
 
-        pool = _ensure_thread_pool()
-        result = pool.submit(_worker, prompt).result()
-    except RuntimeError:
-        # No running loop, safe to run directly
-        result = asyncio.run(
-            _run_agent_async(agent, prompt, message_history=message_history)
-        )
-    return result.new_messages()
+    The returned ``concurrent.futures.Future`` can be polled with ``done()`` from
+    any thread, so callers can keep working and pick the result up later.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _ensure_summarizer_loop())
+
+
+def submit_summarization(prompt: str, message_history: List) -> Future:
+    """Start summarizing in the background and return a future for the new messages."""
+    return run_in_summarizer_loop(
+        _run_agent_async(prompt, message_history=message_history)
+    )
+
+
+async def run_summarization(prompt: str, message_history: List) -> List:
+    """Summarize without blocking the caller's event loop."""
+    return await asyncio.wrap_future(submit_summarization(prompt, message_history))
+
+
+def run_summarization_sync(prompt: str, message_history: List) -> List:
+    return submit_summarization(prompt, message_history).result()
 
 
 def reload_summarization_agent():
@@ -88,12 +103,18 @@ When summarizing:
     return agent
 
 
-def get_summarization_agent(force_reload=True):
+def get_summarization_agent(force_reload=False):
     """
     Retrieve the summarization agent with the currently set MODEL_NAME.
-    Forces a reload if the model has changed, or if force_reload is passed.
+    Reloads if the model has changed, or if force_reload is passed.
     """
-    global _summarization_agent
-    if force_reload or _summarization_agent is None:
+    global _summarization_agent, _summarization_model_name
+    model_name = get_global_model_name()
+    if (
+        force_reload
+        or _summarization_agent is None
+        or model_name != _summarization_model_name
+    ):
         _summarization_agent = reload_summarization_agent()
+        _summarization_model_name = model_name
     return _summarization_agent
@@ -66,6 +66,7 @@ from ticca.tools.file_operations import (
     register_list_files,
     register_read_file,
 )
+from ticca.tools.session_search import register_search_sessions
 
 # Map of tool names to their individual registration functions
 TOOL_REGISTRY = {
@@ -83,6 +84,8 @@ TOOL_REGISTRY = {
     # Command Runner
     "agent_run_shell_command": register_agent_run_shell_command,
     "agent_share_your_reasoning": register_agent_share_your_reasoning,
+    # Session History
+    "search_sessions": register_search_sessions,
     # Browser Control
     "browser_initialize": register_initialize_browser,
     "browser_close": register_close_browser,
@@ -1,19 +1,32 @@
 # agent_tools.py
 import asyncio
+import hashlib
 import json
 import re
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
-from typing import List, Set
+from typing import Any, AsyncIterable, List, Set
 
 from dbos import DBOS, SetWorkflowID
 from pydantic import BaseModel
 
 # Import Agent from pydantic_ai to create temporary agents for invocation
 from pydantic_ai import Agent, RunContext, UsageLimits
-from pydantic_ai.messages import ModelMessage
+from pydantic_ai.messages import (
+    AgentStreamEvent,
+    FunctionToolCallEvent,
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+)
+from rich.markup import escape
 
+from ticca.atomic_io import atomic_write_bytes, atomic_write_text, write_durably
 from ticca.config import get_message_limit, get_use_dbos, CONFIG_DIR
 from ticca.hybrid_storage import create_storage
 from ticca.messaging import (
@@ -33,6 +46,9 @@ _active_subagent_tasks: Set[asyncio.Task] = set()
 SESSION_ID_PATTERN = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
 SESSION_ID_MAX_LENGTH = 128
 
+# Minimum seconds between streamed sub-agent output updates
+SUBAGENT_STREAM_FLUSH_INTERVAL = 0.5
+
 
 def _validate_session_id(session_id: str) -> None:
     """Validate that a session ID follows kebab-case naming conventions.
@@ -82,21 +98,58 @@ def _get_subagent_sessions_dir() -> Path:
 
 
 def _get_subagent_storage():
-    """Get hybrid storage instance for subagent sessions."""
+    """Get hybrid storage instance for legacy subagent sessions."""
     return create_storage(base_dir=_get_subagent_sessions_dir())
 
 
+def _get_session_log_path(session_id: str) -> Path:
+    """Path of the append-only JSONL message log for a subagent session."""
+    return _get_subagent_sessions_dir() / f"{session_id}.jsonl"
+
+
+def _get_session_metadata_path(session_id: str) -> Path:
+    """Path of the human-readable metadata file for a subagent session."""
+    return _get_subagent_sessions_dir() / f"{session_id}.txt"
+
+
+def _read_session_metadata(session_id: str) -> dict:
+    """Read session metadata, returning an empty dict if missing or unreadable."""
+    metadata_path = _get_session_metadata_path(session_id)
+    if not metadata_path.exists():
+        return {}
+    try:
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _message_digest(message: ModelMessage) -> str:
+    """Stable digest of a message, used to check the saved log is still a prefix."""
+    return hashlib.sha1(ModelMessagesTypeAdapter.dump_json([message])).hexdigest()
+
+
 def _save_session_history(
     session_id: str,
     message_history: List[ModelMessage],
     agent_name: str,
     initial_prompt: str | None = None,
 ) -> None:
-    """Save session history using hybrid storage (SQLite + JSON + ChromaDB).
+    """Persist session history to an append-only JSONL message log.
+
+    Each call appends only the messages that were added since the previous
+    save, one per line, serialized with pydantic-ai's message adapter so tool
+    calls and tool returns survive the round trip.
+
+    Appending is only safe while the log is still a prefix of the history, so
+    the metadata records the log's size and a digest of its last message. If
+    either doesn't match (the history was compacted or summarized, a write was
+    torn, or a crash came between the log and metadata writes), the whole log
+    is rewritten atomically instead.
 
     Args:
         session_id: The session identifier (must be kebab-case)
-        message_history: List of messages to save
+        message_history: Full list of messages for the session
         agent_name: Name of the agent being invoked
         initial_prompt: The first prompt that started this session
 
@@ -106,21 +159,77 @@ def _save_session_history(
     # Validate session_id format before saving
     _validate_session_id(session_id)
 
-    # Use hybrid storage
-    storage = _get_subagent_storage()
-    storage.save_session(
-        session_id=session_id,
-        messages=message_history,
-        agent_name=agent_name,
-        auto_saved=False
+    log_path = _get_session_log_path(session_id)
+    metadata = _read_session_metadata(session_id)
+
+    log_size = log_path.stat().st_size if log_path.exists() else 0
+    persisted_count = metadata.get("message_count", 0)
+    can_append = (
+        log_size > 0
+        and log_size == metadata.get("log_size")
+        and 0 < persisted_count <= len(message_history)
+        and _message_digest(message_history[persisted_count - 1])
+        == metadata.get("last_message_digest")
+    )
+
+    if can_append:
+        new_messages = message_history[persisted_count:]
+        if new_messages:
+            segment = _encode_log_lines(new_messages)
+            write_durably(log_path, segment, append=True)
+            log_size += len(segment)
+    elif message_history:
+        segment = _encode_log_lines(message_history)
+        atomic_write_bytes(log_path, segment)
+        log_size = len(segment)
+    else:
+        log_path.unlink(missing_ok=True)
+        log_size = 0
+
+    now = datetime.now().isoformat()
+    metadata.update(
+        {
+            "session_id": session_id,
+            "agent_name": agent_name,
+            "message_count": len(message_history),
+            "log_size": log_size,
+            "last_message_digest": (
+                _message_digest(message_history[-1]) if message_history else None
+            ),
+            "last_updated": now,
+        }
     )
+    metadata.setdefault("created_at", now)
+    if initial_prompt is not None:
+        metadata["initial_prompt"] = initial_prompt
+    metadata.setdefault("initial_prompt", None)
 
+    atomic_write_text(
+        _get_session_metadata_path(session_id), json.dumps(metadata, indent=2)
+    )
+
+
+def _encode_log_lines(messages: List[ModelMessage]) -> bytes:
+    """Serialize messages one per line, so the log's tail can be decoded alone."""
+    return b"".join(
+        ModelMessagesTypeAdapter.dump_json([message]) + b"\n" for message in messages
+    )
 
-def _load_session_history(session_id: str) -> List[ModelMessage]:
-    """Load session history from hybrid storage.
+
+def _load_session_history(
+    session_id: str, max_tokens: int | None = None
+) -> List[ModelMessage]:
+    """Load session history from the append-only JSONL message log.
+
+    With `max_tokens`, lines are decoded from the end of the log only until
+    roughly that many tokens are loaded (and every tool return among them has
+    its tool call); the first message, which starts the conversation, is
+    always kept. Sessions saved before the JSONL log existed are still read
+    from the legacy hybrid storage location.
 
     Args:
         session_id: The session identifier (must be kebab-case)
+        max_tokens: Token budget for the loaded history (default: everything)
 
     Returns:
         List of ModelMessage objects, or empty list if session doesn't exist
@@ -131,59 +240,172 @@ def _load_session_history(session_id: str) -> List[ModelMessage]:
     # Validate session_id format before loading
     _validate_session_id(session_id)
 
-    storage = _get_subagent_storage()
+    log_path = _get_session_log_path(session_id)
+    if not log_path.exists():
+        return _load_legacy_session_history(session_id)
 
     try:
-        stored_messages = storage.load_session(session_id)
+        lines = [line for line in log_path.read_bytes().splitlines() if line.strip()]
+    except OSError:
+        return []
+
+    if max_tokens is None:
+        messages: List[ModelMessage] = []
+        for line in lines:
+            try:
+                messages.extend(ModelMessagesTypeAdapter.validate_json(line))
+            except ValueError:
+                # A torn write (e.g. crash mid-append) only loses that
+                # segment; the next save rewrites the log
+                break
+        return messages
+    return _load_log_tail(lines, max_tokens)
+
+
+def _load_log_tail(lines: List[bytes], max_tokens: int) -> List[ModelMessage]:
+    """Decode the first message and the tail of the log that fits `max_tokens`."""
+    try:
+        first = ModelMessagesTypeAdapter.validate_json(lines[0])
+    except ValueError:
+        return []
 
-        # Convert StoredMessage back to pydantic_ai ModelMessage format
-        from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, ToolReturnPart
+    # Walk back from the end until the budget is spent (the last message is
+    # always loaded) and every tool return read so far has been matched with
+    # its tool call. Tokens are estimated at roughly three characters each,
+    # as the agents do.
+    segments: List[List[ModelMessage]] = []
+    unmatched_returns: Set[str] = set()
+    tokens = len(lines[0]) // 3
+    start = len(lines)
+    while start > 1 and (
+        start == len(lines) or tokens < max_tokens or unmatched_returns
+    ):
+        start -= 1
+        try:
+            segment = ModelMessagesTypeAdapter.validate_json(lines[start])
+        except ValueError:
+            # Everything after a torn write is dropped, as in a full load
+            segments, unmatched_returns, tokens = [], set(), len(lines[0]) // 3
+            continue
+        tokens += len(lines[start]) // 3
+        for message in reversed(segment):
+            for part in message.parts:
+                tool_call_id = getattr(part, "tool_call_id", None)
+                if not tool_call_id:
+                    continue
+                if part.part_kind == "tool-call":
+                    unmatched_returns.discard(tool_call_id)
+                else:
+                    unmatched_returns.add(tool_call_id)
+        segments.append(segment)
+    tail = [message for segment in reversed(segments) for message in segment]
+    return (first if start == 1 else first[:1]) + tail
+
+
+def _load_legacy_session_history(session_id: str) -> List[ModelMessage]:
+    """Load a session saved by the old (lossy) hybrid storage format."""
+    legacy_path = _get_subagent_sessions_dir() / "sessions" / f"{session_id}.json"
+    if not legacy_path.exists():
+        return []
+
+    try:
+        stored_messages = _get_subagent_storage().load_session(session_id)
+
+        from pydantic_ai.messages import (
+            ModelRequest,
+            ModelResponse,
+            SystemPromptPart,
+            TextPart,
+            UserPromptPart,
+        )
 
         converted_messages = []
         for msg in stored_messages:
-            # Create appropriate message type based on role
-            if msg.role == 'user':
-                # User messages are ModelRequest with TextPart
+            if msg.role == "user":
                 converted_messages.append(
-                    ModelRequest(parts=[TextPart(content=msg.content)])
+                    ModelRequest(parts=[UserPromptPart(content=msg.content)])
                 )
-            elif msg.role == 'assistant':
-                # Assistant messages are ModelResponse with TextPart
+            elif msg.role == "assistant":
                 converted_messages.append(
                     ModelResponse(parts=[TextPart(content=msg.content)])
                 )
-            elif msg.role == 'tool':
-                # Tool return messages
-                if msg.tool_call_id:
-                    converted_messages.append(
-                        ModelResponse(parts=[
-                            ToolReturnPart(
-                                tool_name=msg.tool_name or '',
-                                content=msg.content,
-                                tool_call_id=msg.tool_call_id
-                            )
-                        ])
-                    )
-                else:
-                    # Fallback if no tool_call_id
-                    converted_messages.append(
-                        ModelResponse(parts=[TextPart(content=msg.content)])
-                    )
-            else:
-                # System or other messages - use TextPart
+            elif msg.role == "system":
                 converted_messages.append(
-                    ModelRequest(parts=[TextPart(content=msg.content)])
+                    ModelRequest(parts=[SystemPromptPart(content=msg.content)])
                 )
 
         return converted_messages
-    except FileNotFoundError:
-        # Session doesn't exist, return empty list
-        return []
     except Exception:
         # If any error occurs, return empty history
         return []
 
 
+class _SubagentStreamForwarder:
+    """Forward a sub-agent's streamed events into the invoke group's messages.
+
+    Used as the pydantic-ai ``event_stream_handler`` for the sub-agent run.
+    Text deltas are buffered and flushed as whole lines at most once per
+    ``flush_interval`` seconds so long generations don't flood the UI, while
+    tool calls are announced as soon as they start.
+    """
+
+    def __init__(
+        self, group_id: str, flush_interval: float = SUBAGENT_STREAM_FLUSH_INTERVAL
+    ):
+        self.group_id = group_id
+        self.flush_interval = flush_interval
+        self.streamed_text = False
+        self._buffer = ""
+        self._last_flush = 0.0
+
+    async def __call__(
+        self, ctx: RunContext, events: AsyncIterable[AgentStreamEvent]
+    ) -> None:
+        async for event in events:
+            self.handle_event(event)
+        self.flush(force=True)
+
+    def handle_event(self, event: Any) -> None:
+        """Process a single streamed event."""
+        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+            if self._buffer and not self._buffer.endswith("\n"):
+                self._buffer += "\n"
+            self._buffer += event.part.content
+        elif isinstance(event, PartDeltaEvent) and isinstance(
+            event.delta, TextPartDelta
+        ):
+            self._buffer += event.delta.content_delta
+        elif isinstance(event, FunctionToolCallEvent):
+            self.flush(force=True)
+            emit_system_message(
+                f"[dim]🔧 {escape(event.part.tool_name)}[/dim]",
+                message_group=self.group_id,
+            )
+            return
+        else:
+            return
+        self.flush()
+
+    def flush(self, force: bool = False) -> None:
+        """Emit buffered text, keeping any trailing partial line unless forced."""
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+
+        if force:
+            chunk, self._buffer = self._buffer, ""
+        else:
+            cut = self._buffer.rfind("\n")
+            if cut == -1:
+                return
+            chunk, self._buffer = self._buffer[:cut], self._buffer[cut + 1 :]
+
+        self._last_flush = now
+        if chunk.strip():
+            self.streamed_text = True
+            emit_system_message(escape(chunk.strip("\n")), message_group=self.group_id)
+
+
 class AgentInfo(BaseModel):
     """Information about an available agent."""
 
@@ -362,26 +584,30 @@ def register_invoke_agent(agent):
         emit_divider(message_group=group_id)
         emit_system_message(f"Prompt: {prompt}", message_group=group_id)
 
-        # Retrieve existing message history from filesystem for this session, if any
-        message_history = _load_session_history(session_id)
-        is_new_session = len(message_history) == 0
-
-        if message_history:
-            emit_system_message(
-                f"Continuing conversation from session {session_id} ({len(message_history)} messages)",
-                message_group=group_id,
-            )
-        else:
-            emit_system_message(
-                f"Starting new session {session_id}",
-                message_group=group_id,
-            )
-        emit_divider(message_group=group_id)
-
         try:
             # Load the specified agent config
             agent_config = load_agent(agent_name)
 
+            # Retrieve existing message history from filesystem for this session,
+            # if any, as much of it as fits the agent's context window
+            message_history = _load_session_history(
+                session_id, max_tokens=agent_config.get_history_token_budget()
+            )
+            is_new_session = len(message_history) == 0
+
+            if message_history:
+                emit_system_message(
+                    f"Continuing conversation from session {session_id} "
+                    f"({len(message_history)} messages)",
+                    message_group=group_id,
+                )
+            else:
+                emit_system_message(
+                    f"Starting new session {session_id}",
+                    message_group=group_id,
+                )
+            emit_divider(message_group=group_id)
+
             # Get the current model for creating a temporary agent
             model_name = agent_config.get_model_name()
             models_config = ModelFactory.load_config()
@@ -430,6 +656,8 @@ def register_invoke_agent(agent):
 
             # Run the temporary agent with the provided prompt as an asyncio task
             # Pass the message_history from the session to continue the conversation
+            # and stream its output into this invocation's message group
+            stream_forwarder = _SubagentStreamForwarder(group_id)
             if get_use_dbos():
                 with SetWorkflowID(group_id):
                     task = asyncio.create_task(
@@ -437,6 +665,7 @@ def register_invoke_agent(agent):
                             prompt,
                             message_history=message_history,
                             usage_limits=UsageLimits(request_limit=get_message_limit()),
+                            event_stream_handler=stream_forwarder,
                         )
                     )
                     _active_subagent_tasks.add(task)
@@ -446,6 +675,7 @@ def register_invoke_agent(agent):
                         prompt,
                         message_history=message_history,
                         usage_limits=UsageLimits(request_limit=get_message_limit()),
+                        event_stream_handler=stream_forwarder,
                     )
                 )
                 _active_subagent_tasks.add(task)
@@ -473,7 +703,8 @@ def register_invoke_agent(agent):
                 initial_prompt=prompt if is_new_session else None,
             )
 
-            emit_system_message(f"Response: {response}", message_group=group_id)
+            if not stream_forwarder.streamed_text:
+                emit_system_message(f"Response: {response}", message_group=group_id)
             emit_system_message(
                 f"Session {session_id} saved to disk ({len(updated_history)} messages)",
                 message_group=group_id,
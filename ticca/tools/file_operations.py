@@ -1,6 +1,7 @@
 # file_operations.py
 
 import os
+import stat
 import tempfile
 from typing import List
 
@@ -288,42 +289,39 @@ def _list_files(
         # ripgrep's --files option only returns files; we add directories and files ourselves
         if not recursive:
             try:
-                from ticca.tools.common import should_ignore_dir_path
+                # Shared with the TUI file tree; ignored directories are left out
+                from ticca.directory_cache import get_directory_cache
 
-                entries = os.listdir(directory)
-                for entry in sorted(entries):
-                    full_entry_path = os.path.join(directory, entry)
-                    if not os.path.exists(full_entry_path):
-                        continue
-
-                    if os.path.isdir(full_entry_path):
-                        # Skip ignored directories
-                        if should_ignore_dir_path(full_entry_path):
-                            continue
+                for entry in get_directory_cache().list_dir(directory):
+                    if entry.is_dir:
                         results.append(
                             ListedFile(
-                                path=entry,
+                                path=entry.name,
                                 type="directory",
                                 size=0,
-                                full_path=full_entry_path,
+                                full_path=entry.path,
                                 depth=0,
                             )
                         )
-                    elif os.path.isfile(full_entry_path):
-                        # Include top-level files (including binaries)
-                        try:
-                            size = os.path.getsize(full_entry_path)
-                        except OSError:
-                            size = 0
-                        results.append(
-                            ListedFile(
-                                path=entry,
-                                type="file",
-                                size=size,
-                                full_path=full_entry_path,
-                                depth=0,
-                            )
+                        continue
+
+                    # Include top-level files (including binaries); sizes
+                    # aren't cached as they change without the listing changing
+                    try:
+                        stat_info = os.stat(entry.path)
+                    except OSError:
+                        continue
+                    if not stat.S_ISREG(stat_info.st_mode):
+                        continue
+                    results.append(
+                        ListedFile(
+                            path=entry.name,
+                            type="file",
+                            size=stat_info.st_size,
+                            full_path=entry.path,
+                            depth=0,
                         )
+                    )
             except (FileNotFoundError, PermissionError, OSError):
                 # Skip entries we can't access
                 pass
@@ -0,0 +1,130 @@
+"""
+Tool for agents to recall past work by keyword-searching saved sessions.
+"""
+
+from itertools import zip_longest
+from pathlib import Path
+from typing import List
+
+from pydantic import BaseModel
+from pydantic_ai import RunContext
+from rich.markup import escape
+
+from ticca.config import (
+    AUTOSAVE_DIR,
+    CONTEXTS_DIR,
+    get_current_autosave_session_name,
+)
+from ticca.messaging import emit_info
+from ticca.session_storage import search_sessions
+from ticca.tools.common import generate_group_id
+
+
+class SessionSearchMatch(BaseModel):
+    """A message from a past session that matched the search."""
+
+    session_id: str
+    source: str
+    agent_name: str
+    updated_at: str
+    role: str
+    snippet: str
+
+
+class SessionSearchOutput(BaseModel):
+    """Output from searching past sessions."""
+
+    matches: List[SessionSearchMatch] = []
+    error: str | None = None
+
+
+def find_in_past_sessions(
+    query: str,
+    limit: int = 10,
+    highlight: tuple[str, str] = ("**", "**"),
+    exclude_autosave: str | None = None,
+) -> List[SessionSearchMatch]:
+    """Search autosaved sessions and saved contexts, best matches first.
+
+    Each store has its own index, and bm25 scores depend on the corpus they
+    were computed over, so matches are ranked within each store and the two
+    rankings are interleaved rather than sorted by score together.
+    `exclude_autosave` leaves one autosaved session (e.g. the current one)
+    out of the results.
+    """
+    stores = (
+        ("autosave", AUTOSAVE_DIR, exclude_autosave),
+        ("context", CONTEXTS_DIR, None),
+    )
+    rankings = [
+        [
+            (source, match)
+            for match in search_sessions(
+                Path(base_dir),
+                query,
+                limit=limit,
+                highlight=highlight,
+                exclude_session=exclude,
+            )
+        ]
+        for source, base_dir, exclude in stores
+    ]
+    results = [
+        result
+        for results_at_rank in zip_longest(*rankings)
+        for result in results_at_rank
+        if result is not None
+    ]
+    return [
+        SessionSearchMatch(
+            session_id=match["session_id"],
+            source=source,
+            agent_name=match["agent_name"],
+            updated_at=match["updated_at"].isoformat(timespec="minutes"),
+            role=match["role"],
+            snippet=match["snippet"],
+        )
+        for source, match in results[:limit]
+    ]
+
+
+def register_search_sessions(agent):
+    """Register the search_sessions tool."""
+
+    @agent.tool
+    def search_sessions(
+        context: RunContext, query: str, limit: int = 10
+    ) -> SessionSearchOutput:
+        """Keyword-search the user's past sessions to recall earlier work.
+
+        Use this tool when the user refers to something done in a previous
+        session ("the session where we fixed the OAuth refresh") or when past
+        decisions would help with the current task.
+
+        Args:
+            query: Words to search for. Every word must appear in a message;
+                  matching is case-insensitive and ignores word endings.
+            limit: Maximum number of matching messages to return (default 10).
+
+        Returns:
+            SessionSearchOutput: Matching messages with their session id,
+                                 where the session is stored ("autosave" or
+                                 "context") and a snippet around the match.
+        """
+        if not query or not query.strip():
+            return SessionSearchOutput(error="Query cannot be empty")
+
+        group_id = generate_group_id("search_sessions", query)
+        emit_info(
+            "\n[bold white on blue] SEARCH SESSIONS [/bold white on blue] "
+            f"[dim]for '{escape(query)}'[/dim]",
+            message_group=group_id,
+        )
+        try:
+            # The current conversation is already in context; don't echo it back
+            matches = find_in_past_sessions(
+                query, limit, exclude_autosave=get_current_autosave_session_name()
+            )
+            return SessionSearchOutput(matches=matches)
+        except Exception as e:
+            return SessionSearchOutput(error=f"Session search failed: {e}")
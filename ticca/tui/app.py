@@ -2,8 +2,10 @@
 Main TUI application class.
 """
 
+import uuid
 from datetime import datetime, timezone
 
+from rich.markup import escape
 from textual import on
 from textual.app import App, ComposeResult
 from textual.binding import Binding
@@ -14,6 +16,7 @@ from textual.widgets import Footer, ListView
 
 # message_history_accumulator and prune_interrupted_tool_calls have been moved to BaseAgent class
 from ticca.agents.agent_manager import get_current_agent
+from ticca.agents.response_stream import ResponseStream
 from ticca.command_line.command_handler import handle_command
 from ticca.command_line.model_picker_completion import set_active_model
 from ticca.config import (
@@ -35,6 +38,7 @@ from ticca.tui.components import (
 
 # Import shared message classes
 from .messages import CommandSelected, HistoryEntrySelected
+from .refresh_scheduler import RefreshScheduler
 from .models import ChatMessage, MessageType
 from .screens import (
     HelpScreen,
@@ -249,8 +253,8 @@ class CodePuppyTUI(App):
 
         self._session_start_time = datetime.now()
 
-        # Background worker for periodic context updates during agent execution
-        self._context_update_worker = None
+        # Status bar and sidebar updates are batched to a few frames a second
+        self.refresh_scheduler = RefreshScheduler()
 
         # Track double-click timing for history list
         self._last_history_click_time = None
@@ -301,6 +305,7 @@ class CodePuppyTUI(App):
         from ticca.tui_state import set_tui_app_instance
 
         set_tui_app_instance(self)
+        self.refresh_scheduler.start()
 
         # Register all custom themes
         self._register_themes()
@@ -367,6 +372,11 @@ class CodePuppyTUI(App):
             self.run_worker(self.preload_agent_on_startup(), exclusive=False)
         self.set_timer(0.3, deferred_preload)
 
+        # Trim old sessions to the retention budgets in the background
+        from ticca.session_retention import start_retention_sweep
+
+        start_retention_sweep()
+
         # DO NOT auto-prompt for autosave on startup - user can use /resume or Ctrl+R
         # self.call_after_refresh(self.maybe_prompt_restore_autosave)
 
@@ -774,8 +784,10 @@ class CodePuppyTUI(App):
                 try:
                     agent = get_current_agent()
                     self.update_agent_progress("Processing", 50)
+                    response_stream = self._create_response_stream()
                     result = await agent.run_with_mcp(
                         message,
+                        event_stream_handler=response_stream,
                     )
 
                     if not result or not hasattr(result, "output"):
@@ -784,7 +796,9 @@ class CodePuppyTUI(App):
 
                     self.update_agent_progress("Processing", 75)
                     agent_response = result.output
-                    self.add_agent_message(agent_response)
+                    # Streamed responses are already on screen
+                    if not response_stream.shows(agent_response):
+                        self.add_agent_message(agent_response)
 
                     # Auto-save session if enabled (mirror --interactive)
                     from ticca.config import auto_save_session_if_enabled
@@ -826,6 +840,25 @@ class CodePuppyTUI(App):
             # Refocus the input field so the user can immediately continue typing
             self.call_after_refresh(self.focus_input_field)
 
+    def _create_response_stream(self) -> ResponseStream:
+        """Stream the agent's text and tool calls into the chat as they arrive."""
+        chat_view = self.query_one("#chat-view", ChatView)
+        stream_group = None
+
+        def on_text(text: str, new_block: bool) -> None:
+            nonlocal stream_group
+            if new_block or not chat_view.append_stream_text(stream_group, text):
+                stream_group = f"agent_stream_{uuid.uuid4()}"
+                self.add_agent_message(text, message_group=stream_group)
+
+        def on_tool_call(tool_name: str) -> None:
+            self.update_agent_progress("Busy")
+            self.add_system_message(f"[dim]🔧 {escape(tool_name)}[/dim]")
+
+        return ResponseStream(
+            on_text, on_tool_call, frame=self.refresh_scheduler.interval
+        )
+
     # Action methods
     def action_clear_chat(self) -> None:
         """Clear the chat history."""
@@ -1267,12 +1300,36 @@ class CodePuppyTUI(App):
         """Stop showing agent progress indicators."""
         self.set_agent_status("Ready", show_progress=False)
 
+    def publish_token_info(
+        self, current_tokens: int, max_tokens: int, proportion: float
+    ) -> None:
+        """Show the context usage in the status bar and sidebar.
+
+        Safe to call from any thread; repeated values are not repainted.
+        """
+        self.refresh_scheduler.update(
+            "token_info",
+            (current_tokens, max_tokens, round(proportion, 4)),
+            self._apply_token_info,
+        )
+
+    def _apply_token_info(self, token_info) -> None:
+        current_tokens, max_tokens, proportion = token_info
+        self.query_one(StatusBar).update_token_info(
+            current_tokens, max_tokens, proportion
+        )
+        try:
+            self.query_one(RightSidebar).update_context(current_tokens, max_tokens)
+            self.refresh_scheduler.forget("sidebar_context")
+        except Exception:
+            pass
+
     def _update_right_sidebar(self) -> None:
         """Update the right sidebar with current session information."""
         try:
             right_sidebar = self.query_one(RightSidebar)
 
-            # Get current agent and calculate tokens
+            # Get current agent and calculate tokens (estimates are cached per message)
             agent = get_current_agent()
             message_history = agent.get_message_history()
 
@@ -1293,59 +1350,33 @@ class CodePuppyTUI(App):
             else:
                 duration_str = f"{minutes}m"
 
-            # Update sidebar
-            right_sidebar.update_context(total_tokens, max_tokens)
-            right_sidebar.update_session_info(
-                message_count=len(message_history),
-                duration=duration_str,
-                model=self.current_model,
+            # Update sidebar on the next frame, skipping unchanged values
+            self.refresh_scheduler.update(
+                "sidebar_context",
+                (total_tokens, max_tokens),
+                lambda context: right_sidebar.update_context(*context),
+            )
+            self.refresh_scheduler.update(
+                "sidebar_session",
+                (len(message_history), duration_str, self.current_model),
+                lambda info: right_sidebar.update_session_info(
+                    message_count=info[0], duration=info[1], model=info[2]
+                ),
             )
 
         except Exception:
             pass  # Silently fail if right sidebar not available
 
-    async def _periodic_context_update(self) -> None:
-        """Periodically update context information while agent is busy."""
-        import asyncio
-
-        while self.agent_busy:
-            try:
-                # Update the right sidebar with current context
-                self._update_right_sidebar()
-
-                # Wait before next update (0.5 seconds for responsive updates)
-                await asyncio.sleep(0.5)
-            except asyncio.CancelledError:
-                # Task was cancelled, exit gracefully
-                break
-            except Exception:
-                # Silently handle any errors to avoid crashing the update loop
-                pass
-
     def _start_context_updates(self) -> None:
-        """Start periodic context updates during agent execution."""
-        # Cancel any existing update worker
-        if self._context_update_worker is not None:
-            try:
-                self._context_update_worker.cancel()
-            except Exception:
-                pass
+        """Refresh context information when agent execution starts.
 
-        # Start a new background worker for context updates
-        self._context_update_worker = self.run_worker(
-            self._periodic_context_update(), exclusive=False
-        )
+        Token usage during a run is pushed by the agent's history processor
+        through publish_token_info, so nothing is polled while it runs.
+        """
+        self._update_right_sidebar()
 
     def _stop_context_updates(self) -> None:
-        """Stop periodic context updates."""
-        if self._context_update_worker is not None:
-            try:
-                self._context_update_worker.cancel()
-            except Exception:
-                pass
-            self._context_update_worker = None
-
-        # Do a final update when stopping
+        """Refresh context information when agent execution ends."""
         self._update_right_sidebar()
 
     def on_resize(self, event: Resize) -> None:
@@ -1466,11 +1497,8 @@ class CodePuppyTUI(App):
             self._renderer_started = True
 
             # Process any buffered startup messages first
-            from io import StringIO
-
-            from rich.console import Console
-
             from ticca.messaging import get_buffered_startup_messages
+            from ticca.messaging.rich_text import render_to_text
 
             buffered_messages = get_buffered_startup_messages()
 
@@ -1483,16 +1511,7 @@ class CodePuppyTUI(App):
                         # Convert message content to string for grouping
                         if hasattr(message.content, "__rich_console__"):
                             # For Rich objects, render to plain text
-                            string_io = StringIO()
-                            # Use markup=False to prevent interpretation of square brackets as markup
-                            temp_console = Console(
-                                file=string_io,
-                                width=80,
-                                legacy_windows=False,
-                                markup=False,
-                            )
-                            temp_console.print(message.content)
-                            content_str = string_io.getvalue().rstrip("\n")
+                            content_str = render_to_text(message.content)
                         else:
                             content_str = str(message.content)
 
@@ -1521,11 +1540,10 @@ class CodePuppyTUI(App):
                 AUTOSAVE_DIR,
                 set_current_autosave_from_session_name,
             )
-            from ticca.session_storage import list_sessions, load_session
+            from ticca.session_storage import count_sessions, load_session
 
             base_dir = Path(AUTOSAVE_DIR)
-            sessions = list_sessions(base_dir)
-            if not sessions:
+            if not count_sessions(base_dir):
                 self.add_system_message("📭 No saved sessions available to resume")
                 return
 
@@ -1539,8 +1557,12 @@ class CodePuppyTUI(App):
                     # Load history and set into agent
                     from ticca.agents.agent_manager import get_current_agent
 
-                    history = load_session(result_name, base_dir)
                     agent = get_current_agent()
+                    history = load_session(
+                        result_name,
+                        base_dir,
+                        max_tokens=agent.get_history_token_budget(),
+                    )
                     agent.set_message_history(history)
 
                     # Set current autosave session id so subsequent autosaves overwrite this session
@@ -1553,15 +1575,11 @@ class CodePuppyTUI(App):
                     total_tokens = sum(
                         agent.estimate_tokens_for_message(msg) for msg in history
                     )
-                    try:
-                        status_bar = self.query_one(StatusBar)
-                        status_bar.update_token_info(
-                            total_tokens,
-                            agent.get_model_context_length(),
-                            total_tokens / max(1, agent.get_model_context_length()),
-                        )
-                    except Exception:
-                        pass
+                    self.publish_token_info(
+                        total_tokens,
+                        agent.get_model_context_length(),
+                        total_tokens / max(1, agent.get_model_context_length()),
+                    )
 
                     # Notify
                     session_path = base_dir / f"{result_name}.pkl"
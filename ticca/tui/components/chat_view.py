@@ -3,22 +3,54 @@ Chat view component for displaying conversation history.
 """
 
 import re
-from typing import List
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
 
-from rich.console import Group
+from rich.console import Group, RenderableType
 from rich.markdown import Markdown
 from rich.syntax import Syntax
 from rich.text import Text
-from textual.containers import Vertical, VerticalScroll
+from textual.containers import VerticalScroll
+from textual.widget import Widget
 from textual.widgets import Markdown as MarkdownWidget, MarkdownViewer, Static
 
+from ticca.messaging.rich_text import render_to_text
+
 from ..models import ChatMessage, MessageCategory, MessageType, get_message_category
+from .chunked_message import ChunkedMessage
 from .collapsible_thinking import CollapsibleThinking
 
 
 class SafeMarkdownViewer(MarkdownViewer):
     """Custom MarkdownViewer that handles link clicks safely without crashing."""
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._pending_markdown: list[str] = []
+        self._appending = False
+
+    def append_markdown(self, markdown: str) -> None:
+        """Append to the document, one `Markdown.append` at a time.
+
+        Each append parses on from where the previous one finished, so appends
+        that overlap repeat or lose blocks. Fragments arriving while an append
+        runs are joined into the next one.
+        """
+        self._pending_markdown.append(markdown)
+        if not self._appending:
+            self._appending = True
+            self.call_later(self._append_pending)
+
+    async def _append_pending(self) -> None:
+        try:
+            while self._pending_markdown:
+                markdown = "".join(self._pending_markdown)
+                self._pending_markdown.clear()
+                await self.document.append(markdown)
+        finally:
+            self._appending = False
+
     def on_markdown_link_clicked(self, message: MarkdownWidget.LinkClicked) -> None:
         """Handle link clicks with proper error handling."""
         # Stop the message from propagating to parent handlers
@@ -32,6 +64,22 @@ class SafeMarkdownViewer(MarkdownViewer):
         # - Show an error message for invalid links
 
 
+@dataclass
+class TranscriptEntry:
+    """A message box in the transcript.
+
+    Holds what is needed to rebuild the box's widget, which only exists while
+    the box is mounted.
+    """
+
+    message: ChatMessage
+    last_type: MessageType
+    # (chunks, markdown) of each message appended to the box
+    appended: list = field(default_factory=list)
+    message_count: int = 1
+    widget: Optional[Widget] = None
+
+
 class ChatView(VerticalScroll):
     """Main chat interface displaying conversation history."""
 
@@ -167,6 +215,12 @@ class ChatView(VerticalScroll):
         border: round $border;
     }
 
+    .trimmed-notice {
+        color: $text-muted;
+        padding: 0 2;
+        height: auto;
+    }
+
     .message-container {
         margin: 0 0 1 0;
         padding: 0;
@@ -179,17 +233,28 @@ class ChatView(VerticalScroll):
     }
     """
 
+    # Message boxes mounted at once; the rest are kept as TranscriptEntry records
+    MAX_MOUNTED_ENTRIES = 100
+    # Entries mounted at a time when scrolling close to the edge of the window
+    PAGE_SIZE = 25
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.messages: List[ChatMessage] = []
+        self.messages: Deque[ChatMessage] = deque()
         self.message_groups: dict = {}  # Track groups for visual grouping
-        self.group_widgets: dict = {}  # Track widgets by group_id for enhanced grouping
+        # Entry of each group's message box, for enhanced grouping
+        self.group_widgets: Dict[str, TranscriptEntry] = {}
+        self._entries: List[TranscriptEntry] = []
+        self._mounted_start = 0
+        self._mounted_end = 0
+        self._trimmed_count = 0  # Messages dropped by the history cap
+        self._trimmed_notice = None
         self._scroll_pending = False  # Track if scroll is already scheduled
+        self._paging_pending = False
+        # Set while the view moves its own window, whose scrolling isn't the user's
+        self._window_changing = False
         self._last_message_category = None  # Track last message category for combining
-        self._last_widget = None  # Track the last widget created for combining
-        self._last_combined_message = (
-            None  # Track the actual message we're combining into
-        )
+        self._last_entry = None  # Track the last message box for combining
 
     def _should_suppress_message(self, message: ChatMessage) -> bool:
         """Check if a message should be suppressed based on user settings."""
@@ -257,110 +322,91 @@ class ChatView(VerticalScroll):
 
         return Group(*rendered_parts)
 
+    def _chunk_for(self, content) -> RenderableType:
+        """Turn message content into a chunk, parsing markup in strings."""
+        if hasattr(content, "__rich_console__"):
+            return content
+        try:
+            return Text.from_markup(str(content))
+        except Exception:
+            return Text(str(content))
+
+    def _append_chunks(self, widget, chunks: list, markdown: str) -> bool:
+        """Append to a message widget without re-rendering what it already shows.
+
+        Chunked widgets get `chunks`; markdown viewers get `markdown` appended
+        to their document. Returns False if the widget can't be appended to.
+        """
+        if isinstance(widget, CollapsibleThinking):
+            widget = widget.content_widget
+        if isinstance(widget, ChunkedMessage):
+            for chunk in chunks:
+                widget.append(chunk)
+            return True
+        if isinstance(widget, SafeMarkdownViewer):
+            widget.append_markdown(markdown)
+            return True
+        return False
+
+    def _append_to_entry(
+        self, entry: TranscriptEntry, message: ChatMessage, chunks: list, markdown: str
+    ) -> bool:
+        """Add a message to an existing message box, mounted or not."""
+        if entry.widget is not None and not self._append_chunks(
+            entry.widget, chunks, markdown
+        ):
+            return False
+        # Kept so the box can be rebuilt after it has been unmounted
+        entry.appended.append((chunks, markdown))
+        entry.message_count += 1
+        self.messages.append(message)
+        self._schedule_scroll()
+        return True
+
     def _append_to_existing_group(self, message: ChatMessage) -> None:
         """Append a message to an existing group by group_id."""
-        if message.group_id not in self.group_widgets:
-            # If group doesn't exist, fall back to normal message creation
+        entry = self.group_widgets.get(message.group_id)
+        if entry is None:
             return
 
-        # Find the most recent message in this group to append to
-        group_widgets = self.group_widgets[message.group_id]
-        if not group_widgets:
+        # Add a separator line between different message types in the same group
+        last_type = entry.last_type
+        chunks = []
+        markdown_separator = "\n"
+        if message.type != last_type:
+            chunks.append(Text("─" * 40))
+            markdown_separator = "\n\n---\n\n"
+        chunks.append(self._chunk_for(message.content))
+
+        markdown = markdown_separator + str(message.content)
+        if not self._append_to_entry(entry, message, chunks, markdown):
+            import logging
+
+            logging.warning(
+                f"Cannot append to {type(entry.widget).__name__} in group {message.group_id}"
+            )
             return
-
-        # Get the last widget entry for this group
-        last_entry = group_widgets[-1]
-        last_message = last_entry["message"]
-        last_widget = last_entry["widget"]
-
-        # Create a separator for different message types in the same group
-        if message.type != last_message.type:
-            separator = "\n" + "─" * 40 + "\n"
-        else:
-            separator = "\n"
-
-        # Handle content concatenation carefully to preserve Rich objects
-        if hasattr(last_message.content, "__rich_console__") or hasattr(
-            message.content, "__rich_console__"
-        ):
-            # If either content is a Rich object, convert both to text and concatenate
-            from io import StringIO
-
-            from rich.console import Console
-
-            # Convert existing content to string
-            if hasattr(last_message.content, "__rich_console__"):
-                string_io = StringIO()
-                temp_console = Console(
-                    file=string_io, width=80, legacy_windows=False, markup=False
-                )
-                temp_console.print(last_message.content)
-                existing_content = string_io.getvalue().rstrip("\n")
-            else:
-                existing_content = str(last_message.content)
-
-            # Convert new content to string
-            if hasattr(message.content, "__rich_console__"):
-                string_io = StringIO()
-                temp_console = Console(
-                    file=string_io, width=80, legacy_windows=False, markup=False
-                )
-                temp_console.print(message.content)
-                new_content = string_io.getvalue().rstrip("\n")
-            else:
-                new_content = str(message.content)
-
-            # Combine as plain text
-            last_message.content = existing_content + separator + new_content
-        else:
-            # Both are strings, safe to concatenate
-            last_message.content += separator + message.content
-
-        # Update the widget based on message type
-        if last_message.type == MessageType.AGENT_RESPONSE:
-            # Re-render agent response with updated content as markdown
-            try:
-                # For SafeMarkdownViewer, we need to update the markdown property
-                if isinstance(last_widget, SafeMarkdownViewer):
-                    # Access the internal Markdown widget and update its content
-                    # Note: This might need adjustment depending on MarkdownViewer's API
-                    last_widget.document.update_source(last_message.content)
-                else:
-                    # Fallback for Static widgets
-                    md = Markdown(last_message.content)
-                    last_widget.update(md)
-            except Exception:
-                if isinstance(last_widget, Static):
-                    last_widget.update(Text(last_message.content))
-        else:
-            # Handle other message types
-            # After the content concatenation above, content is always a string
-            # Try to parse markup when safe to do so
-            try:
-                # Try to parse as markup first - this handles rich styling correctly
-                last_widget.update(Text.from_markup(last_message.content))
-            except Exception as e:
-                # If markup parsing fails, log and try alternative approaches
-                import logging
-                logging.warning(f"Markup parsing failed in _append_to_existing_group: {e}")
-                logging.warning(f"Content preview: {last_message.content[:200]}")
-
-                # Try to render with markup enabled on the Static widget directly
-                try:
-                    # Create a new Text with markup, but with better error tolerance
-                    last_widget.update(Text.from_markup(last_message.content, style=""))
-                except Exception:
-                    # Last resort: render as plain text
-                    # But this will show raw markup tags
-                    last_widget.update(Text(last_message.content))
-
-        # Add the new message to our tracking lists
-        self.messages.append(message)
+        entry.last_type = message.type
         if message.group_id in self.message_groups:
             self.message_groups[message.group_id].append(message)
 
-        # Auto-scroll to bottom with refresh to fix scroll bar issues (debounced)
+    def append_stream_text(self, group_id: str, text: str) -> bool:
+        """Append streamed text to a group's message box as is.
+
+        Unlike messages added to a group, the text continues the box's
+        content without a separator. Returns False if the group has no box.
+        """
+        entry = self.group_widgets.get(group_id)
+        if entry is None:
+            return False
+        chunks = [Text(text)]
+        if entry.widget is not None and not self._append_chunks(
+            entry.widget, chunks, text
+        ):
+            return False
+        entry.appended.append((chunks, text))
         self._schedule_scroll()
+        return True
 
     def add_message(self, message: ChatMessage) -> None:
         """Add a new message to the chat view."""
@@ -377,153 +423,58 @@ class ChatView(VerticalScroll):
             self._last_message_category = message_category
             return
 
-        # Old logic for consecutive grouping (keeping as fallback)
-        if (
-            message.group_id is not None
-            and self.messages
-            and self.messages[-1].group_id == message.group_id
-        ):
-            # This case should now be handled by _append_to_existing_group above
-            # but keeping for safety
-            self._append_to_existing_group(message)
-            self._last_message_category = message_category
-            return
-
         # Category-based combining - combine consecutive messages of same category
-
+        last_entry = self._last_entry
         if (
-            self.messages
+            last_entry is not None
             and self._last_message_category == message_category
-            and self._last_widget is not None  # Make sure we have a widget to update
-            and self._last_combined_message
-            is not None  # Make sure we have a message to combine into
             and message_category
             != MessageCategory.AGENT_RESPONSE  # Don't combine agent responses (they're complete answers)
         ):
-            # SAME CATEGORY: Add to existing container
-            last_message = (
-                self._last_combined_message
-            )  # Use tracked message, not messages[-1]
-
-            # Create a separator for different message types within the same category
-            if message.type != last_message.type:
-                # Different types but same category - add a visual separator
-                separator = f"\n\n[dim]── {message.type.value.replace('_', ' ').title()} ──[/dim]\n"
+            # Separate from the previous message with a blank line, plus a
+            # heading for different message types within the same category
+            if message.type != last_entry.last_type:
+                heading = message.type.value.replace("_", " ").title()
+                chunks = [Text(""), Text.from_markup(f"[dim]── {heading} ──[/dim]")]
+                markdown_separator = f"\n\n*── {heading} ──*\n\n"
             else:
-                # Same type - simple spacing
-                separator = "\n\n"
-
-            # Append content to the last message
-            if hasattr(last_message.content, "__rich_console__") or hasattr(
-                message.content, "__rich_console__"
-            ):
-                # Handle Rich objects by converting to strings
-                from io import StringIO
-                from rich.console import Console
-
-                # Convert existing content to string
-                if hasattr(last_message.content, "__rich_console__"):
-                    string_io = StringIO()
-                    temp_console = Console(
-                        file=string_io, width=80, legacy_windows=False, markup=False
-                    )
-                    temp_console.print(last_message.content)
-                    existing_content = string_io.getvalue().rstrip("\n")
-                else:
-                    existing_content = str(last_message.content)
-
-                # Convert new content to string
-                if hasattr(message.content, "__rich_console__"):
-                    string_io = StringIO()
-                    temp_console = Console(
-                        file=string_io, width=80, legacy_windows=False, markup=False
-                    )
-                    temp_console.print(message.content)
-                    new_content = string_io.getvalue().rstrip("\n")
-                else:
-                    new_content = str(message.content)
-
-                # Combine as plain text
-                last_message.content = existing_content + separator + new_content
-            else:
-                # Both are strings, safe to concatenate
-                last_message.content += separator + message.content
+                chunks = [Text("")]
+                markdown_separator = "\n\n"
+            chunks.append(self._chunk_for(message.content))
 
-            # Update the tracked widget with the combined content
-            if self._last_widget is not None:
-                try:
-                    # Update the widget with the new combined content
-                    self._last_widget.update(Text.from_markup(last_message.content))
-                    # Force layout recalculation so the container grows
-                    self._last_widget.refresh(layout=True)
-                except Exception as e:
-                    # If markup parsing fails, log and fall back
-                    import logging
-                    logging.warning(f"Markup parsing failed in category-based combining: {e}")
-                    logging.warning(f"Content preview: {last_message.content[:200]}")
-
-                    try:
-                        # Try with empty style to be more tolerant
-                        self._last_widget.update(Text.from_markup(last_message.content, style=""))
-                        # Force layout recalculation so the container grows
-                        self._last_widget.refresh(layout=True)
-                    except Exception:
-                        # Last resort: render as plain text (will show raw markup)
-                        try:
-                            self._last_widget.update(Text(last_message.content))
-                            # Force layout recalculation so the container grows
-                            self._last_widget.refresh(layout=True)
-                        except Exception:
-                            # If update fails, create a new widget instead
-                            pass
-
-            # Add to messages list but don't create a new widget
-            self.messages.append(message)
-            # Refresh the entire view to ensure proper layout
-            self.refresh(layout=True)
-            self._schedule_scroll()
-            return
+            markdown = markdown_separator + str(message.content)
+            if self._append_to_entry(last_entry, message, chunks, markdown):
+                last_entry.last_type = message.type
+                return
 
         # DIFFERENT CATEGORY: Create new container
-        # Reset tracking so we don't accidentally update the wrong widget
-        if self._last_message_category != message_category:
-            self._last_widget = None
-            self._last_message_category = None
-            self._last_combined_message = None
+        entry = TranscriptEntry(message=message, last_type=message.type)
+        self._add_entry(entry)
 
-        # Add to messages list
-        self.messages.append(message)
+        # Track the entry and its category for future combining
+        self._last_entry = entry
+        self._last_message_category = message_category
 
-        # Track groups for potential future use
-        if message.group_id:
-            if message.group_id not in self.message_groups:
-                self.message_groups[message.group_id] = []
-            self.message_groups[message.group_id].append(message)
+    def _build_widget(self, message: ChatMessage, markdown_suffix: str = ""):
+        """Create the widget for a message box.
 
-        # Create the message widget
+        `markdown_suffix` is markdown appended to the box since it was
+        created; it only applies to boxes rendered as markdown.
+        """
         css_class = f"{message.type.value}-message"
 
         if message.type == MessageType.USER:
             # User message with border title
-            message_widget = Static(Text(message.content), classes=css_class)
+            message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = "USER"
-            # Mount the message
-            self.mount(message_widget)
-            # Track the widget for potential combining
-            self._last_widget = message_widget
-            # Track the category of this message for future combining
-            self._last_message_category = message_category
-            # Track the actual message for combining
-            self._last_combined_message = message
-            # Auto-scroll to bottom
-            self._schedule_scroll()
-            return
         elif message.type == MessageType.AGENT:
             # Agent message with border title
             try:
-                message_widget = Static(Text.from_markup(message.content), classes=css_class)
+                message_widget = ChunkedMessage(
+                    Text.from_markup(message.content), classes=css_class
+                )
             except Exception:
-                message_widget = Static(Text(message.content), classes=css_class)
+                message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = "AGENT"
 
         elif message.type == MessageType.SYSTEM:
@@ -532,32 +483,24 @@ class ChatView(VerticalScroll):
                 # Check if it's a Markdown object - if so, use MarkdownViewer
                 if isinstance(message.content, Markdown):
                     # Convert Rich Markdown to string and use MarkdownViewer
-                    from io import StringIO
-                    from rich.console import Console
-
-                    string_io = StringIO()
-                    temp_console = Console(
-                        file=string_io, width=80, legacy_windows=False, markup=False
-                    )
-                    temp_console.print(message.content)
-                    markdown_content = string_io.getvalue().rstrip("\n")
+                    markdown_content = render_to_text(message.content)
 
                     message_widget = SafeMarkdownViewer(
-                        markdown_content,
+                        markdown_content + markdown_suffix,
                         show_table_of_contents=False,
                         classes=css_class
                     )
                 else:
                     # Render other Rich objects directly
-                    message_widget = Static(message.content, classes=css_class)
+                    message_widget = ChunkedMessage(message.content, classes=css_class)
             else:
                 # Try to render markup
                 try:
-                    message_widget = Static(
+                    message_widget = ChunkedMessage(
                         Text.from_markup(message.content), classes=css_class
                     )
                 except Exception:
-                    message_widget = Static(Text(message.content), classes=css_class)
+                    message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = "SYSTEM"
 
         elif message.type == MessageType.AGENT_REASONING:
@@ -565,10 +508,10 @@ class ChatView(VerticalScroll):
             # Handle both Rich objects (like Markdown) and plain strings
             if hasattr(message.content, "__rich_console__"):
                 # Rich object (Markdown, Table, etc.) - render directly
-                content_widget = Static(message.content)
+                content_widget = ChunkedMessage(message.content)
             else:
                 # Plain string - convert to Text
-                content_widget = Static(Text(str(message.content)))
+                content_widget = ChunkedMessage(Text(str(message.content)))
 
             message_widget = CollapsibleThinking(
                 title="💭 Agent Reasoning",
@@ -580,10 +523,10 @@ class ChatView(VerticalScroll):
             # Handle both Rich objects (like Markdown) and plain strings
             if hasattr(message.content, "__rich_console__"):
                 # Rich object (Markdown, Table, etc.) - render directly
-                content_widget = Static(message.content)
+                content_widget = ChunkedMessage(message.content)
             else:
                 # Plain string - convert to Text
-                content_widget = Static(Text(str(message.content)))
+                content_widget = ChunkedMessage(Text(str(message.content)))
 
             message_widget = CollapsibleThinking(
                 title="📋 Planned Next Steps",
@@ -592,7 +535,7 @@ class ChatView(VerticalScroll):
             )
         elif message.type == MessageType.AGENT_RESPONSE:
             # Agent response with border title - use MarkdownViewer
-            content = message.content
+            content = message.content + markdown_suffix
 
             try:
                 # Render as markdown with SafeMarkdownViewer (no table of contents)
@@ -606,99 +549,225 @@ class ChatView(VerticalScroll):
                 message_widget = Static(Text(content), classes=css_class)
 
             message_widget.border_title = "AGENT RESPONSE"
-
-            # Mount the message
-            self.mount(message_widget)
-
-            # Track this widget for potential combining
-            self._last_widget = message_widget
-            # Track the category of this message for future combining
-            self._last_message_category = message_category
-            # Track the actual message for combining
-            self._last_combined_message = message
-
-            # Track widget for group-based updates
-            if message.group_id:
-                if message.group_id not in self.group_widgets:
-                    self.group_widgets[message.group_id] = []
-                self.group_widgets[message.group_id].append(
-                    {
-                        "message": message,
-                        "widget": message_widget,
-                    }
-                )
-
-            # Auto-scroll to bottom with refresh to fix scroll bar issues (debounced)
-            self._schedule_scroll()
-            return
         elif message.type == MessageType.INFO:
             # Info message with border title
-            message_widget = Static(Text(message.content), classes=css_class)
+            message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = "INFO"
         elif message.type == MessageType.SUCCESS:
             # Success message with border title
-            message_widget = Static(Text(message.content), classes=css_class)
+            message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = "SUCCESS"
         elif message.type == MessageType.WARNING:
             # Warning message with border title
-            message_widget = Static(Text(message.content), classes=css_class)
+            message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = "WARNING"
         elif message.type == MessageType.TOOL_OUTPUT:
             # Tool output message with border title
-            message_widget = Static(Text(message.content), classes=css_class)
+            message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = "TOOL OUTPUT"
         elif message.type == MessageType.COMMAND_OUTPUT:
             # Command output message with border title
-            message_widget = Static(Text(message.content), classes=css_class)
+            message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = "COMMAND OUTPUT"
         else:  # ERROR and fallback
             # Error/unknown message with border title
             header_text = "ERROR" if message.type == MessageType.ERROR else "UNKNOWN"
-            message_widget = Static(Text(message.content), classes=css_class)
+            message_widget = ChunkedMessage(Text(message.content), classes=css_class)
             message_widget.border_title = header_text
 
-        # Mount the message widget
-        self.mount(message_widget)
+        return message_widget
+
+    def _create_widget(self, entry: TranscriptEntry):
+        """Create the widget for an entry, including everything appended to it."""
+        markdown_suffix = "".join(markdown for _, markdown in entry.appended)
+        widget = self._build_widget(entry.message, markdown_suffix)
+        if not isinstance(widget, SafeMarkdownViewer):
+            for chunks, markdown in entry.appended:
+                self._append_chunks(widget, chunks, markdown)
+        return widget
 
-        # Track this widget for potential combining
-        self._last_widget = message_widget
+    # Transcript window: entries[_mounted_start:_mounted_end] have widgets
+
+    def _add_entry(self, entry: TranscriptEntry) -> None:
+        """Add a message box at the end of the transcript and show it."""
+        message = entry.message
+        self._entries.append(entry)
+        self.messages.append(message)
 
-        # Track the widget for group-based updates
+        # Track groups for potential future use
         if message.group_id:
-            if message.group_id not in self.group_widgets:
-                self.group_widgets[message.group_id] = []
-            self.group_widgets[message.group_id].append(
-                {
-                    "message": message,
-                    "widget": message_widget,
-                }
-            )
+            if message.group_id not in self.message_groups:
+                self.message_groups[message.group_id] = []
+            self.message_groups[message.group_id].append(message)
+            # Later messages of the group are appended to this box
+            self.group_widgets[message.group_id] = entry
+
+        if self._mounted_end == len(self._entries) - 1:
+            # The window already reaches the end; extend it by this entry
+            self._mount_range(self._mounted_end, len(self._entries))
+            self._mounted_end = len(self._entries)
+            excess = self._mounted_end - self._mounted_start - self.MAX_MOUNTED_ENTRIES
+            if excess > 0:
+                self._unmount_range(self._mounted_start, self._mounted_start + excess)
+                self._mounted_start += excess
+        else:
+            # The user scrolled back through history; jump to the new message
+            self._show_tail()
+
+        self._trim_history()
+        self._update_trimmed_notice()
 
+        # Unmounted entries and the scroll to the end move scroll_y; that must
+        # not be mistaken for the user scrolling through history
+        self._window_changing = True
         # Auto-scroll to bottom with refresh to fix scroll bar issues (debounced)
         self._schedule_scroll()
 
-        # Track the category of this message for future combining
-        self._last_message_category = message_category
-        # Track the actual message for combining (use the message we just added)
-        self._last_combined_message = self.messages[-1] if self.messages else None
+    def _mount_range(self, start: int, end: int, before=None) -> None:
+        widgets = []
+        for entry in self._entries[start:end]:
+            entry.widget = self._create_widget(entry)
+            widgets.append(entry.widget)
+        if widgets:
+            if before is None:
+                self.mount_all(widgets)
+            else:
+                self.mount_all(widgets, before=before)
+
+    def _unmount_range(self, start: int, end: int) -> None:
+        for entry in self._entries[start:end]:
+            if entry.widget is not None:
+                entry.widget.remove()
+                entry.widget = None
+
+    def _show_tail(self) -> None:
+        """Mount the last page of the transcript in place of the current window."""
+        self._unmount_range(self._mounted_start, self._mounted_end)
+        self._mounted_start = max(0, len(self._entries) - self.PAGE_SIZE)
+        self._mounted_end = len(self._entries)
+        self._mount_range(self._mounted_start, self._mounted_end)
+
+    def _trim_history(self) -> None:
+        """Drop the oldest entries once more messages are kept than configured.
+
+        Only the on-screen transcript is trimmed; the conversation itself is
+        kept in the agent's history and the autosaved session.
+        """
+        from ticca.config import get_tui_transcript_max_messages
+
+        limit = get_tui_transcript_max_messages()
+        # Trim a page at a time so trimming isn't done for every new message
+        if not limit or len(self.messages) <= limit + self.PAGE_SIZE:
+            return
+
+        drop = 0
+        dropped_messages = 0
+        # Never drop the newest entry, however many messages it holds
+        while (
+            drop < len(self._entries) - 1
+            and len(self.messages) - dropped_messages > limit
+        ):
+            dropped_messages += self._entries[drop].message_count
+            drop += 1
+        if not drop:
+            return
+
+        self._unmount_range(0, min(drop, self._mounted_end))
+        for entry in self._entries[:drop]:
+            group_id = entry.message.group_id
+            if group_id and self.group_widgets.get(group_id) is entry:
+                del self.group_widgets[group_id]
+                self.message_groups.pop(group_id, None)
+            if entry is self._last_entry:
+                self._last_entry = None
+        del self._entries[:drop]
+        for _ in range(dropped_messages):
+            self.messages.popleft()
+        self._mounted_start = max(0, self._mounted_start - drop)
+        self._mounted_end = max(self._mounted_start, self._mounted_end - drop)
+        if self._mounted_start == self._mounted_end:
+            self._show_tail()
+        self._trimmed_count += dropped_messages
+
+    def _update_trimmed_notice(self) -> None:
+        if not self._trimmed_count:
+            return
+        text = Text(
+            f"⋯ {self._trimmed_count} earlier messages were removed from this view "
+            "(the conversation is kept in the autosaved session)",
+            style="dim",
+        )
+        if self._trimmed_notice is None:
+            self._trimmed_notice = Static(text, classes="trimmed-notice")
+            self.mount(self._trimmed_notice, before=0)
+        else:
+            self._trimmed_notice.update(text)
+        # Only shown once the user has scrolled back to the oldest kept entry
+        self._trimmed_notice.display = self._mounted_start == 0
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if not self._window_changing and not self._paging_pending:
+            self._paging_pending = True
+            self.call_after_refresh(self._page_window)
+
+    def _page_window(self) -> None:
+        """Mount the next page of entries when scrolled close to an edge of the window."""
+        self._paging_pending = False
+        if self._window_changing:
+            return
+        margin = self.size.height
+        start, end = self._mounted_start, self._mounted_end
+
+        if self.scroll_y <= margin and start > 0:
+            # Scrolled up: mount earlier entries, unmount from the bottom
+            anchor = self._entries[start].widget
+            offset = anchor.virtual_region.y - self.scroll_y
+            new_start = max(0, start - self.PAGE_SIZE)
+            self._mount_range(new_start, start, before=anchor)
+            self._mounted_start = new_start
+            excess = end - new_start - self.MAX_MOUNTED_ENTRIES
+            if excess > 0:
+                self._unmount_range(end - excess, end)
+                self._mounted_end = end - excess
+        elif self.max_scroll_y - self.scroll_y <= margin and end < len(self._entries):
+            # Scrolled down: mount later entries, unmount from the top
+            anchor = self._entries[end - 1].widget
+            offset = anchor.virtual_region.y - self.scroll_y
+            new_end = min(len(self._entries), end + self.PAGE_SIZE)
+            self._mount_range(end, new_end)
+            self._mounted_end = new_end
+            excess = new_end - start - self.MAX_MOUNTED_ENTRIES
+            if excess > 0:
+                self._unmount_range(start, start + excess)
+                self._mounted_start = start + excess
+        else:
+            return
+
+        self._update_trimmed_notice()
+        self._window_changing = True
+
+        def restore_position() -> None:
+            # Keep the entry the user was looking at in the same place on screen
+            self.scroll_to(y=anchor.virtual_region.y - offset, animate=False, immediate=True)
+            self._window_changing = False
+
+        self.call_after_refresh(restore_position)
 
     def clear_messages(self) -> None:
         """Clear all messages from the chat view."""
         self.messages.clear()
         self.message_groups.clear()  # Clear groups too
         self.group_widgets.clear()  # Clear widget tracking too
+        self._entries.clear()
+        self._mounted_start = self._mounted_end = 0
+        self._trimmed_count = 0
+        self._trimmed_notice = None
+        self._window_changing = False
         self._last_message_category = None  # Reset category tracking
-        self._last_widget = None  # Reset widget tracking
-        self._last_combined_message = None  # Reset combined message tracking
-        # Remove all message widgets (Static, SafeMarkdownViewer, Vertical containers, and CollapsibleThinking)
-        for widget in self.query(Static):
-            widget.remove()
-        for widget in self.query(SafeMarkdownViewer):
-            widget.remove()
-        for widget in self.query(Vertical):
-            widget.remove()
-        for widget in self.query(CollapsibleThinking):
-            widget.remove()
+        self._last_entry = None  # Reset combining target
+        # Remove all message widgets (mounted entries and the trimmed notice)
+        self.remove_children()
 
     def _schedule_scroll(self) -> None:
         """Schedule a scroll operation, avoiding duplicate calls."""
@@ -709,4 +778,5 @@ class ChatView(VerticalScroll):
     def _do_scroll(self) -> None:
         """Perform the actual scroll operation."""
         self._scroll_pending = False
-        self.scroll_end(animate=False)
+        self.scroll_end(animate=False, immediate=True)
+        self._window_changing = False
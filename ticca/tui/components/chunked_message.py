@@ -0,0 +1,88 @@
+"""
+Append-only message widget for grouped and combined chat messages.
+"""
+
+from typing import List
+
+from rich.console import RenderableType
+from rich.segment import Segment
+from rich.text import Text
+from textual.strip import Strip
+from textual.widget import Widget
+
+
+class ChunkedMessage(Widget):
+    """A message body built from chunks that can be appended to cheaply.
+
+    Each chunk is rendered to lines once, at the current width, and kept;
+    appending renders only the new chunk instead of re-parsing and re-laying
+    out everything shown so far. Chunks are only re-rendered when the width
+    changes. Every chunk starts on a new line.
+    """
+
+    DEFAULT_CSS = """
+    ChunkedMessage {
+        height: auto;
+    }
+    """
+
+    def __init__(self, *chunks: RenderableType, **kwargs):
+        super().__init__(**kwargs)
+        self.chunks: List[RenderableType] = []
+        self._lines: List[Strip] = []
+        self._render_width = 0
+        for chunk in chunks:
+            self.append(chunk)
+
+    @property
+    def plain(self) -> str:
+        """The text of all chunks (Rich objects other than Text are skipped)."""
+        return "\n".join(
+            chunk.plain for chunk in self.chunks if isinstance(chunk, Text)
+        )
+
+    def append(self, chunk: RenderableType) -> None:
+        """Add a chunk below the existing ones; strings are added as plain text."""
+        if isinstance(chunk, str):
+            chunk = Text(chunk)
+        self.chunks.append(chunk)
+        if self._render_width and self.is_mounted:
+            self._lines.extend(self._render_chunk(chunk, self._render_width))
+            self.refresh(layout=True)
+
+    def _render_chunk(self, chunk: RenderableType, width: int) -> List[Strip]:
+        console = self.app.console
+        options = console.options.update_width(width)
+        if isinstance(chunk, Text):
+            options = options.update(no_wrap=False, overflow="fold")
+        lines = console.render_lines(chunk, options, pad=False)
+        return [Strip(Segment.simplify(line)) for line in lines]
+
+    def _ensure_rendered(self, width: int) -> None:
+        if width == self._render_width:
+            return
+        self._render_width = width
+        self._lines = [
+            line for chunk in self.chunks for line in self._render_chunk(chunk, width)
+        ]
+
+    def get_content_width(self, container, viewport) -> int:
+        return container.width
+
+    def get_content_height(self, container, viewport, width: int) -> int:
+        if not width:
+            return 0
+        self._ensure_rendered(width)
+        return len(self._lines)
+
+    def render_line(self, y: int) -> Strip:
+        width = self.content_size.width
+        if width:
+            self._ensure_rendered(width)
+        if y >= len(self._lines):
+            return Strip.blank(width, self.rich_style)
+        return (
+            self._lines[y]
+            .crop_extend(0, width, self.rich_style)
+            .apply_style(self.rich_style)
+        )
@@ -2,16 +2,105 @@
 File tree panel component for the left sidebar.
 """
 
+import os
 from pathlib import Path
+from typing import Iterator, Set
+
 from textual import on
 from textual.widgets import DirectoryTree, Static
 from textual.containers import Container
 from textual.app import ComposeResult
 from textual.message import Message
+from textual.worker import Worker
+
+from ticca.directory_cache import DirectoryCache, get_directory_cache
+
+# Seconds to wait for more changes before reloading changed directories
+RELOAD_DELAY = 0.2
+
+
+class CachedDirectoryTree(DirectoryTree):
+    """DirectoryTree that lists directories through the shared DirectoryCache.
+
+    Ignored directories (DIR_IGNORE_PATTERNS) are left out, and directories
+    already loaded are reloaded when they change on disk.
+    """
+
+    class DirectoryChanged(Message):
+        """A directory listed by the tree changed on disk."""
+
+        def __init__(self, path: str) -> None:
+            self.path = path
+            super().__init__()
+
+    def __init__(self, path: str | Path, cache: DirectoryCache | None = None, **kwargs):
+        self.cache = cache or get_directory_cache()
+        self._changed: Set[str] = set()
+        # Before the first directory is listed, so that it gets watched
+        self.cache.enable_watching()
+        super().__init__(path, **kwargs)
+
+    def on_mount(self) -> None:
+        self.cache.add_listener(self._on_directory_changed)
+
+    def on_unmount(self) -> None:
+        self.cache.remove_listener(self._on_directory_changed)
+
+    def _directory_content(self, location: Path, worker: Worker) -> Iterator[Path]:
+        # Runs in the tree's loader thread
+        try:
+            entries = self.cache.list_dir(str(location))
+        except OSError:
+            return
+        for entry in entries:
+            if worker.is_cancelled:
+                break
+            yield Path(entry.path)
+
+    def _safe_is_dir(self, path: Path) -> bool:
+        # Known from the listing, so sorting and adding nodes needs no stat
+        is_dir = self.cache.is_dir(str(path))
+        if is_dir is None:
+            return DirectoryTree._safe_is_dir(path)
+        return is_dir
+
+    def _on_directory_changed(self, path: str) -> None:
+        # Called from the watcher's thread; post_message is thread-safe
+        self.post_message(self.DirectoryChanged(path))
+
+    def on_cached_directory_tree_directory_changed(
+        self, event: "CachedDirectoryTree.DirectoryChanged"
+    ) -> None:
+        event.stop()
+        if not self._changed:
+            self.set_timer(RELOAD_DELAY, self._reload_changed)
+        self._changed.add(os.path.realpath(event.path))
+
+    def _reload_changed(self) -> None:
+        """Reload the loaded directories that changed on disk."""
+        changed, self._changed = self._changed, set()
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            if node.data is None or not node.data.loaded:
+                continue
+            if os.path.realpath(node.data.path) not in changed:
+                nodes.extend(node.children)
+            elif node.is_expanded:
+                self.reload_node(node)
+            else:
+                # Listed again when it is next expanded
+                node.data.loaded = False
+                node.remove_children()
 
 
 class FileTreePanel(Container):
-    """Left sidebar panel showing file/folder tree."""
+    """Left sidebar panel showing file/folder tree.
+
+    Live refresh as files change needs watchdog, installed with the
+    `ticca[watch]` extra; without it the tree only picks up changes when it is
+    reloaded (see refresh_tree).
+    """
 
     DEFAULT_CSS = """
     FileTreePanel {
@@ -73,7 +162,7 @@ class FileTreePanel(Container):
         Yields:
             Child widgets
         """
-        yield DirectoryTree(self.working_directory, id="file-tree")
+        yield CachedDirectoryTree(self.working_directory, id="file-tree")
 
     def get_tree(self) -> DirectoryTree:
         """Get the directory tree widget.
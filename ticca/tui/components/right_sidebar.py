@@ -134,6 +134,7 @@ class RightSidebar(Container):
         super().__init__(**kwargs)
         self.id = "right-sidebar"
         self._agent_options = []
+        self._displayed_status = None
 
     def compose(self) -> ComposeResult:
         """Compose the sidebar layout."""
@@ -161,7 +162,7 @@ class RightSidebar(Container):
         yield RichLog(id="status-display", wrap=True, highlight=True)
 
     def on_mount(self) -> None:
-        """Initialize the sidebar and start auto-refresh."""
+        """Initialize the sidebar."""
         # Hide agent selector if Easy Mode is enabled
         try:
             from ticca.config import get_easy_mode
@@ -183,8 +184,6 @@ class RightSidebar(Container):
             pass
 
         self._update_display()
-        # Auto-refresh every second for live updates
-        self.set_interval(1.0, self._update_display)
 
     def watch_context_used(self) -> None:
         """Update display when context usage changes."""
@@ -229,19 +228,6 @@ class RightSidebar(Container):
             # Widget not ready yet
             return
 
-        # Check if user is at the bottom before updating
-        # Only auto-scroll if they're already at the bottom (or within 2 lines of it)
-        is_at_bottom = False
-        try:
-            # Check if scroll position is at or very close to the bottom
-            scroll_offset = status_display.scroll_offset
-            max_scroll = status_display.max_scroll_y
-            # Consider "at bottom" if within 2 lines of the bottom
-            is_at_bottom = (max_scroll - scroll_offset.y) <= 2
-        except Exception:
-            # If we can't determine scroll position, assume we should scroll
-            is_at_bottom = True
-
         status_text = Text()
 
         # Active Agent Section
@@ -256,6 +242,24 @@ class RightSidebar(Container):
             model_display = model_display[:25] + "..."
         status_text.append(f"  {model_display}\n", style="cyan")
 
+        # Nothing to repaint if what is shown has not changed
+        if status_text == self._displayed_status:
+            return
+        self._displayed_status = status_text
+
+        # Check if user is at the bottom before updating
+        # Only auto-scroll if they're already at the bottom (or within 2 lines of it)
+        is_at_bottom = False
+        try:
+            # Check if scroll position is at or very close to the bottom
+            scroll_offset = status_display.scroll_offset
+            max_scroll = status_display.max_scroll_y
+            # Consider "at bottom" if within 2 lines of the bottom
+            is_at_bottom = (max_scroll - scroll_offset.y) <= 2
+        except Exception:
+            # If we can't determine scroll position, assume we should scroll
+            is_at_bottom = True
+
         # Clear and write to RichLog
         status_display.clear()
         status_display.write(status_text)
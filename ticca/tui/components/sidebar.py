@@ -3,7 +3,9 @@ Sidebar component with history tab.
 """
 
 import time
+from typing import Dict, List
 
+from rich.text import Text
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import Container
@@ -16,6 +18,43 @@ from ..components.command_history_modal import CommandHistoryModal
 from ..models.command_history import HistoryFileReader
 
 
+class HistoryCommandLabel(Label):
+    """The label of a command history entry.
+
+    Its text is formatted when it is first rendered, so entries scrolled out
+    of view cost nothing but the widgets.
+    """
+
+    def __init__(self, entry: Dict[str, str], reader: HistoryFileReader, **kwargs):
+        super().__init__(**kwargs)
+        self._entry = entry
+        self._reader = reader
+        self._text = None
+
+    def render(self) -> Text:
+        if self._text is None:
+            # Format timestamp for display
+            time_display = self._reader.format_timestamp(self._entry["timestamp"])
+
+            # Truncate command for display if needed
+            display_text = self._entry["command"]
+            if len(display_text) > 60:
+                display_text = display_text[:57] + "..."
+
+            self._text = Text(f"[{time_display}] {display_text}")
+        return self._text
+
+
+class HistoryItem(ListItem):
+    """A command history list entry."""
+
+    def __init__(self, entry: Dict[str, str], reader: HistoryFileReader, **kwargs):
+        super().__init__(
+            HistoryCommandLabel(entry, reader, classes="history-command"), **kwargs
+        )
+        self.command_entry = entry
+
+
 class Sidebar(Container):
     """Sidebar with session history."""
 
@@ -185,11 +224,13 @@ class Sidebar(Container):
                 event.prevent_default()
 
     def load_command_history(self) -> None:
-        """Load command history from file into the history list."""
+        """Load command history from file into the history list.
+
+        Only entries added since the last load are inserted; the list is
+        rebuilt when it no longer matches the history file.
+        """
         try:
-            # Clear existing items
             history_list = self.query_one("#history-list", ListView)
-            history_list.clear()
 
             # Get command history entries (limit to last 50)
             entries = self.history_reader.read_history(max_entries=50)
@@ -211,45 +252,18 @@ class Sidebar(Container):
                 if not any(command.startswith(cli_cmd) for cli_cmd in cli_commands):
                     filtered_entries.append(entry)
 
+            if not self._update_history_items(history_list, filtered_entries):
+                self._rebuild_history_items(history_list, filtered_entries)
+
             # Store filtered entries centrally
             self.history_entries = filtered_entries
 
             # Reset history index
             self.current_history_index = 0
 
-            if not filtered_entries:
-                # No history available (after filtering)
-                history_list.append(
-                    ListItem(Label("No command history", classes="history-empty"))
-                )
-                return
-
-            # Add filtered entries to the list (most recent first)
-            for entry in filtered_entries:
-                timestamp = entry["timestamp"]
-                command = entry["command"]
-
-                # Format timestamp for display
-                time_display = self.history_reader.format_timestamp(timestamp)
-
-                # Truncate command for display if needed
-                display_text = command
-                if len(display_text) > 60:
-                    display_text = display_text[:57] + "..."
-
-                # Create list item
-                label = Label(
-                    f"[{time_display}] {display_text}", classes="history-command"
-                )
-                list_item = ListItem(label)
-                list_item.command_entry = entry
-                history_list.append(list_item)
-
             # Focus on the most recent command (first in the list)
-            if len(history_list.children) > 0:
+            if filtered_entries:
                 history_list.index = 0
-                # Sync the current_history_index to match the ListView index
-                self.current_history_index = 0
 
                 # Note: We don't automatically show the modal here when just loading the history
                 # That will be handled by the app's action_toggle_sidebar method
@@ -259,12 +273,62 @@ class Sidebar(Container):
             # Add error item
             history_list = self.query_one("#history-list", ListView)
             history_list.clear()
+            self.history_entries = []
             history_list.append(
                 ListItem(
                     Label(f"Error loading history: {str(e)}", classes="history-error")
                 )
             )
 
+    def _update_history_items(
+        self, history_list: ListView, entries: List[Dict[str, str]]
+    ) -> bool:
+        """Prepend new entries to the list and drop those no longer in it.
+
+        Returns False if the list doesn't show an older state of `entries`
+        (e.g. the history file was replaced), in which case it is rebuilt.
+        """
+        shown = self.history_entries
+        if not shown or not entries or len(history_list) != len(shown):
+            return False
+        try:
+            new_count = entries.index(shown[0])
+        except ValueError:
+            return False
+        kept = len(entries) - new_count
+        if entries[new_count:] != shown[:kept]:
+            return False
+
+        if kept < len(shown):
+            history_list.remove_items(range(kept, len(shown)))
+        if new_count:
+            history_list.insert(
+                0,
+                [
+                    HistoryItem(entry, self.history_reader)
+                    for entry in entries[:new_count]
+                ],
+            )
+        return True
+
+    def _rebuild_history_items(
+        self, history_list: ListView, entries: List[Dict[str, str]]
+    ) -> None:
+        """Replace the list's items with `entries`."""
+        history_list.clear()
+
+        if not entries:
+            # No history available (after filtering)
+            history_list.append(
+                ListItem(Label("No command history", classes="history-empty"))
+            )
+            return
+
+        # Add filtered entries to the list (most recent first)
+        history_list.extend(
+            HistoryItem(entry, self.history_reader) for entry in entries
+        )
+
     def navigate_to_next_command(self) -> bool:
         """Navigate to the next command in history.
 
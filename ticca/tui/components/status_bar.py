@@ -9,6 +9,8 @@ from textual.app import ComposeResult
 from textual.reactive import reactive
 from textual.widgets import Static
 
+from ticca.tui.refresh_scheduler import get_refresh_scheduler
+
 
 class StatusBar(Static):
     """Status bar showing current model, puppy name, and connection status."""
@@ -43,25 +45,46 @@ class StatusBar(Static):
         yield Static(id="status-content")
 
     def watch_current_model(self) -> None:
-        self.update_status()
+        self._request_update()
 
     def watch_connection_status(self) -> None:
-        self.update_status()
+        self._request_update()
 
     def watch_agent_status(self) -> None:
-        self.update_status()
+        self._request_update()
 
     def watch_token_count(self) -> None:
-        self.update_status()
+        self._request_update()
 
     def watch_token_capacity(self) -> None:
-        self.update_status()
+        self._request_update()
 
     def watch_token_proportion(self) -> None:
-        self.update_status()
+        self._request_update()
 
     def watch_progress_visible(self) -> None:
-        self.update_status()
+        self._request_update()
+
+    def _request_update(self) -> None:
+        """Repaint on the app's next refresh frame, if anything shown changed."""
+        scheduler = get_refresh_scheduler(self.app)
+        if scheduler is None:
+            self.update_status()
+            return
+        try:
+            terminal_width = self.app.size.width
+        except Exception:
+            terminal_width = 80
+        state = (
+            self.current_model,
+            self.agent_status,
+            self.token_count,
+            self.token_capacity,
+            self.token_proportion,
+            os.getcwd(),
+            terminal_width,
+        )
+        scheduler.update("status_bar", state, lambda _: self.update_status())
 
     def update_status(self) -> None:
         """Update the status bar content with responsive design."""
@@ -1,14 +1,134 @@
 """
 Command history reader for TUI history tab.
+
+Only the newest entries of the history file are shown, so the file is read
+backwards from its end, and later reads parse just the bytes appended since
+(by save_command_to_history or the prompt's own history). The resulting
+index is shared by all readers of the same file.
 """
 
 import os
 import re
+import threading
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from ticca.config import COMMAND_HISTORY_FILE
 
+# Entries kept in memory per history file (more are loaded when asked for)
+HISTORY_INDEX_SIZE = 200
+
+# Bytes read per step when scanning the history file backwards
+TAIL_BLOCK_SIZE = 64 * 1024
+
+_ENTRY_MARKER = re.compile(
+    rb"^# (\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})[^\n]*", re.MULTILINE
+)
+
+_indexes: Dict[str, "_HistoryIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def _parse_entries(
+    data: bytes, base: int, pos: int = 0
+) -> List[Tuple[int, Optional[Dict[str, str]]]]:
+    """Parse the entries in `data`, which starts at file offset `base`.
+
+    Returns the file offset of each entry with the entry, or None for entries
+    without a command. The last entry may still be incomplete.
+    """
+    markers = list(_ENTRY_MARKER.finditer(data, pos))
+    entries = []
+    for i, marker in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(data)
+        command = data[marker.end() : end].decode("utf-8", errors="replace").strip()
+        entry = None
+        if command:
+            entry = {"timestamp": marker.group(1).decode("ascii"), "command": command}
+        entries.append((base + marker.start(), entry))
+    return entries
+
+
+class _HistoryIndex:
+    """The newest entries of one history file, kept up to date as it grows."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.capacity = 0
+        # Complete entries, oldest first
+        self.entries: List[Dict[str, str]] = []
+        # The newest entry is re-read until another one follows it
+        self.last_entry: Optional[Dict[str, str]] = None
+        self.last_offset = 0
+        self.file_state: Optional[Tuple[int, int, int, int]] = None
+
+    def read(self, max_entries: int) -> List[Dict[str, str]]:
+        stat = os.stat(self.path)
+        file_state = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self.lock:
+            if file_state != self.file_state:
+                # Compaction replaces the file; anything else only appends
+                rewritten = (
+                    self.file_state is None
+                    or self.file_state[:2] != file_state[:2]
+                    or stat.st_size < self.file_state[2]
+                )
+                if rewritten:
+                    self._load_tail(stat.st_size, max(max_entries, HISTORY_INDEX_SIZE))
+                else:
+                    self._read_appended(stat.st_size)
+                self.file_state = file_state
+            elif max_entries > self.capacity:
+                self._load_tail(stat.st_size, max_entries)
+
+            entries = self.entries
+            if self.last_entry is not None:
+                entries = entries + [self.last_entry]
+            return entries[-max_entries:][::-1] if max_entries > 0 else []
+
+    def _load_tail(self, size: int, count: int) -> None:
+        """Index the newest `count` entries, reading backwards from `size`."""
+        start = size
+        data = b""
+        with open(self.path, "rb") as f:
+            while start > 0:
+                start = max(0, start - TAIL_BLOCK_SIZE)
+                f.seek(start)
+                data = f.read(size - start)
+                # A partial first line can't be a marker unless it starts the file
+                if len(_ENTRY_MARKER.findall(data, 0 if start == 0 else 1)) > count:
+                    break
+
+        self.capacity = count
+        self.entries = []
+        self.last_entry = None
+        self.last_offset = start
+        self._add(_parse_entries(data, start, 0 if start == 0 else 1))
+
+    def _read_appended(self, size: int) -> None:
+        """Index the entries written since the file was last read."""
+        with open(self.path, "rb") as f:
+            f.seek(self.last_offset)
+            data = f.read(size - self.last_offset)
+        self.last_entry = None
+        self._add(_parse_entries(data, self.last_offset))
+
+    def _add(self, parsed: List[Tuple[int, Optional[Dict[str, str]]]]) -> None:
+        if not parsed:
+            return
+        self.entries.extend(entry for _, entry in parsed[:-1] if entry)
+        del self.entries[: -self.capacity]
+        self.last_offset, self.last_entry = parsed[-1]
+
+
+def _get_index(path: str) -> _HistoryIndex:
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = _HistoryIndex(path)
+        return index
+
 
 class HistoryFileReader:
     """Reads and parses the command history file for display in the TUI history tab."""
@@ -20,9 +140,6 @@ class HistoryFileReader:
             history_file_path: Path to the command history file. Defaults to the standard location.
         """
         self.history_file_path = history_file_path
-        self._timestamp_pattern = re.compile(
-            r"^# (\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})"
-        )
 
     def read_history(self, max_entries: int = 100) -> List[Dict[str, str]]:
         """Read command history from the history file.
@@ -37,37 +154,7 @@ class HistoryFileReader:
             return []
 
         try:
-            with open(self.history_file_path, "r") as f:
-                content = f.read()
-
-            # Split content by timestamp marker
-            raw_chunks = re.split(r"(# \d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})", content)
-
-            # Filter out empty chunks
-            chunks = [chunk for chunk in raw_chunks if chunk.strip()]
-
-            entries = []
-
-            # Process chunks in pairs (timestamp and command)
-            i = 0
-            while i < len(chunks) - 1:
-                if self._timestamp_pattern.match(chunks[i]):
-                    timestamp = self._timestamp_pattern.match(chunks[i]).group(1)
-                    command_text = chunks[i + 1].strip()
-
-                    if command_text:  # Skip empty commands
-                        entries.append(
-                            {"timestamp": timestamp, "command": command_text}
-                        )
-
-                    i += 2
-                else:
-                    # Skip invalid chunks
-                    i += 1
-
-            # Limit the number of entries and reverse to get most recent first
-            return entries[-max_entries:][::-1]
-
+            return _get_index(self.history_file_path).read(max_entries)
         except Exception:
             # Return empty list on any error
             return []
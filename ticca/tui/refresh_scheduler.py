@@ -0,0 +1,101 @@
+"""
+Frame-rate-limited UI updates.
+
+Widgets and background code report display state to the app's
+RefreshScheduler instead of repainting directly. Updates are collected per
+key, values equal to what is already shown are skipped, and the rest are
+applied together, at most `fps` times a second, on the app's event loop.
+Nothing runs while nothing changes.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_FPS = 10
+
+_UNSET = object()
+
+
+class RefreshScheduler:
+    """Collects dirty UI state and applies it at most `fps` times a second."""
+
+    def __init__(self, fps: int = DEFAULT_FPS):
+        self.interval = 1 / fps
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[Any, Callable[[Any], None]]] = {}
+        self._applied: Dict[str, Any] = {}
+        self._flush_scheduled = False
+        self._last_flush = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._context: Optional[contextvars.Context] = None
+
+    def start(self) -> None:
+        """Bind to the running event loop; call from the app (e.g. on_mount)."""
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        # Flushes run in the app's context so widgets can find their app
+        self._context = contextvars.copy_context()
+        with self._lock:
+            if self._pending and not self._flush_scheduled:
+                self._flush_scheduled = True
+                self._schedule_flush()
+
+    def update(self, key: str, value: Any, apply: Callable[[Any], None]) -> None:
+        """Call `apply(value)` on the next frame unless `value` is already shown.
+
+        Safe to call from any thread. Only the latest value for a key is
+        applied; `value` must support equality comparison.
+        """
+        with self._lock:
+            if key not in self._pending and self._applied.get(key, _UNSET) == value:
+                return
+            self._pending[key] = (value, apply)
+            if self._flush_scheduled or self._loop is None:
+                return
+            self._flush_scheduled = True
+
+        if threading.get_ident() == self._thread_id:
+            self._schedule_flush()
+        else:
+            try:
+                self._loop.call_soon_threadsafe(
+                    self._schedule_flush, context=self._context
+                )
+            except RuntimeError:
+                # Event loop is closed; the app is shutting down
+                pass
+
+    def forget(self, key: str) -> None:
+        """Make the next update for `key` apply even if its value is unchanged."""
+        with self._lock:
+            self._applied.pop(key, None)
+
+    def _schedule_flush(self) -> None:
+        delay = max(0.0, self._last_flush + self.interval - time.monotonic())
+        self._loop.call_later(delay, self.flush, context=self._context)
+
+    def flush(self) -> None:
+        """Apply all pending updates now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_scheduled = False
+        self._last_flush = time.monotonic()
+
+        for key, (value, apply) in pending.items():
+            if self._applied.get(key, _UNSET) == value:
+                continue
+            try:
+                apply(value)
+            except Exception:
+                # Not recorded as shown, so the next update is applied again
+                continue
+            self._applied[key] = value
+
+
+def get_refresh_scheduler(app) -> Optional[RefreshScheduler]:
+    """The app's refresh scheduler, or None for apps without one."""
+    return getattr(app, "refresh_scheduler", None)
@@ -5,11 +5,10 @@ Lists recent autosave sessions and lets the user load one.
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional
 
 from textual import on
 from textual.app import ComposeResult
@@ -17,7 +16,14 @@ from textual.containers import Container, Horizontal
 from textual.screen import ModalScreen
 from textual.widgets import Button, Label, ListItem, ListView, Static
 
-from ticca.session_storage import list_sessions
+from ticca.session_storage import (
+    count_sessions,
+    list_recent_sessions,
+    load_session_preview,
+)
+
+# Sessions fetched per page; the next page loads as the user scrolls near the end
+PAGE_SIZE = 50
 
 
 @dataclass(slots=True)
@@ -28,47 +34,54 @@ class AutosaveEntry:
     last_user_message: Optional[str] = None
 
 
-def _load_metadata(base_dir: Path, name: str) -> Tuple[Optional[str], Optional[int], Optional[str]]:
-    """Load metadata and last user message from session.
+def _load_page(base_dir: Path, offset: int, limit: int = PAGE_SIZE) -> List[AutosaveEntry]:
+    """Load one page of entries, most recently updated first.
 
-    Returns:
-        Tuple of (timestamp, message_count, last_user_message)
+    Metadata comes from the SQLite index; only sessions saved before previews
+    were indexed have their last user message read from the session log.
     """
-    meta_path = base_dir / f"{name}_meta.json"
-    timestamp = None
-    message_count = None
-
-    try:
-        with meta_path.open("r", encoding="utf-8") as meta_file:
-            data = json.load(meta_file)
-        timestamp = data.get("timestamp")
-        message_count = data.get("message_count")
-    except Exception:
-        pass
-
-    # Get last user message from session JSON (now fixed to save properly!)
-    last_user_message = None
-    try:
-        # Try new JSON format first
-        json_path = base_dir / "sessions" / f"{name}.json"
-        if json_path.exists():
-            with json_path.open("r", encoding="utf-8") as f:
-                messages = json.load(f)
-                # Find the last user message with non-empty content (iterate backwards)
-                for msg in reversed(messages):
-                    if msg.get("role") == "user":
-                        content = msg.get("content", "").strip()
-                        if content:  # Only use if content is not empty
-                            # Truncate to fit in one line (max 80 chars)
-                            if len(content) > 80:
-                                last_user_message = content[:77] + "..."
-                            else:
-                                last_user_message = content
-                            break
-    except Exception:
-        pass
-
-    return timestamp, message_count, last_user_message
+    entries = []
+    for metadata in list_recent_sessions(base_dir, offset, limit):
+        last_user_message = metadata.preview
+        if last_user_message is None:
+            try:
+                last_user_message = load_session_preview(base_dir, metadata.session_id)
+            except Exception:
+                last_user_message = None
+        # Truncate to fit in one line (max 80 chars)
+        if last_user_message and len(last_user_message) > 80:
+            last_user_message = last_user_message[:77] + "..."
+        entries.append(
+            AutosaveEntry(
+                name=metadata.session_id,
+                timestamp=metadata.updated_at.isoformat(),
+                message_count=metadata.message_count,
+                last_user_message=last_user_message,
+            )
+        )
+    return entries
+
+
+def _format_label(entry: AutosaveEntry) -> str:
+    """Build label with timestamp, message count, and last user message."""
+    if entry.timestamp:
+        try:
+            dt = datetime.fromisoformat(entry.timestamp.replace("Z", "+00:00"))
+            ts_display = dt.strftime("%Y-%m-%d %H:%M")
+        except Exception:
+            ts_display = entry.timestamp
+    else:
+        ts_display = "unknown time"
+
+    count = (
+        f"{entry.message_count} msgs"
+        if entry.message_count is not None
+        else "unknown"
+    )
+
+    if entry.last_user_message:
+        return f"{ts_display} | {count} | {entry.last_user_message}"
+    return f"{ts_display} | {count}"
 
 
 class AutosavePicker(ModalScreen):
@@ -119,99 +132,48 @@ class AutosavePicker(ModalScreen):
         super().__init__(**kwargs)
         self.autosave_dir = autosave_dir
         self.entries: List[AutosaveEntry] = []
+        self.total = 0
         self.list_view: Optional[ListView] = None
 
     def on_mount(self) -> None:
-        names = list_sessions(self.autosave_dir)
-        raw_entries: List[Tuple[str, Optional[str], Optional[int], Optional[str]]] = []
-        for name in names:
-            ts, count, last_msg = _load_metadata(self.autosave_dir, name)
-            raw_entries.append((name, ts, count, last_msg))
-
-        def sort_key(entry):
-            _, ts, _, _ = entry
-            if ts:
-                try:
-                    return datetime.fromisoformat(ts)
-                except ValueError:
-                    return datetime.min
-            return datetime.min
-
-        raw_entries.sort(key=sort_key, reverse=True)
-        self.entries = [AutosaveEntry(*e) for e in raw_entries]
-
-        # Populate the ListView now that entries are ready
         if self.list_view is None:
             try:
                 self.list_view = self.query_one("#autosave-list", ListView)
             except Exception:
                 self.list_view = None
 
+        self.total = count_sessions(self.autosave_dir)
+        self._load_next_page()
+
+        # Focus and select first item for better UX
+        if self.list_view is not None and len(self.entries) > 0:
+            self.list_view.index = 0
+            self.list_view.focus()
+
+    def _load_next_page(self) -> None:
+        """Append the next page of sessions to the list."""
+        if len(self.entries) >= self.total:
+            return
+        page = _load_page(self.autosave_dir, len(self.entries))
+        if not page:
+            # Sessions were deleted since counting
+            self.total = len(self.entries)
+            return
+        self.entries.extend(page)
         if self.list_view is not None:
-            # Clear existing items if any
-            try:
-                self.list_view.clear()
-            except Exception:
-                # Fallback: remove children manually
-                self.list_view.children.clear()  # type: ignore
-
-            for entry in self.entries[:50]:
-                # Format timestamp as date/time
-                if entry.timestamp:
-                    try:
-                        dt = datetime.fromisoformat(entry.timestamp.replace("Z", "+00:00"))
-                        ts_display = dt.strftime("%Y-%m-%d %H:%M")
-                    except Exception:
-                        ts_display = entry.timestamp
-                else:
-                    ts_display = "unknown time"
-
-                count = (
-                    f"{entry.message_count} msgs"
-                    if entry.message_count is not None
-                    else "unknown"
-                )
-
-                # Build label with timestamp, message count, and last user message
-                if entry.last_user_message:
-                    label = f"{ts_display} | {count} | {entry.last_user_message}"
-                else:
-                    label = f"{ts_display} | {count}"
-                self.list_view.append(ListItem(Static(label)))
-
-            # Focus and select first item for better UX
-            if len(self.entries) > 0:
-                self.list_view.index = 0
-                self.list_view.focus()
+            for entry in page:
+                self.list_view.append(ListItem(Static(_format_label(entry))))
+
+    def on_list_view_highlighted(self, event: ListView.Highlighted) -> None:  # type: ignore
+        index = self.list_view.index if self.list_view else None
+        if index is not None and index >= len(self.entries) - 10:
+            self._load_next_page()
 
     def compose(self) -> ComposeResult:
         with Container(id="modal-container"):
             yield Label("Select a session to resume (Esc to cancel)", id="list-label")
+            # Populated page by page once mounted
             self.list_view = ListView(id="autosave-list")
-            # populate items
-            for entry in self.entries[:50]:  # cap to avoid long lists
-                # Format timestamp as date/time
-                if entry.timestamp:
-                    try:
-                        dt = datetime.fromisoformat(entry.timestamp.replace("Z", "+00:00"))
-                        ts_display = dt.strftime("%Y-%m-%d %H:%M")
-                    except Exception:
-                        ts_display = entry.timestamp
-                else:
-                    ts_display = "unknown time"
-
-                count = (
-                    f"{entry.message_count} msgs"
-                    if entry.message_count is not None
-                    else "unknown"
-                )
-
-                # Build label with timestamp, message count, and last user message
-                if entry.last_user_message:
-                    label = f"{ts_display} | {count} | {entry.last_user_message}"
-                else:
-                    label = f"{ts_display} | {count}"
-                self.list_view.append(ListItem(Static(label)))
             yield self.list_view
             with Horizontal(classes="button-row"):
                 yield Button("Cancel", id="cancel-button")
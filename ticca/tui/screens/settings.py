@@ -422,6 +422,7 @@ class SettingsScreen(ModalScreen):
                                 [
                                     ("Summarization", "summarization"),
                                     ("Truncation", "truncation"),
+                                    ("Tool Output Pruning", "tool_pruning"),
                                 ],
                                 id="compaction-strategy-select",
                                 classes="setting-input",
@@ -1083,7 +1084,7 @@ class SettingsScreen(ModalScreen):
             auto_save = self.query_one("#auto-save-switch", Switch).value
             max_autosaves = self.query_one("#max-autosaves-input", Input).value.strip()
 
-            if compaction_strategy in ["summarization", "truncation"]:
+            if compaction_strategy in ["summarization", "truncation", "tool_pruning"]:
                 set_config_value("compaction_strategy", compaction_strategy)
 
             if compaction_threshold: